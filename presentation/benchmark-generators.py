@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Presentation Generator Benchmarks
+Times the deck generators against synthetic site-mapping.json fixtures
+
+Each scenario runs in its own Python process so peak RSS is measured
+cleanly. For every stage (load, aggregate, build, save, ...) the suite
+reports wall time, the process's peak RSS after the stage and the bytes
+written.
+
+Usage:
+    python3 benchmark-generators.py                          # 100, 1k and 10k sites
+    python3 benchmark-generators.py --sizes 100,1000 --repeat 3
+    python3 benchmark-generators.py --json bench.json        # save results
+    python3 benchmark-generators.py --baseline bench.json    # exit 1 on regressions
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = (100, 1000, 10000)
+STATUS_WEIGHTS = (('complete', 4), ('in-progress', 1), ('pending', 5))
+LIBRARY_NAMES = ('Documents', 'Shared Documents', 'Site Assets', 'Site Pages', 'Forms', 'Style Library', 'Archive')
+
+# Scenarios that read the mapping run once per fixture size; the others once per suite
+MAPPING_SCENARIOS = ('main', 'site_briefs')
+STATIC_SCENARIOS = ('phase1', 'template')
+
+# Regressions smaller than this are treated as timer noise
+NOISE_FLOOR_MS = 5.0
+
+
+def write_fixture(path, site_count, seed=42):
+    """Synthetic site-mapping.json with ``site_count`` sites and 0-12 libraries each"""
+    rng = random.Random(seed)
+    statuses = [status for status, weight in STATUS_WEIGHTS for _ in range(weight)]
+    mappings = []
+    for i in range(site_count):
+        # Mostly small sites with a long tail of large ones, like the real export
+        libraries = [
+            {'name': rng.choice(LIBRARY_NAMES), 'itemCount': int(rng.lognormvariate(8, 1.6))}
+            for _ in range(rng.choice((0, 1, 1, 2, 2, 3, 4, 6, 12)))
+        ]
+        site = {
+            'id': f"site-{i:05d}",
+            'name': f"PS - Bench Site {i}",
+            'sourceUrl': f"https://interiorlogicgroup.sharepoint.com/sites/PS-BenchSite{i}",
+            'targetUrl': f"https://impactfloors.sharepoint.com/sites/PS-BenchSite{i}",
+            'status': rng.choice(statuses),
+            'storageGB': round(rng.lognormvariate(1, 1.2), 2),
+        }
+        if libraries:
+            site['metadata'] = {'libraries': libraries}
+        mappings.append(site)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': 2, 'generated': 'benchmark', 'mappings': mappings}, f, indent=2)
+    return path
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageRecorder:
+    """Collects wall time, peak RSS and output size per stage"""
+
+    def __init__(self):
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        record = {'stage': name, 'output_bytes': None}
+        start = time.perf_counter()
+        yield record
+        record['wall_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        record['peak_rss_mb'] = peak_rss_mb()
+        self.stages.append(record)
+
+
+def run_scenario(scenario, fixture, workdir):
+    """Run one scenario in this process; returns its stage records"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from generators import main_generator, phase1_generator
+    from migration_stats import MigrationStats, iter_mappings
+    from slidekit import new_presentation
+
+    os.chdir(workdir)
+    recorder = StageRecorder()
+
+    # Generators print progress; keep it out of the result line
+    with contextlib.redirect_stdout(io.StringIO()):
+        if scenario == 'main':
+            generator = main_generator()
+            with recorder.stage('load'):
+                sites = list(iter_mappings(fixture))
+            with recorder.stage('aggregate'):
+                stats = MigrationStats(fixture)
+                stats.load_from(sites)
+            with recorder.stage('build'):
+                prs = new_presentation()
+                for _, builder, args, _ in generator.slide_plan(stats):
+                    builder(prs, *args)
+            with recorder.stage('save') as record:
+                output_file = os.path.join(workdir, 'main.pptx')
+                prs.save(output_file)
+                record['output_bytes'] = os.path.getsize(output_file)
+
+        elif scenario == 'site_briefs':
+            generator = main_generator()
+            with recorder.stage('load'):
+                sites = list(iter_mappings(fixture))
+            with recorder.stage('templates'):
+                templates = generator.build_site_templates()
+            with recorder.stage('render') as record:
+                # Rendered in memory: writing thousands of briefs would mostly time the disk
+                total = 0
+                for site in sites:
+                    template = templates[generator.site_status(site)]
+                    total += len(template.render(generator.site_fields(site)))
+                record['output_bytes'] = total
+
+        elif scenario == 'phase1':
+            generator = phase1_generator()
+            with recorder.stage('build'):
+                prs = new_presentation()
+                for builder in generator.SLIDE_BUILDERS:
+                    builder(prs)
+            with recorder.stage('save') as record:
+                output_file = os.path.join(workdir, 'phase1.pptx')
+                prs.save(output_file)
+                record['output_bytes'] = os.path.getsize(output_file)
+
+        elif scenario == 'template':
+            generator = main_generator()
+            with recorder.stage('build+save') as record:
+                generator.create_site_template(force=True)
+                record['output_bytes'] = os.path.getsize(os.path.join('templates', 'Per-Site-Template.pptx'))
+
+        else:
+            raise ValueError(f"Unknown scenario: {scenario}")
+
+    return recorder.stages
+
+
+def spawn_scenario(scenario, fixture, workdir):
+    """Run a scenario in a fresh interpreter and return its stage records"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', scenario, '--fixture', fixture or '', '--workdir', workdir],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{scenario} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_suite(sizes, repeat, fixture_dir):
+    """All scenarios; with ``repeat`` > 1 each stage keeps its fastest run"""
+    plan = [(scenario, None) for scenario in STATIC_SCENARIOS]
+    for size in sizes:
+        fixture = os.path.join(fixture_dir, f"site-mapping-{size}.json")
+        if not os.path.exists(fixture):
+            write_fixture(fixture, size)
+        plan.extend((scenario, size) for scenario in MAPPING_SCENARIOS)
+
+    results = []
+    for scenario, size in plan:
+        fixture = os.path.join(fixture_dir, f"site-mapping-{size}.json") if size else None
+        best = {}
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as workdir:
+                for record in spawn_scenario(scenario, fixture, workdir):
+                    previous = best.get(record['stage'])
+                    if previous is None or record['wall_ms'] < previous['wall_ms']:
+                        best[record['stage']] = record
+        for record in best.values():
+            results.append(dict(record, scenario=scenario, sites=size))
+            print(format_row(results[-1]), flush=True)
+    return results
+
+
+def format_row(record):
+    sites = f"{record['sites']:,}" if record['sites'] else '-'
+    rss = f"{record['peak_rss_mb']:.1f}" if record['peak_rss_mb'] is not None else '?'
+    size = f"{record['output_bytes'] / 1024:,.1f}" if record['output_bytes'] is not None else ''
+    return f"{record['scenario']:<12} {sites:>7} {record['stage']:<11} {record['wall_ms']:>10.1f} {rss:>9} {size:>12}"
+
+
+def compare(results, baseline, tolerance):
+    """Stages that got slower than ``baseline`` by more than ``tolerance`` (a fraction)"""
+    previous = {(r['scenario'], r['sites'], r['stage']): r for r in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get((record['scenario'], record['sites'], record['stage']))
+        if old is None:
+            continue
+        if record['wall_ms'] > old['wall_ms'] * (1 + tolerance) and record['wall_ms'] - old['wall_ms'] > NOISE_FLOOR_MS:
+            regressions.append((record, old))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated fixture sizes in sites (default: 100,1000,10000)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="runs per scenario; the fastest run of each stage is reported (default: 1)")
+    parser.add_argument('--fixtures', default=None,
+                        help="directory to keep generated fixtures in (default: a temporary directory)")
+    parser.add_argument('--json', default=None, help="write results to this JSON file")
+    parser.add_argument('--baseline', default=None,
+                        help="results JSON from an earlier run; exit 1 if any stage regressed")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against --baseline as a fraction (default: 0.25)")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--fixture', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.fixture or None, args.workdir)))
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    print(f"{'scenario':<12} {'sites':>7} {'stage':<11} {'wall ms':>10} {'peak MB':>9} {'output KB':>12}")
+    print('─' * 66)
+    if args.fixtures:
+        os.makedirs(args.fixtures, exist_ok=True)
+        results = run_suite(sizes, args.repeat, args.fixtures)
+    else:
+        with tempfile.TemporaryDirectory() as fixture_dir:
+            results = run_suite(sizes, args.repeat, fixture_dir)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}:")
+            for record, old in regressions:
+                print(f"   {record['scenario']} {record['sites'] or '-'} {record['stage']}: "
+                      f"{old['wall_ms']:.1f} ms → {record['wall_ms']:.1f} ms")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
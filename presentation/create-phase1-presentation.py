@@ -4,83 +4,38 @@ Phase 1 Backup Presentation Generator
 Creates a PowerPoint presentation for guiding users through device backup before reset
 """
 
+import argparse
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.dml.color import RGBColor
-
-# Color scheme
-COLORS = {
-    'primary': RGBColor(0, 120, 212),      # Microsoft Blue #0078D4
-    'success': RGBColor(16, 124, 16),      # Green #107C10
-    'warning': RGBColor(255, 185, 0),      # Orange #FFB900
-    'error': RGBColor(209, 52, 56),        # Red #D13438
-    'dark_gray': RGBColor(50, 50, 50),
-    'light_gray': RGBColor(150, 150, 150),
-    'white': RGBColor(255, 255, 255)
-}
-
-def add_title(slide, text, top=0.5):
-    """Add centered title to slide"""
-    title_box = slide.shapes.add_textbox(Inches(1), Inches(top), Inches(8), Inches(1))
-    title_frame = title_box.text_frame
-    title_frame.word_wrap = True
-    p = title_frame.paragraphs[0]
-    p.text = text
-    p.font.size = Pt(44)
-    p.font.bold = True
-    p.font.color.rgb = COLORS['primary']
-    p.alignment = PP_ALIGN.CENTER
-    return title_box
-
-def add_content_box(slide, left, top, width, height):
-    """Add text box for content"""
-    text_box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
-    text_frame = text_box.text_frame
-    text_frame.word_wrap = True
-    return text_frame
-
-def add_bullet(text_frame, text, level=0, color=None, bold=False, size=18):
-    """Add bullet point to text frame"""
-    p = text_frame.add_paragraph()
-    p.text = text
-    p.level = level
-    p.font.size = Pt(size)
-    p.font.bold = bold
-    if color:
-        p.font.color.rgb = color
-    return p
+from pptx.enum.text import PP_ALIGN
+
+from deck_profile import enable_profiling, get_profiler
+from deck_template import DeckTemplate
+from phase1_telemetry import ATTENTION, FAILED, NOT_NEEDED, OK
+from remediation_telemetry import RemediationRollup
+from slidekit import (
+    COLORS, add_bullet, add_column_chart, add_content_box, add_notes, add_text, add_title, fill_placeholders,
+    load_values, new_presentation, save_presentation, unique_filename
+)
+from telemetry_store import DEFAULT_STORE_DIR, TelemetryStore
 
 def add_title_slide(prs):
     """Slide 1: Title Slide"""
     slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
 
     # Title
-    title = add_title(slide, "Phase 1: Device Backup", 1.5)
+    add_title(slide, "Phase 1: Device Backup", 1.5)
 
     # Subtitle
-    subtitle_box = slide.shapes.add_textbox(Inches(2), Inches(2.5), Inches(6), Inches(0.5))
-    subtitle_frame = subtitle_box.text_frame
-    p = subtitle_frame.paragraphs[0]
-    p.text = "Protecting Your Data Before Reset"
-    p.font.size = Pt(28)
-    p.font.color.rgb = COLORS['dark_gray']
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, 2, 2.5, 6, 0.5, "Protecting Your Data Before Reset", size=28, color='dark_gray', align=PP_ALIGN.CENTER)
 
     # Date
-    date_box = slide.shapes.add_textbox(Inches(2), Inches(3.5), Inches(6), Inches(0.5))
-    date_frame = date_box.text_frame
-    p = date_frame.paragraphs[0]
-    p.text = f"IT Support Guide | {datetime.now().strftime('%B %d, %Y')}"
-    p.font.size = Pt(14)
-    p.font.color.rgb = COLORS['light_gray']
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, 2, 3.5, 6, 0.5, f"IT Support Guide | {datetime.now().strftime('%B %d, %Y')}", size=14, color='light_gray', align=PP_ALIGN.CENTER)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 OPENING SCRIPT:
 "Today we're going to walk through backing up your device before we reset it. This process takes about 20-30 minutes, and we'll make sure all your important files, browser settings, and configurations are safely stored in OneDrive. I'll guide you step-by-step through each section. Do you have about 30 minutes to work through this together?"
 
@@ -89,12 +44,32 @@ KEY POINTS:
 - Emphasize safety: "We won't reset until everything is backed up"
 - Reassure: "I'll guide you through every step"
 - Check time availability before starting
-"""
+""")
 
     return slide
 
-def add_overview_slide(prs):
-    """Slide 2: What We'll Backup"""
+# Overview bullets: (telemetry step, or None to always show; heading; detail)
+OVERVIEW_ITEMS = (
+    ('onedrive', "OneDrive Setup & File Sync", "Your Desktop, Documents, and Pictures folders"),
+    ('browsers', "Browser Profile", "Bookmarks, passwords, and settings"),
+    ('printers', "Printer Configurations", "Screenshot of all mapped printers"),
+    ('wifi', "WiFi Network Information", "For quick reconnection after reset"),
+    ('outlook', "Outlook Data Files (if applicable)", "Personal email archives (PST files)"),
+    (None, "iOS Device Backup (if applicable)", "iPhone or iPad via Apple Devices app"),
+)
+
+# What the overview script says "we'll also" do for each step
+OVERVIEW_SCRIPT = {
+    'browsers': "save your browser bookmarks and passwords",
+    'printers': "capture your printer settings",
+}
+
+def _covers(steps, step):
+    """Whether a slide limited to ``steps`` (None for every step) covers ``step`` (None for always)"""
+    return step is None or steps is None or step in steps
+
+def add_overview_slide(prs, steps=None):
+    """Slide 2: What We'll Backup (only ``steps`` in a device deck)"""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
 
     add_title(slide, "What We'll Back Up Today", 0.3)
@@ -102,36 +77,24 @@ def add_overview_slide(prs):
     # Content
     tf = add_content_box(slide, 1.5, 1.2, 7, 3.5)
 
-    add_bullet(tf, "OneDrive Setup & File Sync", 0, COLORS['primary'], True, 24)
-    add_bullet(tf, "Your Desktop, Documents, and Pictures folders", 1, size=18)
+    for step, heading, detail in OVERVIEW_ITEMS:
+        if _covers(steps, step):
+            add_bullet(tf, heading, 0, COLORS['primary'], True, 24)
+            add_bullet(tf, detail, 1, size=18)
 
-    add_bullet(tf, "Browser Profile", 0, COLORS['primary'], True, 24)
-    add_bullet(tf, "Bookmarks, passwords, and settings", 1, size=18)
-
-    add_bullet(tf, "Printer Configurations", 0, COLORS['primary'], True, 24)
-    add_bullet(tf, "Screenshot of all mapped printers", 1, size=18)
-
-    add_bullet(tf, "WiFi Network Information", 0, COLORS['primary'], True, 24)
-    add_bullet(tf, "For quick reconnection after reset", 1, size=18)
-
-    add_bullet(tf, "Outlook Data Files (if applicable)", 0, COLORS['primary'], True, 24)
-    add_bullet(tf, "Personal email archives (PST files)", 1, size=18)
-
-    add_bullet(tf, "iOS Device Backup (if applicable)", 0, COLORS['primary'], True, 24)
-    add_bullet(tf, "iPhone or iPad via Apple Devices app", 1, size=18)
+    also = "".join(f"{phrase}, " for step, phrase in OVERVIEW_SCRIPT.items() if _covers(steps, step))
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, f"""
 SCRIPT:
-"Here's what we're going to back up today. The most important part is OneDrive - that's where all your files will be safely stored in the cloud. We'll also save your browser bookmarks and passwords, capture your printer settings, and if you have an iPhone or iPad, we'll verify that's backed up too. Each of these steps is important, but don't worry - I'll walk you through them one at a time."
+"Here's what we're going to back up today. The most important part is OneDrive - that's where all your files will be safely stored in the cloud. We'll also {also}and if you have an iPhone or iPad, we'll verify that's backed up too. Each of these steps is important, but don't worry - I'll walk you through them one at a time."
 
 EMPHASIS:
 - OneDrive is the MOST CRITICAL step
 - Everything goes to the cloud - safe even if device fails
 - User doesn't need to understand technical details
 - Focus on: "Your files will be safe"
-"""
+""")
 
     return slide
 
@@ -142,14 +105,7 @@ def add_onedrive_slide(prs):
     add_title(slide, "Step 1: OneDrive Setup", 0.3)
 
     # Warning box
-    warning_box = slide.shapes.add_textbox(Inches(1.5), Inches(1), Inches(7), Inches(0.6))
-    warning_frame = warning_box.text_frame
-    p = warning_frame.paragraphs[0]
-    p.text = "⚠️ CRITICAL: OneDrive must be fully synced before proceeding"
-    p.font.size = Pt(16)
-    p.font.bold = True
-    p.font.color.rgb = COLORS['error']
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1.5, 1, 7, 0.6, "⚠️ CRITICAL: OneDrive must be fully synced before proceeding", size=16, bold=True, color='error', align=PP_ALIGN.CENTER)
 
     # Content
     tf = add_content_box(slide, 1.5, 1.8, 7, 3)
@@ -164,8 +120,7 @@ def add_onedrive_slide(prs):
     add_bullet(tf, "Click 'Start backup' and wait for green checkmark ✓", 0, COLORS['primary'], True, 18)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 DETAILED SCRIPT:
 "Let's start with OneDrive. Look at the bottom right corner of your screen, near the clock. Do you see a little cloud icon? That's OneDrive. Click on it.
 
@@ -191,7 +146,7 @@ IMPORTANT:
 - DO NOT proceed to reset until green checkmark appears
 - Use wait time to start another user's Phase 1
 - Verify completion in portal.office.com before Phase 2
-"""
+""")
 
     return slide
 
@@ -219,17 +174,10 @@ def add_browser_slide(prs):
     add_bullet(right_tf, "Save CSV to OneDrive Documents", 1, size=16)
 
     # Warning
-    warning_box = slide.shapes.add_textbox(Inches(1.5), Inches(4.8), Inches(7), Inches(0.5))
-    warning_frame = warning_box.text_frame
-    p = warning_frame.paragraphs[0]
-    p.text = "⚠️ Delete password CSV files after restoration is confirmed"
-    p.font.size = Pt(14)
-    p.font.color.rgb = COLORS['warning']
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1.5, 4.8, 7, 0.5, "⚠️ Delete password CSV files after restoration is confirmed", size=14, color='warning', align=PP_ALIGN.CENTER)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 SCRIPT:
 "Now let's backup your browser. Are you using Chrome or Edge? Let me show you how to turn on sync for your browser.
 
@@ -248,7 +196,7 @@ KEY POINTS:
 - Export is secondary backup (manual, but safer)
 - Password CSV is sensitive - remind to delete later
 - Save exports to: OneDrive > Documents > BrowserBackup folder
-"""
+""")
 
     return slide
 
@@ -269,8 +217,7 @@ def add_printers_slide(prs):
     add_bullet(tf, "Save to OneDrive > Documents > PrinterBackup.png", 1, size=18)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 SCRIPT:
 "Next, let's capture your printer settings. Click the Start button and type 'Settings'. Open Settings, then click on 'Devices', then 'Printers & scanners'.
 
@@ -292,7 +239,7 @@ If user is uncomfortable with screenshots, manually document:
 - Printer model
 - IP address (if network printer)
 - Default printer (marked with checkmark)
-"""
+""")
 
     return slide
 
@@ -311,18 +258,10 @@ def add_wifi_slide(prs):
     add_bullet(tf, "Network: _______________________", 1, size=18)
 
     # Info box
-    info_box = slide.shapes.add_textbox(Inches(1.5), Inches(4), Inches(7), Inches(1))
-    info_frame = info_box.text_frame
-    p = info_frame.paragraphs[0]
-    p.text = "💡 Why this matters: You'll need to reconnect during device setup (OOBE). Having the exact network name ensures smooth reconnection."
-    p.font.size = Pt(14)
-    p.font.color.rgb = COLORS['primary']
-    p.alignment = PP_ALIGN.CENTER
-    info_frame.word_wrap = True
+    add_text(slide, 1.5, 4, 7, 1, "💡 Why this matters: You'll need to reconnect during device setup (OOBE). Having the exact network name ensures smooth reconnection.", size=14, color='primary', align=PP_ALIGN.CENTER, word_wrap=True)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 SCRIPT:
 "Before we reset your device, let's record which WiFi network you're connected to. Click on the WiFi icon in your taskbar - that's the wireless symbol in the bottom right corner, near the clock.
 
@@ -349,7 +288,7 @@ COMMON NETWORKS:
 - Impact_Guest
 - INGINC-WiFi
 - Site-specific names
-"""
+""")
 
     return slide
 
@@ -360,14 +299,7 @@ def add_outlook_slide(prs):
     add_title(slide, "Step 5: Outlook Data Files (OST/PST)", 0.3)
 
     # Warning box
-    warning_box = slide.shapes.add_textbox(Inches(1.5), Inches(1), Inches(7), Inches(0.6))
-    warning_frame = warning_box.text_frame
-    p = warning_frame.paragraphs[0]
-    p.text = "⚠️ PST files are NOT backed up by OneDrive automatically"
-    p.font.size = Pt(16)
-    p.font.bold = True
-    p.font.color.rgb = COLORS['error']
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1.5, 1, 7, 0.6, "⚠️ PST files are NOT backed up by OneDrive automatically", size=16, bold=True, color='error', align=PP_ALIGN.CENTER)
 
     # Content
     tf = add_content_box(slide, 1.5, 1.8, 7, 2.8)
@@ -382,8 +314,7 @@ def add_outlook_slide(prs):
     add_bullet(tf, "Verify in portal.office.com → OneDrive → Documents", 0, COLORS['primary'], size=18)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 DETAILED SCRIPT:
 "Now we need to check for Outlook data files. These are special files that store your email archives, and they won't sync automatically to OneDrive.
 
@@ -431,7 +362,7 @@ VERIFICATION:
 - Check file size in OneDrive web portal matches local file
 - Confirm green checkmark on OneDrive sync
 - Note PST file names in ticket/documentation
-"""
+""")
 
     return slide
 
@@ -454,8 +385,7 @@ def add_ios_slide(prs):
     add_bullet(tf, "If no iOS device: Skip this step", 0, COLORS['light_gray'], size=18)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 SCRIPT:
 "Do you have an iPhone or iPad that you use for work?
 
@@ -495,12 +425,34 @@ If backup won't work:
 - Note error message
 - Proceed with reset (user's iPhone will not be affected)
 - iOS device data is independent of Windows computer
-"""
+""")
 
     return slide
 
-def add_checklist_slide(prs):
-    """Slide 9: Phase 1 Checklist"""
+# Checklist items: (telemetry step, or None to always show; item; highlighted; what to confirm aloud)
+CHECKLIST_ITEMS = (
+    ('onedrive', "☐ OneDrive signed in with INGINC.com account", False,
+     "OneDrive - Is the cloud icon showing a green checkmark? Perfect."),
+    ('onedrive', "☐ Known Folder Backup enabled (Desktop, Documents, Pictures)", False,
+     "Known Folder Backup - We enabled Desktop, Documents, and Pictures, right? Good."),
+    ('onedrive', "☐ OneDrive sync complete (green checkmark ✓)", True,
+     "Sync complete - Everything uploaded? Excellent."),
+    ('browsers', "☐ Browser sync enabled", False,
+     "Browser sync - You signed in to Chrome/Edge? Check."),
+    ('browsers', "☐ Browser bookmarks/passwords exported to OneDrive", False,
+     "Browser exports - Bookmarks and passwords saved to OneDrive Documents? Got it."),
+    ('printers', "☐ Printer configuration screenshot saved", False,
+     "Printers - We took that screenshot? Yes."),
+    ('wifi', "☐ WiFi SSID recorded", False,
+     "WiFi - I have the network name written down: [SSID]"),
+    ('outlook', "☐ Outlook PST files checked and moved (if applicable)", False,
+     "Outlook PST - [We checked/no PST files/copied to OneDrive]"),
+    (None, "☐ iOS backup verified or created (if applicable)", False,
+     "iOS - [Backup verified/no iOS device/backup created]"),
+)
+
+def add_checklist_slide(prs, steps=None):
+    """Slide 9: Phase 1 Checklist (only ``steps`` in a device deck)"""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
 
     add_title(slide, "Phase 1 Checklist - Before Reset", 0.3)
@@ -508,44 +460,25 @@ def add_checklist_slide(prs):
     # Content
     tf = add_content_box(slide, 1.5, 1.2, 7, 3.8)
 
-    add_bullet(tf, "☐ OneDrive signed in with INGINC.com account", 0, size=18)
-    add_bullet(tf, "☐ Known Folder Backup enabled (Desktop, Documents, Pictures)", 0, size=18)
-    add_bullet(tf, "☐ OneDrive sync complete (green checkmark ✓)", 0, COLORS['success'], True, 18)
-    add_bullet(tf, "☐ Browser sync enabled", 0, size=18)
-    add_bullet(tf, "☐ Browser bookmarks/passwords exported to OneDrive", 0, size=18)
-    add_bullet(tf, "☐ Printer configuration screenshot saved", 0, size=18)
-    add_bullet(tf, "☐ WiFi SSID recorded", 0, size=18)
-    add_bullet(tf, "☐ Outlook PST files checked and moved (if applicable)", 0, size=18)
-    add_bullet(tf, "☐ iOS backup verified or created (if applicable)", 0, size=18)
+    items = [item for item in CHECKLIST_ITEMS if _covers(steps, item[0])]
+    for _, text, highlighted, _ in items:
+        if highlighted:
+            add_bullet(tf, text, 0, COLORS['success'], True, 18)
+        else:
+            add_bullet(tf, text, 0, size=18)
+    check_lines = "\n".join(f"{number}. {check}" for number, (_, _, _, check) in enumerate(items, 1))
 
     # Critical note
-    critical_box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(8), Inches(0.5))
-    critical_frame = critical_box.text_frame
-    critical_frame.word_wrap = True
-    p = critical_frame.paragraphs[0]
-    p.text = "🛑 DO NOT request device reset until ALL items above are complete"
-    p.font.size = Pt(18)
-    p.font.bold = True
-    p.font.color.rgb = COLORS['error']
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1, 5, 8, 0.5, "🛑 DO NOT request device reset until ALL items above are complete", size=18, bold=True, color='error', align=PP_ALIGN.CENTER, word_wrap=True)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, f"""
 CHECKPOINT SCRIPT:
 "Alright, let's review everything we've backed up to make sure we're ready for the reset. I'm going to go through the checklist with you:
 
 [Go through each item and check off]
 
-1. OneDrive - Is the cloud icon showing a green checkmark? Perfect.
-2. Known Folder Backup - We enabled Desktop, Documents, and Pictures, right? Good.
-3. Sync complete - Everything uploaded? Excellent.
-4. Browser sync - You signed in to Chrome/Edge? Check.
-5. Browser exports - Bookmarks and passwords saved to OneDrive Documents? Got it.
-6. Printers - We took that screenshot? Yes.
-7. WiFi - I have the network name written down: [SSID]
-8. Outlook PST - [We checked/no PST files/copied to OneDrive]
-9. iOS - [Backup verified/no iOS device/backup created]
+{check_lines}
 
 Perfect! Everything is backed up and safe. Your data is secure in OneDrive, and we can now proceed with requesting the device reset. The IT team will send you instructions for Phase 2 once the reset is processed."
 
@@ -567,7 +500,7 @@ While waiting for OneDrive sync (15-30 min):
 - Start another user's Phase 1
 - Come back to verify this user's sync completion
 - Efficient use of time while maintaining safety
-"""
+""")
 
     return slide
 
@@ -590,8 +523,7 @@ def add_support_slide(prs):
     add_bullet(tf, "https://ipsghonline.github.io/tmp/docs/monday-go-live/workflow.html", 1, size=16)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 CLOSING SCRIPT:
 "That completes Phase 1! All your data is now safely backed up in OneDrive. Do you have any questions about anything we did today?
 
@@ -624,43 +556,403 @@ A: "As long as it was in your Desktop, Documents, or Pictures folders, OneDrive
 
 Q: "Do I need to do anything else?"
 A: "Nope! Just wait for the email from IT. They'll guide you through Phase 2."
-"""
+""")
+
+    return slide
+
+def _format_minutes(minutes):
+    return f"{minutes:.0f} min" if minutes is not None else "n/a"
+
+def add_step_measurements(slide, step):
+    """Measured outcomes and run times of a step (a ``StepRollup``) on its slide and in its notes"""
+    if not step.needed:
+        text = "📊 Measured: no devices needed this step yet"
+    else:
+        text = (f"📊 Measured on {step.needed:,} devices: {step.rate(OK):.0%} done first time • "
+                f"{step.rate(ATTENTION):.0%} needed attention • {step.rate(FAILED):.0%} failed")
+    add_text(slide, 0.5, 5.25, 9, 0.3, text, size=11, italic=True, color='dark_gray', align=PP_ALIGN.CENTER)
+
+    lines = [
+        "MEASURED (latest run on each device, from Phase 1 telemetry):",
+        f"- Needed on {step.needed:,} devices; not needed on {step.counts['not-needed']:,}",
+        f"- Done first time: {step.rate(OK):.0%}, needed attention: {step.rate(ATTENTION):.0%}, failed: {step.rate(FAILED):.0%}",
+        f"- Whole session where this step was needed: median {_format_minutes(step.median_minutes)}, "
+        f"90% within {_format_minutes(step.p90_minutes)}",
+    ]
+    if step.added_minutes is not None:
+        lines.append(f"- Devices that need this step take {_format_minutes(step.added_minutes)} longer (median)")
+    if step.extra_minutes is not None:
+        lines.append(f"- A problem with this step adds {_format_minutes(step.extra_minutes)} (median)")
+    notes = slide.notes_slide.notes_text_frame
+    notes.text = notes.text.rstrip() + "\n\n" + "\n".join(lines) + "\n"
+
+def add_telemetry_summary_slide(prs, rollup):
+    """Slide 2b: Where the Time Goes (measured from Phase 1 telemetry)"""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+
+    add_title(slide, "Where the Time Goes", 0.3)
+
+    add_text(slide, 1, 1.1, 8, 0.5,
+             f"Typical session: {_format_minutes(rollup.median_minutes)} • 90% finish within "
+             f"{_format_minutes(rollup.p90_minutes)} • {rollup.succeeded:,} of {rollup.devices:,} devices without errors",
+             size=16, bold=True, color='primary', align=PP_ALIGN.CENTER, word_wrap=True)
+
+    ranked = rollup.slowest()
+    add_column_chart(
+        slide, 0.5, 1.7, 5, 3.4, [step.label for step in ranked],
+        [round(step.cost_minutes, 1) for step in ranked], color='warning',
+        title="Minutes Added per Device", series_name='Minutes', number_format='0.0', horizontal=True
+    )
+
+    tf = add_content_box(slide, 5.7, 1.8, 3.8, 3.3)
+    add_bullet(tf, "Needs help most often", 0, COLORS['primary'], True, 16)
+    for step in sorted(ranked, key=lambda step: -step.problem_rate)[:4]:
+        add_bullet(tf, f"{step.label}: {step.problem_rate:.0%} of {step.needed:,}", 1, size=14)
+
+    step_lines = "\n".join(
+        f"- {step.label}: adds {step.cost_minutes:.1f} min per device; "
+        f"{step.problem_rate:.0%} of {step.needed:,} devices needed help"
+        for step in ranked
+    )
+    add_notes(slide, f"""
+SPEAKER NOTES - Where the Time Goes
+
+MEASURED ON {rollup.devices:,} DEVICES (latest run of Phase1-Backup.ps1 on each):
+- Median session: {_format_minutes(rollup.median_minutes)}; 90% within {_format_minutes(rollup.p90_minutes)}
+- Completed without errors: {rollup.succeeded:,}
+
+STEPS BY TIME ADDED:
+{step_lines}
+
+HOW THIS IS MEASURED:
+The backup script records only each session's total time. A step's time
+is the difference in median session time between devices that needed it
+and devices that didn't, plus how much longer sessions run when the step
+has a problem, weighted by how often that happens.
+
+KEY MESSAGE:
+"Plan your time around the top step on this chart - that's where sessions run long."
+""")
 
     return slide
 
-def create_presentation():
-    """Create the Phase 1 backup presentation"""
-    prs = Presentation()
-    prs.slide_width = Inches(10)  # Standard 16:9 widescreen
-    prs.slide_height = Inches(5.625)
+def _format_hours(hours):
+    if hours is None:
+        return "n/a"
+    if hours == 0:
+        return "first run"
+    return f"{hours * 60:.0f} min" if hours < 1 else f"{hours:.0f} h" if hours < 48 else f"{hours / 24:.0f} days"
 
+def add_remediation_status_slide(prs, remediation):
+    """Slide 2c: Automatic Backup Status (Intune remediation reports)"""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+
+    add_title(slide, "Automatic Backup Status", 0.3)
+
+    summaries = [summary.as_dict() | {'label': summary.label} for summary in remediation]
+    devices = max(summary['devices'] for summary in summaries)
+    runs = sum(summary['runs'] for summary in summaries)
+    retries = sum(summary['retries'] for summary in summaries)
+    add_text(slide, 1, 1.1, 8, 0.5,
+             f"Intune backs up {devices:,} devices in the background • {runs:,} runs, {retries:,} retries",
+             size=16, bold=True, color='primary', align=PP_ALIGN.CENTER, word_wrap=True)
+
+    add_column_chart(
+        slide, 0.5, 1.7, 5, 3.4, [summary['label'] for summary in summaries],
+        [summary['compliant'] / summary['devices'] for summary in summaries], color='success',
+        title="Devices Compliant", series_name='Compliant', number_format='0%', horizontal=True
+    )
+
+    tf = add_content_box(slide, 5.7, 1.8, 3.8, 3.3)
+    add_bullet(tf, "Time to compliance", 0, COLORS['primary'], True, 16)
+    for summary in summaries:
+        hours = summary['hours_to_compliance']
+        add_bullet(tf, f"{summary['label']}: {_format_hours(hours['median'])} "
+                       f"(90% within {_format_hours(hours['p90'])})", 1, size=12)
+
+    lines = []
+    for summary in summaries:
+        hours = summary['hours_to_compliance']
+        lines.append(
+            f"- {summary['label']}: {summary['compliant']:,} of {summary['devices']:,} compliant "
+            f"({summary['not_applicable']:,} with nothing to back up), "
+            f"{summary['backed_off']:,} waiting (backed off), {summary['failing']:,} failing; "
+            f"{summary['runs']:,} runs, {summary['retries']:,} retries; "
+            f"median {_format_hours(hours['median'])}, 90% within {_format_hours(hours['p90'])}"
+        )
+        if summary['top_reasons']:
+            lines.append("  Top reasons: " + "; ".join(f"{reason} ({count:,})" for reason, count in summary['top_reasons']))
+    remediation_lines = "\n".join(lines)
+    add_notes(slide, f"""
+SPEAKER NOTES - Automatic Backup Status
+
+FROM THE INTUNE REMEDIATION REPORTS (Remediation-*.json):
+{remediation_lines}
+
+HOW THIS IS MEASURED:
+A device counts as compliant when its latest report succeeded or found
+nothing to back up (for example no WiFi on an Ethernet-only machine).
+Time to compliance runs from a device's first report to its first
+compliant one; retries are every report after a device's first. Backed
+off means the script waited for something on the device (for example
+OneDrive not running yet) and will try again.
+
+KEY MESSAGE:
+"Most of this already happened automatically - today we check it and finish what's left."
+""")
+
+    return slide
+
+def load_rollup(store_dir=DEFAULT_STORE_DIR):
+    """``Phase1Rollup`` of the ingested telemetry (see telemetry_store.py), or None if there is none"""
+    telemetry = TelemetryStore(store_dir).phase1()
+    return telemetry.rollup() if len(telemetry) else None
+
+def load_remediation(store_dir=DEFAULT_STORE_DIR):
+    """``RemediationRollup`` of the ingested remediation reports, or None if there are none"""
+    remediation = RemediationRollup(TelemetryStore(store_dir).remediation_reports())
+    return remediation if len(remediation) else None
+
+# Slides of the deck in order
+SLIDE_BUILDERS = [
+    add_title_slide,
+    add_overview_slide,
+    add_onedrive_slide,
+    add_browser_slide,
+    add_printers_slide,
+    add_wifi_slide,
+    add_outlook_slide,
+    add_ios_slide,
+    add_checklist_slide,
+    add_support_slide,
+]
+
+# Step slides and the telemetry step each one covers
+STEP_SLIDES = {
+    add_onedrive_slide: 'onedrive',
+    add_browser_slide: 'browsers',
+    add_printers_slide: 'printers',
+    add_wifi_slide: 'wifi',
+    add_outlook_slide: 'outlook',
+}
+
+# Outcome wording on per-device title slides
+STEP_FINDINGS = {
+    OK: "done",
+    ATTENTION: "needs attention",
+    FAILED: "failed last time",
+}
+
+def device_slide_builders(event):
+    """Slides a device's deck needs: every slide except steps its latest run found nothing to do for
+
+    The iOS slide is always kept because the backup script can't see
+    whether the user has an iPhone or iPad.
+    """
+    return [builder for builder in SLIDE_BUILDERS
+            if STEP_SLIDES.get(builder) is None or event.steps.get(STEP_SLIDES[builder]) != NOT_NEEDED]
+
+def device_findings(event):
+    """One-line summary of what a device's latest run found, e.g. 'OneDrive: needs attention • 2 PST files (1.6 GB)'"""
+    findings = [f"OneDrive: {STEP_FINDINGS.get(event.steps.get('onedrive'), 'not checked')}"]
+    if event.pst_count:
+        findings.append(f"{event.pst_count} PST file{'s' if event.pst_count != 1 else ''} ({event.pst_size_mb / 1024:.1f} GB)")
+    if event.printer_count:
+        findings.append(f"{event.printer_count} printer{'s' if event.printer_count != 1 else ''}")
+    if event.steps.get('wifi') == ATTENTION:
+        findings.append("WiFi: not connected")
+    elif event.wifi_ssid and event.steps.get('wifi') != NOT_NEEDED:
+        findings.append(f"WiFi: {event.wifi_ssid}")
+    return " • ".join(findings)
+
+def device_fields(event):
+    """Text filled into a device's deck"""
+    return {
+        'computer': event.computer,
+        'user': event.user or "this device's user",
+        'checked': f"{event.timestamp:%B} {event.timestamp.day}, {event.timestamp.year}",
+        'findings': device_findings(event),
+        'steps': str(sum(1 for builder in device_slide_builders(event) if builder in STEP_SLIDES or builder is add_ios_slide)),
+    }
+
+def add_device_title_slide(prs, fields):
+    """Device deck slide 1: device, user and what its last check found"""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+
+    add_title(slide, "Phase 1: Device Backup", 1.1)
+
+    add_text(slide, 1, 2.1, 8, 0.5, f"{fields['computer']} • {fields['user']}",
+             size=28, color='dark_gray', align=PP_ALIGN.CENTER)
+    add_text(slide, 1, 2.9, 8, 0.5, f"Your session covers {fields['steps']} steps",
+             size=18, bold=True, color='primary', align=PP_ALIGN.CENTER)
+    add_text(slide, 1, 3.5, 8, 0.6, f"Last check ({fields['checked']}): {fields['findings']}",
+             size=14, color='dark_gray', align=PP_ALIGN.CENTER, word_wrap=True)
+
+    add_notes(slide, f"""
+OPENING SCRIPT:
+"Today we're going to back up {fields['computer']} before we reset it. We checked this device on {fields['checked']}, so we'll only go through the steps it actually needs - {fields['steps']} of them."
+
+WHAT THE LAST CHECK FOUND:
+{fields['findings']}
+
+KEY POINTS:
+- Steps with nothing to back up on this device have been left out of this deck
+- Emphasize safety: "We won't reset until everything is backed up"
+- Check time availability before starting
+""")
+
+    return slide
+
+def renumber_steps(prs):
+    """Number the "Step N:" slide titles 1, 2, 3... in deck order (after slides were left out)"""
+    number = 0
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if not shape.has_text_frame or not re.match(r'Step \d+:', shape.text_frame.text):
+                continue
+            number += 1
+            run = shape.text_frame.paragraphs[0].runs[0]
+            run.text = re.sub(r'^Step \d+:', f'Step {number}:', run.text)
+            break
+
+def build_device_template(variant, values=None):
+    """Device deck for one set of slides (builder names, as from ``device_slide_builders``), with {{field}} tokens"""
+    builders = {builder.__name__: builder for builder in SLIDE_BUILDERS}
+    tokens = {field: DeckTemplate.token(field) for field in ('computer', 'user', 'checked', 'findings', 'steps')}
+    # The overview and checklist only list the steps the deck keeps
+    steps = {STEP_SLIDES[builders[name]] for name in variant if builders[name] in STEP_SLIDES}
+    profiler = get_profiler()
+    deck = f"phase1_device:{len(variant)}"
+
+    prs = new_presentation()
+    for name in variant:
+        builder = builders[name]
+        if builder is add_title_slide:
+            profiler.wrap(deck, 'device_title', add_device_title_slide)(prs, tokens)
+        elif builder in (add_overview_slide, add_checklist_slide):
+            profiler.wrap(deck, name, builder)(prs, steps)
+        else:
+            profiler.wrap(deck, name, builder)(prs)
+    renumber_steps(prs)
+    if values:
+        fill_placeholders(prs, values)
+    with profiler.measure('serialize', deck=deck):
+        return DeckTemplate(prs)
+
+def device_variant(event):
+    return tuple(builder.__name__ for builder in device_slide_builders(event))
+
+def device_deck_filename(event):
+    """File name for a device's deck, e.g. IPS-LT00042-Phase1-Guide.pptx"""
+    safe_name = re.sub(r'[^A-Za-z0-9]+', '-', event.computer).strip('-') or 'Device'
+    return f"{safe_name}-Phase1-Guide.pptx"
+
+# Device deck templates of this process, keyed by variant (set by _init_device_worker)
+_DEVICE_TEMPLATES = None
+
+def _init_device_worker(templates):
+    global _DEVICE_TEMPLATES
+    _DEVICE_TEMPLATES = templates
+
+def render_device_deck(event, output=None, templates=None, values=None):
+    """Write a device's tailored Phase 1 deck to ``output`` (path or binary file object)
+
+    ``event`` is the device's latest ``Phase1Event``; ``templates`` maps
+    each variant to its ``DeckTemplate`` (built on demand, with
+    ``values`` filled in, when missing).
+    """
+    global _DEVICE_TEMPLATES
+    if templates is None:
+        if _DEVICE_TEMPLATES is None:
+            _DEVICE_TEMPLATES = {}
+        templates = _DEVICE_TEMPLATES
+    variant = device_variant(event)
+    if variant not in templates:
+        templates[variant] = build_device_template(variant, values)
+    with get_profiler().measure('render', deck='phase1_device', device=event.computer) as record:
+        output, record['bytes'] = templates[variant].save(device_fields(event), output)
+    return output
+
+def create_device_deck(event, output_dir):
+    return render_device_deck(event, os.path.join(output_dir, device_deck_filename(event)))
+
+def create_device_decks(events, output_dir='phase1-devices', max_workers=None, values=None):
+    """Create a tailored Phase 1 deck for every device, fanned out across processes
+
+    One template is built here per distinct set of slides (at most
+    eight: printers, WiFi and Outlook are the optional steps); workers
+    only clone the right one and fill in the device's details. Devices
+    whose names map to the same file name get a numeric suffix.
+    """
+    events = list(events)
+    os.makedirs(output_dir, exist_ok=True)
+    templates = {variant: build_device_template(variant, values)
+                 for variant in sorted({device_variant(event) for event in events})}
+    names = set()
+    paths = [os.path.join(output_dir, unique_filename(device_deck_filename(event), names)) for event in events]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_device_worker,
+                             initargs=(templates,)) as executor:
+        output_files = list(executor.map(render_device_deck, events, paths, chunksize=8))
+    print(f"✅ Created {len(output_files)} device decks in {output_dir}/ ({len(templates)} slide sets)")
+    return output_files
+
+def build_presentation(values=None, rollup=None, remediation=None):
+    """Build the Phase 1 deck in memory; returns the Presentation
+
+    ``values`` fills in [YOUR ...] placeholders (see ``load_values``).
+    ``rollup`` (a ``Phase1Rollup``, see ``load_rollup``) adds measured
+    outcomes to each step slide and a "Where the Time Goes" slide after
+    the overview. ``remediation`` (a ``RemediationRollup``, see
+    ``load_remediation``) adds an "Automatic Backup Status" slide there.
+    """
+    prs = new_presentation()
+
+    profiler = get_profiler()
+    for builder in SLIDE_BUILDERS:
+        slide = profiler.wrap('phase1', builder.__name__, builder)(prs)
+        if rollup is not None and builder in STEP_SLIDES:
+            add_step_measurements(slide, rollup.steps[STEP_SLIDES[builder]])
+        elif builder is add_overview_slide:
+            if rollup is not None:
+                profiler.wrap('phase1', 'telemetry_summary', add_telemetry_summary_slide)(prs, rollup)
+            if remediation is not None:
+                profiler.wrap('phase1', 'remediation_status', add_remediation_status_slide)(prs, remediation)
+
+    if values:
+        fill_placeholders(prs, values)
+    return prs
+
+def render_presentation(output=None, values=None, rollup=None, remediation=None):
+    """Build the Phase 1 deck and save it to ``output`` (path or binary file object)
+
+    Returns ``output``, or a rewound ``BytesIO`` holding the deck when no
+    output is given.
+    """
+    prs = build_presentation(values, rollup, remediation)
+    with get_profiler().measure('save', deck='phase1') as record:
+        output, record['bytes'] = save_presentation(prs, output)
+    return output
+
+def create_presentation(values=None, rollup=None, remediation=None):
+    """Create the Phase 1 backup presentation (with measured outcomes when a ``rollup`` is given)"""
     print("\n╔══════════════════════════════════════════════════════════════════════╗")
     print("║  Phase 1 Backup Presentation Generator                              ║")
     print("╚══════════════════════════════════════════════════════════════════════╝\n")
 
     # Add all slides
-    add_title_slide(prs)
-    add_overview_slide(prs)
-    add_onedrive_slide(prs)
-    add_browser_slide(prs)
-    add_printers_slide(prs)
-    add_wifi_slide(prs)
-    add_outlook_slide(prs)
-    add_ios_slide(prs)
-    add_checklist_slide(prs)
-    add_support_slide(prs)
+    prs = build_presentation(values, rollup, remediation)
 
     # Save presentation
     output_file = 'Phase1-Backup-Guide.pptx'
-    prs.save(output_file)
-    file_size = os.path.getsize(output_file) / 1024
-    print(f"✅ Created: {output_file} ({file_size:.1f} KB)")
+    with get_profiler().measure('save', deck='phase1', output=output_file) as record:
+        _, record['bytes'] = save_presentation(prs, output_file)
+    print(f"✅ Created: {output_file} ({record['bytes'] / 1024:.1f} KB)")
 
     print("\n╔══════════════════════════════════════════════════════════════════════╗")
     print("║  ✅ Presentation Created Successfully                                 ║")
     print("╚══════════════════════════════════════════════════════════════════════╝\n")
     print("Files created:")
-    print(f"  • {output_file} (10 slides with detailed speaker notes)\n")
+    print(f"  • {output_file} ({len(prs.slides)} slides with detailed speaker notes)\n")
     print("Next steps:")
     print("  1. Replace support contact placeholders:")
     print("     - [YOUR IT SUPPORT EMAIL]")
@@ -672,5 +964,35 @@ def create_presentation():
 
     return output_file
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--values', default=None,
+                        help="YAML or JSON file of [YOUR ...] placeholder values to fill in (see placeholder-values.example.yaml)")
+    parser.add_argument('--telemetry', nargs='?', const=DEFAULT_STORE_DIR, default=None, metavar='STORE',
+                        help="show measured step outcomes, session times and Intune remediation status "
+                             f"from the telemetry store (see telemetry_store.py; default: {DEFAULT_STORE_DIR})")
+    parser.add_argument('--devices', nargs='?', const='phase1-devices', default=None, metavar='DIR',
+                        help="also create a deck per device in the telemetry store with only the slides it needs "
+                             "(default: phase1-devices)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for --devices (default: CPU count)")
+    parser.add_argument('--profile', nargs='?', const='-', default=None, metavar='PATH',
+                        help="write per-slide timing/memory records as JSON lines to PATH (default: stderr); "
+                             "also enabled by $DECK_PROFILE")
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
-    create_presentation()
+    args = parse_args()
+    if args.profile:
+        enable_profiling(args.profile)
+    values = load_values(args.values) if args.values else None
+    rollup = remediation = None
+    if args.telemetry:
+        rollup = load_rollup(args.telemetry)
+        if rollup is None:
+            print(f"⚠️  No Phase 1 telemetry in {args.telemetry} - building the deck without measurements")
+        remediation = load_remediation(args.telemetry)
+    create_presentation(values, rollup, remediation)
+    if args.devices:
+        devices = TelemetryStore(args.telemetry or DEFAULT_STORE_DIR).phase1().latest()
+        create_device_decks(devices.values(), args.devices, args.workers, values)
@@ -4,97 +4,286 @@ SharePoint Migration User Presentation Generator
 Creates a PowerPoint presentation for end-user migration communications
 """
 
-import json
+import argparse
 import os
-from datetime import datetime
+import re
+import sys
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
 from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.dml.color import RGBColor
-
-# Load migration statistics
-with open('/home/sully/shwiz.viyu.net/_demo/e2e-migration/_impact-migration/site-mapping.json', 'r') as f:
-    site_data = json.load(f)
-
-mappings = site_data.get('mappings', [])
-
-# Calculate statistics
-total_sites = len(mappings)
-complete_sites = len([s for s in mappings if s.get('status') == 'complete'])
-in_progress_sites = len([s for s in mappings if s.get('status') == 'in-progress'])
-pending_sites = total_sites - complete_sites - in_progress_sites
-
-# Calculate total storage and items from CSV-provided storageGB
-total_storage_gb = sum(s.get('storageGB', 0) for s in mappings if s.get('storageGB'))
-total_storage_tb = total_storage_gb / 1024
-
-# Estimate total files (using metadata when available)
-total_items = 0
-for site in mappings:
-    if site.get('metadata') and site['metadata'].get('libraries'):
-        for lib in site['metadata']['libraries']:
-            total_items += lib.get('itemCount', 0)
-
-# Color scheme (Microsoft 365 defaults + status colors)
-COLORS = {
-    'primary': RGBColor(0, 120, 212),      # Microsoft Blue #0078D4
-    'success': RGBColor(16, 124, 16),      # Green #107C10
-    'warning': RGBColor(255, 185, 0),      # Orange #FFB900
-    'error': RGBColor(209, 52, 56),        # Red #D13438
-    'dark_gray': RGBColor(50, 50, 50),
-    'light_gray': RGBColor(150, 150, 150),
-    'white': RGBColor(255, 255, 255)
+from pptx.enum.text import PP_ALIGN
+
+from deck_profile import enable_profiling, get_profiler
+from deck_template import DeckTemplate
+from mapping_watch import MappingWatcher
+from migration_stats import MigrationStats, storage_bucket_labels
+from render_cache import RenderCache, module_fingerprint, replace_slide, slide_key
+from stats_history import DEFAULT_HISTORY_DIR, StatsHistory
+from status_snapshots import site_id, status_delta
+from wave_scheduler import WEEKDAYS, MigrationWindows, schedule_sites
+import slidekit
+from slidekit import (
+    COLORS, add_column_chart, add_doughnut_chart, add_notes, add_paragraph, add_text, fill_placeholders,
+    load_spec, load_values, new_presentation, render_slide, save_presentation, set_placeholder_title, unique_filename
+)
+
+# Migration statistics (site-mapping.json is only read on first access)
+STATS = MigrationStats()
+
+# Text, layout and speaker notes of the static slides
+MAIN_DECK_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'specs', 'main-deck.yaml')
+
+# Status labels shown on per-site decks
+STATUS_LABELS = {
+    'complete': ("✅ Complete", COLORS['success']),
+    'in-progress': ("🔄 In Progress", COLORS['warning']),
+    'pending': ("⏳ Pending", COLORS['light_gray'])
 }
 
-def create_presentation():
-    """Create the main migration presentation"""
-    prs = Presentation()
-    prs.slide_width = Inches(10)  # Standard 16:9 widescreen
-    prs.slide_height = Inches(5.625)
+# Duration bands by item count, used until enough completed sites have timings
+# (see README "Duration estimates by size" and throughput.py); the hours are
+# each band's upper end, which the wave scheduler plans with
+DURATION_BANDS = [
+    (10000, "30 minutes to 1 hour", 1),
+    (50000, "1-2 hours", 2),
+    (100000, "2-3 hours", 3),
+]
+DURATION_MAX = "3-5 hours"
+DURATION_MAX_HOURS = 5
+
+# Migration Window text on briefs of sites the wave schedule has no slot for
+UNSCHEDULED_WINDOWS = {
+    'complete': "Migration complete",
+    'in-progress': "Migrating now",
+    'pending': "[DATE/TIME]",
+}
+
+
+def site_display_name(site):
+    """Human-readable name for a site-mapping.json entry"""
+    name = site.get('name') or site.get('siteName') or site.get('title')
+    if not name:
+        name = (site.get('sourceUrl') or site.get('url') or 'Unnamed Site').rstrip('/').rsplit('/', 1)[-1]
+    return name
+
+
+def site_item_count(site):
+    """Total items across a site's libraries (0 when metadata is missing)"""
+    libraries = (site.get('metadata') or {}).get('libraries') or []
+    return sum(lib.get('itemCount', 0) for lib in libraries)
+
+
+def estimate_duration(item_count, storage_gb=0, throughput=None):
+    """Migration duration estimate for a site
+
+    Uses the ``ThroughputModel`` fitted from completed sites when one is
+    given (see ``MigrationStats.throughput``), else the fixed size bands.
+    """
+    if throughput is not None:
+        return throughput.estimate(item_count, storage_gb)
+    for limit, duration, _ in DURATION_BANDS:
+        if item_count < limit:
+            return duration
+    return DURATION_MAX
+
+
+def estimate_hours(item_count, storage_gb=0, throughput=None):
+    """Hours to plan for a site's migration (``estimate_duration`` as a number)"""
+    if throughput is not None:
+        return throughput.estimate_hours(item_count, storage_gb)
+    for limit, _, hours in DURATION_BANDS:
+        if item_count < limit:
+            return hours
+    return DURATION_MAX_HOURS
+
+
+def build_schedule(stats, start_date, window='18:00-06:00', nights=WEEKDAYS, concurrency=4):
+    """Wave schedule of every pending site from ``start_date`` (see wave_scheduler.py)
+
+    Each site is planned for its estimated duration, from the fitted
+    throughput model when there is one, else the upper end of its size band.
+    """
+    throughput = stats.throughput
+    pending = (
+        (site_id(site), site_display_name(site),
+         estimate_hours(site_item_count(site), site.get('storageGB') or 0, throughput))
+        for site in stats.iter_sites() if site_status(site) == 'pending'
+    )
+    return schedule_sites(pending, MigrationWindows(start_date, window, nights), concurrency)
+
+
+def slide_plan(stats, spec=None, delta=None, schedule=None):
+    """Slides of the main deck in order: (name, builder, args, inputs read)
+
+    ``inputs`` lists the data each builder reads besides its own text, so
+    the render cache can tell which slides need re-rendering. Static slides
+    come from the deck spec (specs/main-deck.yaml); their inputs are the
+    slide's spec entry. A "Since Last Update" slide follows the charts
+    slide when a ``StatusDelta`` is given (see ``record_history``), and a
+    "Migration Schedule" slide follows the timeline when a wave
+    ``Schedule`` is given (see ``build_schedule``).
+    """
+    if spec is None:
+        spec = load_spec(MAIN_DECK_SPEC)
+
+    def from_spec(name):
+        slide_spec = spec[name]
+        return (name, render_slide, (slide_spec,), {'spec': slide_spec.source})
+
+    counts = {
+        'total_sites': stats.total_sites,
+        'complete_sites': stats.complete_sites,
+        'in_progress_sites': stats.in_progress_sites,
+        'pending_sites': stats.pending_sites
+    }
+
+    plan = [
+        # Slide 1: Title Slide
+        ('title', add_title_slide, (), {'month': datetime.now().strftime("%B %Y")}),
+        # Slide 2: Why We're Migrating
+        from_spec('why_migrating'),
+        # Slide 3: What's Being Migrated
+        ('scope', add_scope_slide, (stats,), dict(
+            counts, total_storage_gb=stats.total_storage_gb, total_items=stats.total_items
+        )),
+        # Slide 4: Current Status
+        ('status', add_status_slide, (stats,), dict(
+            counts, date=datetime.now().strftime('%B %d, %Y')
+        )),
+        # Slide 4b: Progress at a Glance (charts)
+        ('charts', add_charts_slide, (stats,), dict(
+            counts, storage_histogram=stats.storage_histogram, top_libraries=stats.top_libraries()
+        )),
+        # Slide 5: What Changes
+        from_spec('changes'),
+        # Slide 6: Timeline (template with placeholders)
+        ('timeline', add_timeline_slide, (), {}),
+        # Slide 7: During Migration
+        from_spec('during_migration'),
+        # Slide 8: After Migration
+        from_spec('after_migration'),
+        # Slide 9: FAQ
+        from_spec('faq'),
+        # Slide 10: Dashboard
+        from_spec('dashboard'),
+        # Slide 11: Support
+        from_spec('support'),
+        # Slide 12: Key Takeaways
+        from_spec('takeaways')
+    ]
 
-    # Slide 1: Title Slide
-    slide = add_title_slide(prs)
+    if schedule is not None:
+        # Slide 6b: Migration Schedule
+        timeline = next(i for i, entry in enumerate(plan) if entry[0] == 'timeline')
+        plan.insert(timeline + 1, ('schedule', add_schedule_slide, (schedule,), schedule.as_dict()))
+    if delta is not None:
+        # Slide 4c: Since Last Update
+        charts = next(i for i, entry in enumerate(plan) if entry[0] == 'charts')
+        plan.insert(charts + 1, ('since_last_update', add_delta_slide, (delta,), delta.as_dict()))
+    return plan
+
+
+def record_history(stats, directory=DEFAULT_HISTORY_DIR):
+    """Append every site's status, storage and item count to the statistics history
+
+    Returns the ``StatusDelta`` between the last two stored runs (None
+    until there are two) for the "Since Last Update" slide.
+    """
+    history = StatsHistory(directory)
+    history.append(
+        (site_id(site), site_display_name(site), site_status(site), site.get('storageGB') or 0, site_item_count(site))
+        for site in stats.iter_sites()
+    )
+    return status_delta(history)
 
-    # Slide 2: Why We're Migrating
-    slide = add_why_migrating_slide(prs)
 
-    # Slide 3: What's Being Migrated
-    slide = add_scope_slide(prs)
+def theme_inputs():
+    """Deck-wide styling every slide depends on (colors and the slidekit helpers)"""
+    theme = {name: str(color) for name, color in COLORS.items()}
+    theme['slidekit'] = module_fingerprint(slidekit.builders, slidekit.charts, slidekit.spec, slidekit.styles)
+    return theme
 
-    # Slide 4: Current Status
-    slide = add_status_slide(prs)
 
-    # Slide 5: What Changes
-    slide = add_changes_slide(prs)
+def build_presentation(stats=None, values=None, plan=None):
+    """Build the main deck in memory (no render cache); returns the Presentation"""
+    stats = stats or STATS
+    if plan is None:
+        plan = slide_plan(stats, load_spec(MAIN_DECK_SPEC, values))
+    profiler = get_profiler()
 
-    # Slide 6: Timeline (template with placeholders)
-    slide = add_timeline_slide(prs)
+    prs = new_presentation()
+    for name, builder, args, _ in plan:
+        profiler.wrap('main', name, builder)(prs, *args)
 
-    # Slide 7: During Migration
-    slide = add_during_migration_slide(prs)
+    # Spec slides are filled in when compiled; this covers the generated ones
+    if values:
+        with profiler.measure('fill', deck='main'):
+            fill_placeholders(prs, values)
+    return prs
 
-    # Slide 8: After Migration
-    slide = add_after_migration_slide(prs)
 
-    # Slide 9: FAQ
-    slide = add_faq_slide(prs)
+def render_presentation(output=None, stats=None, values=None):
+    """Build the main deck and save it to ``output`` (path or binary file object)
 
-    # Slide 10: Dashboard
-    slide = add_dashboard_slide(prs)
+    Returns ``output``, or a rewound ``BytesIO`` holding the deck when no
+    output is given, so a service can stream it without touching disk.
+    """
+    prs = build_presentation(stats, values)
+    with get_profiler().measure('save', deck='main') as record:
+        output, record['bytes'] = save_presentation(prs, output)
+    return output
 
-    # Slide 11: Support
-    slide = add_support_slide(prs)
 
-    # Slide 12: Key Takeaways
-    slide = add_takeaways_slide(prs)
+def create_presentation(stats=None, force=False, values=None, delta=None, schedule=None):
+    """Create the main migration presentation
 
-    # Save main presentation
+    Slides whose inputs are unchanged since the last build are reused from
+    the existing file (see render_cache.py); ``force`` rebuilds everything.
+    ``values`` fills in [YOUR ...] placeholders (see ``load_values``),
+    ``delta`` adds the "Since Last Update" slide and ``schedule`` the
+    "Migration Schedule" slide.
+    """
+    stats = stats or STATS
     output_file = 'SharePoint-Migration-User-Guide.pptx'
-    prs.save(output_file)
-    print(f"✅ Created: {output_file} ({os.path.getsize(output_file) / 1024:.1f} KB)")
+
+    plan = slide_plan(stats, load_spec(MAIN_DECK_SPEC, values), delta, schedule)
+    theme = dict(theme_inputs(), values=values or {})
+    keys = [(name, slide_key(builder, dict(inputs, theme=theme))) for name, builder, _, inputs in plan]
+
+    cache = RenderCache()
+    changed = None if force else cache.changed_slides(output_file, keys)
+    profiler = get_profiler()
+
+    if changed == []:
+        print(f"⏭️  Up to date: {output_file} (no slide inputs changed)")
+    elif changed:
+        # Re-render only the affected slides in the existing deck
+        prs = Presentation(output_file)
+        for index in changed:
+            name, builder, args, _ = plan[index]
+            replace_slide(prs, index, profiler.wrap('main', name, builder), *args)
+        if values:
+            fill_placeholders(prs, values)
+        with profiler.measure('save', deck='main', output=output_file) as record:
+            _, record['bytes'] = save_presentation(prs, output_file)
+        slide_numbers = ', '.join(str(index + 1) for index in changed)
+        print(f"✅ Updated: {output_file} (slides {slide_numbers}) ({record['bytes'] / 1024:.1f} KB)")
+    else:
+        prs = build_presentation(stats, values, plan)
+
+        # Save main presentation
+        with profiler.measure('save', deck='main', output=output_file) as record:
+            _, record['bytes'] = save_presentation(prs, output_file)
+        print(f"✅ Created: {output_file} ({record['bytes'] / 1024:.1f} KB)")
+
+    cache.record(output_file, keys)
 
     # Create per-site template
-    create_site_template()
+    create_site_template(cache, force)
+
+    cache.save()
 
     return output_file
 
@@ -105,42 +294,19 @@ def add_title_slide(prs):
     slide = prs.slides.add_slide(slide_layout)
 
     # Title
-    title_box = slide.shapes.add_textbox(
-        Inches(1), Inches(2), Inches(8), Inches(1)
-    )
-    title_frame = title_box.text_frame
-    title_frame.text = "SharePoint Migration"
-    title_para = title_frame.paragraphs[0]
-    title_para.font.size = Pt(54)
-    title_para.font.bold = True
-    title_para.font.color.rgb = COLORS['primary']
-    title_para.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1, 2, 8, 1, "SharePoint Migration",
+             size=54, bold=True, color='primary', align=PP_ALIGN.CENTER)
 
     # Subtitle
-    subtitle_box = slide.shapes.add_textbox(
-        Inches(1), Inches(3), Inches(8), Inches(0.8)
-    )
-    subtitle_frame = subtitle_box.text_frame
-    subtitle_frame.text = "Your Guide to the Transition"
-    subtitle_para = subtitle_frame.paragraphs[0]
-    subtitle_para.font.size = Pt(32)
-    subtitle_para.font.color.rgb = COLORS['dark_gray']
-    subtitle_para.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1, 3, 8, 0.8, "Your Guide to the Transition",
+             size=32, color='dark_gray', align=PP_ALIGN.CENTER)
 
     # Date
-    date_box = slide.shapes.add_textbox(
-        Inches(1), Inches(4.5), Inches(8), Inches(0.5)
-    )
-    date_frame = date_box.text_frame
-    date_frame.text = datetime.now().strftime("%B %Y")
-    date_para = date_frame.paragraphs[0]
-    date_para.font.size = Pt(18)
-    date_para.font.color.rgb = COLORS['light_gray']
-    date_para.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1, 4.5, 8, 0.5, datetime.now().strftime("%B %Y"),
+             size=18, color='light_gray', align=PP_ALIGN.CENTER)
 
     # Add speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 SPEAKER NOTES - Title Slide
 
 INTRODUCTION:
@@ -157,136 +323,43 @@ TONE:
 - Open to questions throughout
 
 TIME: 1-2 minutes
-"""
-
-    return slide
-
-
-def add_why_migrating_slide(prs):
-    """Slide 2: Why We're Migrating"""
-    slide_layout = prs.slide_layouts[1]  # Title and Content
-    slide = prs.slides.add_slide(slide_layout)
-
-    title = slide.shapes.title
-    title.text = "Why We're Migrating"
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
-
-    # Content
-    body_shape = slide.placeholders[1]
-    tf = body_shape.text_frame
-    tf.text = "Moving to Impact Property Solutions Tenant"
-
-    benefits = [
-        ("Unified collaboration platform", COLORS['success']),
-        ("Enhanced security and compliance", COLORS['success']),
-        ("Better integration with Microsoft 365", COLORS['success']),
-        ("Consolidated user management", COLORS['success']),
-        ("Improved performance and reliability", COLORS['success'])
-    ]
-
-    for benefit, color in benefits:
-        p = tf.add_paragraph()
-        p.text = benefit
-        p.level = 1
-        p.font.size = Pt(20)
-        p.font.color.rgb = color
-        p.space_before = Pt(6)
-
-    # Key message box at bottom
-    key_message_box = slide.shapes.add_textbox(
-        Inches(1), Inches(4.5), Inches(8), Inches(0.8)
-    )
-    km_frame = key_message_box.text_frame
-    km_frame.text = '"Better tools, same content, minimal disruption"'
-    km_para = km_frame.paragraphs[0]
-    km_para.font.size = Pt(18)
-    km_para.font.italic = True
-    km_para.font.color.rgb = COLORS['primary']
-    km_para.alignment = PP_ALIGN.CENTER
-
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - Why We're Migrating
-
-KEY MESSAGE:
-"This migration brings us into a unified Microsoft 365 environment with better security, performance, and collaboration capabilities."
-
-TALKING POINTS:
-- Unified platform: All teams on same infrastructure
-- Security: Enhanced compliance and data protection
-- Integration: Seamless with Teams, OneDrive, Outlook
-- Management: Simplified IT administration and support
-- Performance: Faster access, better reliability
-
-ANTICIPATED QUESTIONS:
-Q: "Why now?"
-A: "Strategic alignment with company consolidation and improved tools"
-
-Q: "What's wrong with current system?"
-A: "Nothing broken - this is an upgrade and unification"
-
-PAUSE FOR QUESTIONS: After explaining benefits
-
-TIME: 2-3 minutes
-"""
+""")
 
     return slide
 
 
-def add_scope_slide(prs):
+def add_scope_slide(prs, stats):
     """Slide 3: Migration Scope"""
     slide_layout = prs.slide_layouts[1]
     slide = prs.slides.add_slide(slide_layout)
 
-    title = slide.shapes.title
-    title.text = "What's Being Migrated"
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
+    set_placeholder_title(slide, "What's Being Migrated")
 
     # Statistics boxes
-    stats = [
-        (f"{total_sites} SharePoint Sites", Inches(0.5), COLORS['primary']),
-        (f"{total_storage_tb:.2f} TB of Content", Inches(3), COLORS['success']),
-        (f"~{total_items//1000}K+ Files", Inches(5.5), COLORS['warning']),
-        ("All Departments", Inches(8), COLORS['error'])
+    stat_boxes = [
+        (f"{stats.total_sites} SharePoint Sites", 0.5, COLORS['primary']),
+        (f"{stats.total_storage_tb:.2f} TB of Content", 3, COLORS['success']),
+        (f"~{stats.total_items//1000}K+ Files", 5.5, COLORS['warning']),
+        ("All Departments", 8, COLORS['error'])
     ]
 
-    for stat_text, left_pos, color in stats:
-        stat_box = slide.shapes.add_textbox(
-            left_pos, Inches(2), Inches(2), Inches(1)
-        )
-        frame = stat_box.text_frame
-        frame.text = stat_text
-        para = frame.paragraphs[0]
-        para.font.size = Pt(18)
-        para.font.bold = True
-        para.font.color.rgb = color
-        para.alignment = PP_ALIGN.CENTER
+    for stat_text, left_pos, color in stat_boxes:
+        add_text(slide, left_pos, 2, 2, 1, stat_text,
+                 size=18, bold=True, color=color, align=PP_ALIGN.CENTER)
 
     # List of key departments
-    dept_text = slide.shapes.add_textbox(
-        Inches(1.5), Inches(3.5), Inches(7), Inches(1.5)
-    )
-    dept_frame = dept_text.text_frame
-    dept_frame.text = "Key Sites: SeniorLiving • Workorders • Credit • Purchasing • Finance • Operations • Contracts • AccountsPayable • RNC • and many more..."
-    dept_para = dept_frame.paragraphs[0]
-    dept_para.font.size = Pt(16)
-    dept_para.font.color.rgb = COLORS['dark_gray']
-    dept_para.alignment = PP_ALIGN.CENTER
-    dept_frame.word_wrap = True
+    add_text(slide, 1.5, 3.5, 7, 1.5, "Key Sites: SeniorLiving • Workorders • Credit • Purchasing • Finance • Operations • Contracts • AccountsPayable • RNC • and many more...",
+             size=16, color='dark_gray', align=PP_ALIGN.CENTER, word_wrap=True)
 
     # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = f"""
+    add_notes(slide, f"""
 SPEAKER NOTES - Migration Scope
 
 STATISTICS:
-- Total Sites: {total_sites}
-- Total Storage: {total_storage_tb:.2f} TB ({total_storage_gb:.0f} GB)
-- Estimated Files: ~{total_items:,} items
-- Status: {complete_sites} complete, {in_progress_sites} in progress, {pending_sites} pending
+- Total Sites: {stats.total_sites}
+- Total Storage: {stats.total_storage_tb:.2f} TB ({stats.total_storage_gb:.0f} GB)
+- Estimated Files: ~{stats.total_items:,} items
+- Status: {stats.complete_sites} complete, {stats.in_progress_sites} in progress, {stats.pending_sites} pending
 
 KEY MESSAGE:
 "We're migrating your entire SharePoint environment - every site, every file, every permission."
@@ -306,82 +379,50 @@ EXAMPLES:
 PAUSE: "Does everyone see their department represented?"
 
 TIME: 2-3 minutes
-"""
+""")
 
     return slide
 
 
-def add_status_slide(prs):
+def add_status_slide(prs, stats):
     """Slide 4: Current Status"""
     slide_layout = prs.slide_layouts[1]
     slide = prs.slides.add_slide(slide_layout)
 
-    title = slide.shapes.title
-    title.text = "Where We Are Today"
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
+    set_placeholder_title(slide, "Where We Are Today")
 
     # Status boxes with icons
-    complete_pct = (complete_sites / total_sites * 100) if total_sites > 0 else 0
+    complete_pct = stats.complete_pct
 
     statuses = [
-        (f"✅ {complete_sites} Sites Complete", f"({complete_pct:.0f}%)", COLORS['success'], Inches(0.5)),
-        (f"🔄 {in_progress_sites} Sites In Progress", "", COLORS['warning'], Inches(3.5)),
-        (f"⏳ {pending_sites} Sites Pending", "", COLORS['light_gray'], Inches(6.5))
+        (f"✅ {stats.complete_sites} Sites Complete", f"({complete_pct:.0f}%)", COLORS['success'], 0.5),
+        (f"🔄 {stats.in_progress_sites} Sites In Progress", "", COLORS['warning'], 3.5),
+        (f"⏳ {stats.pending_sites} Sites Pending", "", COLORS['light_gray'], 6.5)
     ]
 
     for status_text, pct_text, color, left_pos in statuses:
-        status_box = slide.shapes.add_textbox(
-            left_pos, Inches(2), Inches(2.5), Inches(1.2)
-        )
-        frame = status_box.text_frame
-        frame.text = status_text
-        para = frame.paragraphs[0]
-        para.font.size = Pt(18)
-        para.font.bold = True
-        para.font.color.rgb = color
-        para.alignment = PP_ALIGN.CENTER
+        frame = add_text(slide, left_pos, 2, 2.5, 1.2, status_text,
+                         size=18, bold=True, color=color, align=PP_ALIGN.CENTER)
 
         if pct_text:
-            p = frame.add_paragraph()
-            p.text = pct_text
-            p.font.size = Pt(16)
-            p.font.color.rgb = color
-            p.alignment = PP_ALIGN.CENTER
+            add_paragraph(frame, pct_text, size=16, color=color, align=PP_ALIGN.CENTER)
 
     # Dashboard link
-    dashboard_box = slide.shapes.add_textbox(
-        Inches(2), Inches(4), Inches(6), Inches(0.8)
-    )
-    dash_frame = dashboard_box.text_frame
-    dash_frame.text = "Track Your Site: http://10.0.0.89:8080"
-    dash_para = dash_frame.paragraphs[0]
-    dash_para.font.size = Pt(20)
-    dash_para.font.bold = True
-    dash_para.font.color.rgb = COLORS['primary']
-    dash_para.alignment = PP_ALIGN.CENTER
+    add_text(slide, 2, 4, 6, 0.8, "Track Your Site: http://10.0.0.89:8080",
+             size=20, bold=True, color='primary', align=PP_ALIGN.CENTER)
 
     # Add hyperlink instructions
-    note_box = slide.shapes.add_textbox(
-        Inches(2), Inches(4.8), Inches(6), Inches(0.5)
-    )
-    note_frame = note_box.text_frame
-    note_frame.text = "(Accessible on corporate network • Real-time updates • Filter by site name)"
-    note_para = note_frame.paragraphs[0]
-    note_para.font.size = Pt(12)
-    note_para.font.italic = True
-    note_para.font.color.rgb = COLORS['light_gray']
-    note_para.alignment = PP_ALIGN.CENTER
+    add_text(slide, 2, 4.8, 6, 0.5, "(Accessible on corporate network • Real-time updates • Filter by site name)",
+             size=12, italic=True, color='light_gray', align=PP_ALIGN.CENTER)
 
     # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = f"""
+    add_notes(slide, f"""
 SPEAKER NOTES - Current Status
 
 CURRENT STATISTICS (as of {datetime.now().strftime('%B %d, %Y')}):
-- Complete: {complete_sites}/{total_sites} sites ({complete_pct:.0f}%)
-- In Progress: {in_progress_sites} sites
-- Pending: {pending_sites} sites
+- Complete: {stats.complete_sites}/{stats.total_sites} sites ({complete_pct:.0f}%)
+- In Progress: {stats.in_progress_sites} sites
+- Pending: {stats.pending_sites} sites
 
 KEY MESSAGE:
 "We've successfully migrated {complete_pct:.0f}% of sites. You can track your site's status in real-time on our dashboard."
@@ -408,191 +449,163 @@ A: "Depends on size: small sites 30min-1hr, large sites 2-5hrs"
 PAUSE: "Let me show you how to check your site status..."
 
 TIME: 3-4 minutes (with demo)
-"""
+""")
 
     return slide
 
 
-def add_changes_slide(prs):
-    """Slide 5: What Changes"""
-    slide_layout = prs.slide_layouts[1]
+def add_charts_slide(prs, stats):
+    """Slide 4b: Progress at a Glance (native charts)"""
+    slide_layout = prs.slide_layouts[5]
     slide = prs.slides.add_slide(slide_layout)
 
-    title = slide.shapes.title
-    title.text = "What Changes for You"
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
+    set_placeholder_title(slide, "Progress at a Glance")
 
-    # Two columns: What Changes vs What Doesn't
-    # Left column - Changes
-    changes_box = slide.shapes.add_textbox(
-        Inches(0.5), Inches(1.5), Inches(4.5), Inches(3.5)
+    add_doughnut_chart(
+        slide, 0.2, 1.5, 3.1, 3.9,
+        ['Complete', 'In Progress', 'Pending'],
+        [stats.complete_sites, stats.in_progress_sites, stats.pending_sites],
+        colors=['success', 'warning', 'light_gray'], title="Sites by Status"
+    )
+    add_column_chart(
+        slide, 3.4, 1.5, 3.2, 3.9, storage_bucket_labels(), stats.storage_histogram,
+        color='primary', title="Sites by Storage Size", series_name='Sites'
+    )
+    libraries = stats.top_libraries() or [('No library data', 0)]
+    add_column_chart(
+        slide, 6.7, 1.5, 3.1, 3.9, [name for name, _ in libraries],
+        [round(items / 1000) for _, items in libraries],
+        color='success', title="Items by Library (K)", series_name='Items (K)', horizontal=True
     )
-    changes_frame = changes_box.text_frame
-    changes_frame.text = "What's Changing"
-    para = changes_frame.paragraphs[0]
-    para.font.size = Pt(24)
-    para.font.bold = True
-    para.font.color.rgb = COLORS['error']
-
-    changes = [
-        "Email domain: @impactpropertysolutions.com",
-        "Site tenant: Interior Logic → Impact Floors"
-    ]
 
-    for change in changes:
-        p = changes_frame.add_paragraph()
-        p.text = f"• {change}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = COLORS['dark_gray']
-        p.space_before = Pt(8)
+    largest = max(zip(stats.storage_histogram, storage_bucket_labels()))
+    add_notes(slide, f"""
+SPEAKER NOTES - Progress at a Glance
 
-    # Right column - NOT changing
-    nochange_box = slide.shapes.add_textbox(
-        Inches(5.5), Inches(1.5), Inches(4), Inches(3.5)
-    )
-    nochange_frame = nochange_box.text_frame
-    nochange_frame.text = "What's NOT Changing"
-    para = nochange_frame.paragraphs[0]
-    para.font.size = Pt(24)
-    para.font.bold = True
-    para.font.color.rgb = COLORS['success']
-
-    nochanges = [
-        "Site URLs (bookmarks still work!)",
-        "Your permissions and access",
-        "Files, folders, and version history",
-        "Shared links and external sharing",
-        "Your familiar SharePoint interface"
-    ]
+LEFT - SITES BY STATUS:
+- {stats.complete_sites} complete, {stats.in_progress_sites} in progress, {stats.pending_sites} pending ({stats.complete_pct:.0f}% done)
 
-    for nochange in nochanges:
-        p = nochange_frame.add_paragraph()
-        p.text = f"✓ {nochange}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = COLORS['dark_gray']
-        p.space_before = Pt(8)
+MIDDLE - SITES BY STORAGE SIZE:
+- Most sites are {largest[1]} ({largest[0]} sites)
+- Larger sites take longer to migrate (see the duration estimates on the Timeline slide)
 
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - What Changes
+RIGHT - ITEMS BY LIBRARY:
+- Where the {stats.total_items:,} files live; {libraries[0][0]} holds the most ({libraries[0][1]:,} items)
 
-KEY MESSAGE: "Very little changes from your perspective"
+KEY MESSAGE:
+"Most of our sites are small, and the big ones are scheduled with extra time."
 
-TALKING POINTS:
+TIME: 1-2 minutes
+""")
 
-WHAT'S CHANGING (MINIMAL):
-- Email domain: @interiorlogicgroup.com → @impactpropertysolutions.com
-  (Your old email will forward automatically)
-- Behind-the-scenes: Different tenant infrastructure
-  (You won't notice this technical detail)
-
-WHAT'S NOT CHANGING (CRITICAL):
-- Site URLs: /sites/PS-Sales stays /sites/PS-Sales
-  → Bookmarks, shortcuts, links all work
-  → No need to update documentation
-  → Browser favorites still valid
-
-- Permissions: Exact same access levels
-  → If you're an Owner, you're still an Owner
-  → If you can read, you can still read
-  → If you can edit, you can still edit
-
-- Content: Everything preserved
-  → All files and folders
-  → All version history
-  → All metadata (created by, modified date, etc.)
-
-- Sharing: External links still work
-  → Anyone links remain active
-  → Specific people sharing preserved
-  → External user access maintained
+    return slide
 
-EXAMPLES:
-"For example, if you have a bookmark to /sites/PS-Sales/Documents/Budget.xlsx,
-that bookmark will continue to work after migration. You won't need to change anything."
 
-ANTICIPATED QUESTIONS:
-Q: "Do I need to update my browser bookmarks?"
-A: "No! Site URLs stay exactly the same."
+def add_delta_slide(prs, delta):
+    """Slide 4c: Since Last Update (progress between stored runs)"""
+    slide_layout = prs.slide_layouts[1]
+    slide = prs.slides.add_slide(slide_layout)
 
-Q: "What about documents I have open?"
-A: "Save and close them before your site's migration window."
+    set_placeholder_title(slide, "Since Last Update")
 
-Q: "Will my shared links break?"
-A: "No, all sharing links are preserved automatically."
+    add_text(slide, 0.5, 1.5, 9, 0.4, f"Changes since {delta.since.strftime('%B %d, %Y')}",
+             size=16, italic=True, color='dark_gray', align=PP_ALIGN.CENTER)
 
-PAUSE: "Any questions about what's changing for your daily work?"
+    per_day = f"{delta.per_day:.1f} Sites / Day" if delta.per_day is not None else "Sites / Day: TBD"
+    finish = delta.projected_finish.strftime('%b %d, %Y') if delta.projected_finish else "TBD"
+    boxes = [
+        (f"✅ {len(delta.newly_completed)} Newly Complete", COLORS['success'], 0.5),
+        (f"🔄 {len(delta.started)} Started", COLORS['warning'], 2.75),
+        (f"📈 {per_day}", COLORS['primary'], 5),
+        (f"🏁 Finish: {finish}", COLORS['dark_gray'], 7.25)
+    ]
+    for text, color, left_pos in boxes:
+        add_text(slide, left_pos, 2.1, 2.25, 0.9, text,
+                 size=16, bold=True, color=color, align=PP_ALIGN.CENTER, word_wrap=True)
+
+    # Newly completed sites (the full list is in the notes)
+    shown = delta.newly_completed[:8]
+    if shown:
+        listing = " • ".join(shown)
+        if len(delta.newly_completed) > len(shown):
+            listing += f" • and {len(delta.newly_completed) - len(shown)} more"
+    else:
+        listing = "No sites completed since the last update"
+    add_text(slide, 1, 3.3, 8, 1.5, listing, size=14, color='dark_gray', align=PP_ALIGN.CENTER, word_wrap=True)
+
+    completed_list = "\n".join(f"- {name}" for name in delta.newly_completed) or "- (none)"
+    add_notes(slide, f"""
+SPEAKER NOTES - Since Last Update
+
+PROGRESS SINCE {delta.since.strftime('%B %d, %Y %H:%M').upper()}:
+- Newly complete: {len(delta.newly_completed)} sites
+- Started: {len(delta.started)} sites
+- New in the mapping: {len(delta.added)} sites (removed: {delta.removed})
+- Remaining: {delta.remaining} sites
+
+THROUGHPUT (last 14 days): {per_day}
+PROJECTED FINISH: {finish}
+(Assumes the recent pace continues.)
+
+NEWLY COMPLETE:
+{completed_list}
 
-EMPHASIS: Repeat URL preservation - this is users' #1 concern
+KEY MESSAGE:
+"Since our last update, {len(delta.newly_completed)} more sites have moved over."
 
-TIME: 3-4 minutes
-"""
+TIME: 1-2 minutes
+""")
 
     return slide
 
 
-def add_timeline_slide(prs):
-    """Slide 6: Timeline (template for per-site customization)"""
+def add_timeline_slide(prs, fields=None):
+    """Slide 6: Timeline (template for per-site customization)
+
+    Pass ``site_fields()`` for a site as ``fields`` to fill in the site
+    name, duration and item count instead of leaving placeholders, plus
+    the migration window when ``fields`` has one.
+    """
     slide_layout = prs.slide_layouts[1]
     slide = prs.slides.add_slide(slide_layout)
 
-    title = slide.shapes.title
-    title.text = "Your Site Migration Schedule"
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
+    set_placeholder_title(slide, "Your Site Migration Schedule")
 
     # Site-specific placeholders (large and obvious for editing)
     placeholders = [
-        ("Your Site:", "[SITE NAME]", Inches(1), Inches(1.8)),
-        ("Migration Window:", "[DATE/TIME]", Inches(1), Inches(2.3)),
-        ("Expected Duration:", "[X hours based on size]", Inches(1), Inches(2.8)),
-        ("Estimated Items:", "[XX,XXX items]", Inches(1), Inches(3.3))
+        ("Your Site:", "[SITE NAME]", 1, 1.8),
+        ("Migration Window:", "[DATE/TIME]", 1, 2.3),
+        ("Expected Duration:", "[X hours based on size]", 1, 2.8),
+        ("Estimated Items:", "[XX,XXX items]", 1, 3.3)
     ]
 
+    if fields is not None:
+        placeholders = [
+            ("Your Site:", fields['name'], 1, 1.8),
+            ("Migration Window:", fields.get('window', "[DATE/TIME]"), 1, 2.3),
+            ("Expected Duration:", fields['duration'], 1, 2.8),
+            ("Estimated Items:", f"{fields['items']} items", 1, 3.3)
+        ]
+
     for label, placeholder, left, top in placeholders:
         # Label
-        label_box = slide.shapes.add_textbox(left, top, Inches(2.5), Inches(0.4))
-        label_frame = label_box.text_frame
-        label_frame.text = label
-        label_para = label_frame.paragraphs[0]
-        label_para.font.size = Pt(18)
-        label_para.font.bold = True
-        label_para.font.color.rgb = COLORS['dark_gray']
+        add_text(slide, left, top, 2.5, 0.4, label, size=18, bold=True, color='dark_gray')
 
         # Value
-        value_box = slide.shapes.add_textbox(left + Inches(2.5), top, Inches(5.5), Inches(0.4))
-        value_frame = value_box.text_frame
-        value_frame.text = placeholder
-        value_para = value_frame.paragraphs[0]
-        value_para.font.size = Pt(18)
-        value_para.font.color.rgb = COLORS['error']  # Red to make obvious it needs editing
-        value_para.font.italic = True
+        # Red italic makes it obvious a value still needs editing
+        value_style = 'placeholder' if placeholder.startswith('[') else 'body'
+        add_text(slide, left + 2.5, top, 5.5, 0.4, placeholder, value_style)
 
     # Dashboard link
-    dash_box = slide.shapes.add_textbox(
-        Inches(1), Inches(4), Inches(8), Inches(0.5)
-    )
-    dash_frame = dash_box.text_frame
-    dash_frame.text = "Current Status: Check Dashboard → http://10.0.0.89:8080"
-    dash_para = dash_frame.paragraphs[0]
-    dash_para.font.size = Pt(16)
-    dash_para.font.color.rgb = COLORS['primary']
+    add_text(slide, 1, 4, 8, 0.5, "Current Status: Check Dashboard → http://10.0.0.89:8080",
+             size=16, color='primary')
 
     # Timeline bullets
-    timeline_box = slide.shapes.add_textbox(
-        Inches(1), Inches(4.7), Inches(8), Inches(0.6)
-    )
-    timeline_frame = timeline_box.text_frame
-    timeline_frame.text = "• Pre-migration notification: 48 hours before  • Migration begins: [Start time]  • Expected completion: [End time]  • Post-migration verification: Within 24 hours"
-    timeline_para = timeline_frame.paragraphs[0]
-    timeline_para.font.size = Pt(12)
-    timeline_para.font.color.rgb = COLORS['dark_gray']
+    add_text(slide, 1, 4.7, 8, 0.6, "• Pre-migration notification: 48 hours before  • Migration begins: [Start time]  • Expected completion: [End time]  • Post-migration verification: Within 24 hours",
+             size=12, color='dark_gray')
 
     # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
+    add_notes(slide, """
 SPEAKER NOTES - Timeline (CUSTOMIZE THIS SLIDE PER SITE)
 
 INSTRUCTIONS FOR PRESENTER:
@@ -634,883 +647,423 @@ A: "Yes, but save/close documents and expect slowness"
 PAUSE: "Does this timeline work for your team?"
 
 TIME: 2-3 minutes
-"""
-
-    return slide
-
-
-def add_during_migration_slide(prs):
-    """Slide 7: During Migration"""
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-
-    title = slide.shapes.title
-    title.text = "What to Expect During Migration"
-    title.text_frame.paragraphs[0].font.size = Pt(36)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
-
-    # Expectations list
-    expectations = [
-        ("✓ Site Remains Accessible", COLORS['success']),
-        ("⚠️ Possible Performance Slowdown (1-5 hours)", COLORS['warning']),
-        ("⚠️ Some Shared Links Temporarily Unavailable", COLORS['warning']),
-        ("✓ No Data Loss", COLORS['success']),
-        ("✓ Automatic Process (No Action Required)", COLORS['success'])
-    ]
-
-    y_pos = Inches(2)
-    for expect_text, color in expectations:
-        expect_box = slide.shapes.add_textbox(
-            Inches(1.5), y_pos, Inches(7), Inches(0.5)
-        )
-        frame = expect_box.text_frame
-        frame.text = expect_text
-        para = frame.paragraphs[0]
-        para.font.size = Pt(20)
-        para.font.bold = True
-        para.font.color.rgb = color
-        y_pos += Inches(0.6)
-
-    # Notification reminder
-    notif_box = slide.shapes.add_textbox(
-        Inches(2), Inches(5), Inches(6), Inches(0.5)
-    )
-    notif_frame = notif_box.text_frame
-    notif_frame.text = "You'll receive notification when your site begins migration"
-    notif_para = notif_frame.paragraphs[0]
-    notif_para.font.size = Pt(16)
-    notif_para.font.italic = True
-    notif_para.font.color.rgb = COLORS['dark_gray']
-    notif_para.alignment = PP_ALIGN.CENTER
-
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - During Migration
-
-KEY MESSAGE:
-"Your site stays online during migration. You might experience brief slowdowns, but your work isn't interrupted."
-
-DETAILED EXPECTATIONS:
-
-✓ SITE ACCESSIBLE:
-- You can still browse files
-- You can still download documents
-- You can still view content
-- SharePoint remains online throughout
-
-⚠️ PERFORMANCE SLOWDOWN:
-- Duration: 1-5 hours (depends on site size)
-- Symptoms: Slower page loads, delayed saves
-- Cause: Background data transfer process
-- Impact: Minimal - most users won't notice
-
-⚠️ SHARED LINKS TEMPORARILY UNAVAILABLE:
-- Anonymous "Anyone with link" may briefly fail
-- Duration: Usually <30 minutes during transfer
-- Workaround: Retry a few minutes later
-- External users: Will regain access automatically
-
-✓ NO DATA LOSS:
-- 100% of files transferred
-- 100% of permissions preserved
-- 100% of version history maintained
-- Verification after every migration
-
-✓ AUTOMATIC PROCESS:
-- No action required from users
-- IT team monitors progress
-- Notifications at start and completion
-- Support available throughout
-
-ANTICIPATED QUESTIONS:
-Q: "What if I'm working in a document?"
-A: "Save and close it before migration - reopen after completion"
-
-Q: "Can I upload new files during migration?"
-A: "Not recommended - wait until completion notification"
-
-Q: "What if something goes wrong?"
-A: "We monitor in real-time and will contact you immediately"
-
-Q: "How will I know it's done?"
-A: "Email/Teams notification + dashboard status update"
-
-BEST PRACTICES TO SHARE:
-- Save/close open documents before migration window
-- Avoid uploading large files during migration
-- Check dashboard for completion status
-- Report any issues within 24 hours
-
-PAUSE: "Any concerns about the migration process?"
-
-TIME: 3-4 minutes
-"""
+""")
 
     return slide
 
 
-def add_after_migration_slide(prs):
-    """Slide 8: After Migration - Verification"""
-    slide_layout = prs.slide_layouts[1]
+def add_schedule_slide(prs, schedule, max_nights=14):
+    """Slide 6b: Migration Schedule (wave plan of the pending sites)"""
+    slide_layout = prs.slide_layouts[5]
     slide = prs.slides.add_slide(slide_layout)
 
-    title = slide.shapes.title
-    title.text = "After Migration - What to Check"
-    title.text_frame.paragraphs[0].font.size = Pt(36)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
-
-    # Checklist
-    checklist_items = [
-        "□ Can you access your site?",
-        "□ Are your files and folders complete?",
-        "□ Do your permissions still work?",
-        "□ Are shared links functioning?",
-        "□ Is version history intact?"
+    set_placeholder_title(slide, "Migration Schedule")
+
+    windows = schedule.windows
+    nights = schedule.nights()
+    finish = schedule.finish
+    overruns = sum(night[3] for night in nights)
+    window_text = f"{windows.opens:%H:%M}, {windows.hours:g} hours"
+    boxes = [
+        (f"⏳ {len(schedule)} Sites Scheduled", COLORS['warning'], 0.5),
+        (f"🌙 {len(nights)} Nights", COLORS['primary'], 2.75),
+        (f"🔀 {schedule.concurrency} at a Time", COLORS['dark_gray'], 5),
+        (f"🏁 Last: {finish.strftime('%b %d, %Y') if finish else 'TBD'}", COLORS['success'], 7.25)
     ]
-
-    y_pos = Inches(2)
-    for item in checklist_items:
-        item_box = slide.shapes.add_textbox(
-            Inches(2), y_pos, Inches(6), Inches(0.45)
+    for text, color, left_pos in boxes:
+        add_text(slide, left_pos, 1.4, 2.25, 0.7, text,
+                 size=16, bold=True, color=color, align=PP_ALIGN.CENTER, word_wrap=True)
+
+    if nights:
+        shown = nights[:max_nights]
+        add_column_chart(
+            slide, 0.5, 2.2, 9, 3.0, [f"{start:%a %b} {start.day}" for start, *_ in shown],
+            [sites for _, sites, _, _ in shown], color='primary',
+            title=f"Sites per Night (windows open {window_text})", series_name='Sites'
         )
-        frame = item_box.text_frame
-        frame.text = item
-        para = frame.paragraphs[0]
-        para.font.size = Pt(20)
-        para.font.color.rgb = COLORS['dark_gray']
-        y_pos += Inches(0.5)
-
-    # Report issues
-    report_box = slide.shapes.add_textbox(
-        Inches(1.5), Inches(4.8), Inches(7), Inches(0.6)
-    )
-    report_frame = report_box.text_frame
-    report_frame.text = "Report Issues: [YOUR IT SUPPORT EMAIL/TEAMS CHANNEL]"
-    report_para = report_frame.paragraphs[0]
-    report_para.font.size = Pt(18)
-    report_para.font.bold = True
-    report_para.font.color.rgb = COLORS['error']
-    report_para.alignment = PP_ALIGN.CENTER
-
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - After Migration
+        if len(nights) > len(shown):
+            add_text(slide, 0.5, 5.15, 9, 0.3, f"First {len(shown)} of {len(nights)} nights shown",
+                     size=10, italic=True, color='light_gray', align=PP_ALIGN.CENTER)
+    else:
+        add_text(slide, 1, 3, 8, 0.6, "No pending sites left to schedule",
+                 size=20, color='dark_gray', align=PP_ALIGN.CENTER)
+
+    night_lines = "\n".join(
+        f"- {start:%a %b} {start.day}: {sites} sites, {hours:.1f} hours of migration"
+        + (f" ({overrun} longer than the window)" if overrun else "")
+        for start, sites, hours, overrun in nights
+    ) or "- (none)"
+    add_notes(slide, f"""
+SPEAKER NOTES - Migration Schedule
+
+PLAN:
+- {len(schedule)} pending sites over {len(nights)} nights, up to {schedule.concurrency} sites at once
+- Migration windows open at {window_text} each
+- Last migration finishes: {finish.strftime('%B %d, %Y %H:%M') if finish else 'TBD'}
+- Sites longer than a window: {overruns} (they run past the window's end)
+
+Durations are estimates; each site's own slot is on its migration brief.
+
+BY NIGHT:
+{night_lines}
 
 KEY MESSAGE:
-"After your site migrates, please verify everything looks correct and report any issues immediately."
-
-VERIFICATION CHECKLIST DETAILS:
-
-1. CAN YOU ACCESS YOUR SITE?
-   - Navigate to your site URL
-   - Verify login works
-   - Confirm site loads properly
-   - Test: Click on your site bookmark
-
-2. ARE YOUR FILES AND FOLDERS COMPLETE?
-   - Check key folders exist
-   - Verify important files are present
-   - Compare file counts (if you know them)
-   - Look for any obvious gaps
-   - Test: Open a few random files
-
-3. DO YOUR PERMISSIONS STILL WORK?
-   - Can you edit files you should edit?
-   - Can you only view files that are read-only?
-   - Test sharing with team members
-   - Verify external user access (if applicable)
-   - Test: Try editing vs viewing specific files
-
-4. ARE SHARED LINKS FUNCTIONING?
-   - Test "anyone with link" sharing
-   - Verify specific people sharing
-   - Check external user access
-   - Test old sharing links still work
-   - Test: Send yourself a share link
-
-5. IS VERSION HISTORY INTACT?
-   - Right-click file → Version History
-   - Verify you see multiple versions
-   - Check author names are correct
-   - Confirm dates are accurate
-   - Test: Restore an old version
-
-REPORTING ISSUES:
-
-When to Report:
-- Missing files or folders
-- Permission errors
-- Broken sharing links
-- Missing version history
-- Any unexpected behavior
-
-How to Report:
-- Email: [IT SUPPORT EMAIL]
-- Teams: [SUPPORT CHANNEL]
-- Include: Site name, file path, error message
-
-Response Time:
-- Critical issues: [X hours]
-- Non-critical: [X business days]
-
-What Happens Next:
-- IT investigates immediately
-- Missing items restored from backup if needed
-- Permissions corrected
-- You receive confirmation when resolved
-
-REASSURANCE:
-"We verify every migration automatically, but you know your content best. If something doesn't look right, please let us know immediately."
+"Every site has a night; you'll get 48 hours' notice before yours."
 
-ANTICIPATED QUESTIONS:
-Q: "How long should I wait to check?"
-A: "Check within 24 hours of receiving completion notification"
-
-Q: "What if I find an issue later?"
-A: "Report it anytime - we keep migration backups for [X days]"
-
-Q: "Who should verify?"
-A: "Site Owners and regular users - different perspectives"
-
-PAUSE: "Any questions about the verification process?"
-
-TIME: 3-4 minutes
-"""
+TIME: 1-2 minutes
+""")
 
     return slide
 
 
-def add_faq_slide(prs):
-    """Slide 9: FAQ"""
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-
-    title = slide.shapes.title
-    title.text = "Frequently Asked Questions"
-    title.text_frame.paragraphs[0].font.size = Pt(36)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
-
-    # FAQ items (smaller font to fit more)
-    faqs = [
-        ("Q: Will my bookmarks break?", "A: No! Site URLs remain the same."),
-        ("Q: What happens to my permissions?", "A: All preserved exactly as they are today."),
-        ("Q: Can I work during migration?", "A: Yes, but expect brief slowdowns."),
-        ("Q: What if files are missing?", "A: We verify 100% - any issues corrected immediately."),
-        ("Q: Who can I contact for help?", "A: [YOUR IT SUPPORT CONTACT]")
-    ]
-
-    y_pos = Inches(1.8)
-    for question, answer in faqs:
-        # Question
-        q_box = slide.shapes.add_textbox(
-            Inches(0.8), y_pos, Inches(8.5), Inches(0.3)
-        )
-        q_frame = q_box.text_frame
-        q_frame.text = question
-        q_para = q_frame.paragraphs[0]
-        q_para.font.size = Pt(16)
-        q_para.font.bold = True
-        q_para.font.color.rgb = COLORS['primary']
-
-        # Answer
-        a_box = slide.shapes.add_textbox(
-            Inches(0.8), y_pos + Inches(0.3), Inches(8.5), Inches(0.25)
-        )
-        a_frame = a_box.text_frame
-        a_frame.text = answer
-        a_para = a_frame.paragraphs[0]
-        a_para.font.size = Pt(14)
-        a_para.font.color.rgb = COLORS['dark_gray']
-
-        y_pos += Inches(0.7)
-
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - FAQ
-
-KEY MESSAGE:
-"Here are the most common questions we hear. Let's address these, then open for your specific concerns."
-
-EXPANDED FAQ ANSWERS:
-
-Q1: WILL MY BOOKMARKS BREAK?
-A: No! Site URLs remain completely unchanged.
-   - /sites/PS-Sales stays /sites/PS-Sales
-   - Browser bookmarks continue to work
-   - Saved shortcuts still valid
-   - Documentation links don't need updates
-   EXAMPLE: "If you have https://interiorlogicgroup.sharepoint.com/sites/PS-Sales bookmarked,
-   that exact same path works after migration to impactfloors tenant."
-
-Q2: WHAT HAPPENS TO MY PERMISSIONS?
-A: All preserved exactly as they are today.
-   - Site Owners remain Owners
-   - Members remain Members
-   - Visitors remain Visitors
-   - Custom permissions maintained
-   - External users keep access
-   EXAMPLE: "If you can edit Budget.xlsx today, you can edit it tomorrow."
-
-Q3: CAN I WORK DURING MIGRATION?
-A: Yes, but expect brief slowdowns (1-5 hours).
-   - Site remains accessible
-   - You can view and download
-   - Editing possible but slower
-   - Best practice: Save/close open docs
-   RECOMMENDATION: "Plan non-critical work during your migration window."
-
-Q4: WHAT IF FILES ARE MISSING?
-A: We verify 100% - any issues corrected immediately.
-   - Automated verification after each migration
-   - Manual spot-checks on critical sites
-   - Missing items restored from backup
-   - You report, we investigate within [X hours]
-   ASSURANCE: "In 29 completed sites, we've had <0.01% issues, all resolved quickly."
-
-Q5: WHO CAN I CONTACT FOR HELP?
-A: [Customize with actual contact info]
-   - Email: [IT SUPPORT EMAIL]
-   - Teams: [SUPPORT CHANNEL]
-   - Phone: [SUPPORT PHONE] (urgent)
-   - Dashboard: http://10.0.0.89:8080 (self-service)
-   HOURS: [SUPPORT HOURS]
-   RESPONSE: [SLA]
-
-ADDITIONAL COMMON QUESTIONS (be ready for):
-
-Q: "What about Teams? Will Teams channels be affected?"
-A: "Teams channels link to SharePoint behind the scenes. Your channels stay intact."
-
-Q: "Do I need to re-sync OneDrive?"
-A: "No, OneDrive sync will automatically update to the new tenant."
-
-Q: "What about workflows and Power Automate?"
-A: "Complex workflows may need reconfiguration. We'll work with site owners on those."
-
-Q: "Can I opt out?"
-A: "This is a company-wide migration - all sites will be migrated. But we can schedule yours at a convenient time."
-
-Q: "What if I'm on vacation during my site migration?"
-A: "No problem - migration is automatic. Just verify when you return."
-
-HANDLING ADDITIONAL QUESTIONS:
-- Write down questions you don't know the answer to
-- Commit to following up with specifics
-- Provide support contact for detailed concerns
-
-PAUSE: "What other questions do you have?"
-
-TIME: 4-5 minutes (with discussion)
-"""
+def create_site_template(cache=None, force=False):
+    """Create a per-site customizable template"""
+    output_file = 'templates/Per-Site-Template.pptx'
+    keys = [('template', slide_key(create_site_template, {'theme': theme_inputs()}))]
+    if cache is not None and not force and cache.changed_slides(output_file, keys) == []:
+        print(f"⏭️  Up to date: {output_file}")
+        return
 
-    return slide
+    # Ensure templates directory exists
+    os.makedirs('templates', exist_ok=True)
 
+    prs = new_presentation()
 
-def add_dashboard_slide(prs):
-    """Slide 10: Live Dashboard"""
-    slide_layout = prs.slide_layouts[6]  # Blank
+    # This template focuses on slides that need per-site customization
+    # Slide 1: Title with site name
+    slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
 
-    # Title
-    title_box = slide.shapes.add_textbox(
-        Inches(1), Inches(0.4), Inches(8), Inches(0.5)
-    )
-    title_frame = title_box.text_frame
-    title_frame.text = "Real-Time Migration Status Dashboard"
-    title_para = title_frame.paragraphs[0]
-    title_para.font.size = Pt(36)
-    title_para.font.bold = True
-    title_para.font.color.rgb = COLORS['primary']
-    title_para.alignment = PP_ALIGN.CENTER
-
-    # Placeholder for screenshot (user should add actual screenshot)
-    screenshot_box = slide.shapes.add_textbox(
-        Inches(1), Inches(1.2), Inches(8), Inches(3)
-    )
-    ss_frame = screenshot_box.text_frame
-    ss_frame.text = "[SCREENSHOT OF DASHBOARD]\n\nhttp://10.0.0.89:8080\n\n(Replace this text with actual screenshot image)"
-    ss_para = ss_frame.paragraphs[0]
-    ss_para.font.size = Pt(24)
-    ss_para.font.color.rgb = COLORS['light_gray']
-    ss_para.alignment = PP_ALIGN.CENTER
-    ss_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
-
-    # Dashboard features
-    features_box = slide.shapes.add_textbox(
-        Inches(1.5), Inches(4.4), Inches(7), Inches(1)
-    )
-    features_frame = features_box.text_frame
-    features_frame.text = "• Filter by your site name  • See completion percentage  • View file counts and verification status  • Self-service transparency"
-    features_para = features_frame.paragraphs[0]
-    features_para.font.size = Pt(14)
-    features_para.font.color.rgb = COLORS['dark_gray']
-    features_para.alignment = PP_ALIGN.CENTER
-
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - Dashboard Demo
-
-KEY MESSAGE:
-"You have 24/7 access to real-time migration status through our interactive dashboard."
-
-BEFORE PRESENTING:
-- Add actual screenshot of dashboard to this slide
-- Capture from: http://10.0.0.89:8080/site-mapping.html
-- Show: Site list with status, completion %, file counts
-- Highlight: Filter/search capabilities
-
-LIVE DEMO SCRIPT (if internet available):
-
-1. NAVIGATE TO DASHBOARD
-   "Let me show you the live dashboard..."
-   → Open http://10.0.0.89:8080 in browser
-   → Show full site list
-
-2. FILTER BY SITE
-   "You can find your site using the filter..."
-   → Type site name in search/filter
-   → Show filtered results
-
-3. SHOW SITE DETAILS
-   "Click any site to see detailed status..."
-   → Click on a site row
-   → Show completion %, file counts, verification details
-   → Point out: Source vs Destination counts
-
-4. EXPLAIN STATUS INDICATORS
-   - ✅ Complete: Green checkmark
-   - 🔄 In Progress: Orange/yellow spinner
-   - ⏳ Pending: Gray clock icon
-   - ❌ Failed: Red X (with retry information)
-
-5. SHOW REAL-TIME UPDATES
-   "The dashboard updates automatically every few minutes..."
-   → Explain: No refresh needed
-   → Point out: Last updated timestamp
-
-DASHBOARD FEATURES TO HIGHLIGHT:
-
-FILTER/SEARCH:
-- Type site name to filter list
-- Case-insensitive search
-- Instant results
-
-SORTING:
-- Click column headers to sort
-- Sort by: Name, Status, Completion %, File Count
-- Ascending/descending toggle
-
-SITE DETAILS:
-- Source file count
-- Destination file count
-- Missing files (if any)
-- Completion percentage
-- Last verification time
-
-MOBILE ACCESS:
-- Dashboard works on phones/tablets
-- Check status anywhere on corporate network
-- Responsive design
-
-SELF-SERVICE:
-- No need to email IT for status updates
-- Check anytime 24/7
-- Transparent process
-
-NO DEMO AVAILABLE? USE SCREENSHOT:
-- Walk through screenshot annotations
-- Explain each section
-- Provide URL for later access
-
-ANTICIPATED QUESTIONS:
-Q: "Do I need VPN to access?"
-A: "No - any device on corporate network can access it"
-
-Q: "How often does it update?"
-A: "Real-time - updates as each site completes"
-
-Q: "Can I check from home?"
-A: "Requires corporate network - VPN if remote"
-
-Q: "What if my site shows an error?"
-A: "Click for details - shows retry status and contact info"
-
-BEST PRACTICES TO SHARE:
-- Bookmark the dashboard URL
-- Check before contacting support
-- Share with your team members
-- Use it to plan your verification
-
-PAUSE: "Let's take a moment to explore the dashboard together..."
-
-TIME: 5-7 minutes (with live demo)
-      3-4 minutes (screenshot only)
-"""
+    add_text(slide, 1, 2, 8, 1.5, "[SITE NAME]\nMigration Information",
+             size=48, bold=True, color='primary', align=PP_ALIGN.CENTER)
 
-    return slide
-
-
-def add_support_slide(prs):
-    """Slide 11: Support & Resources"""
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-
-    title = slide.shapes.title
-    title.text = "Getting Help & Support"
-    title.text_frame.paragraphs[0].font.size = Pt(40)
-    title.text_frame.paragraphs[0].font.color.rgb = COLORS['primary']
-
-    # Support contacts (all placeholders for user to customize)
-    support_items = [
-        ("📧 Email:", "[YOUR IT SUPPORT EMAIL]"),
-        ("💬 Teams:", "[YOUR SUPPORT CHANNEL]"),
-        ("🌐 Dashboard:", "http://10.0.0.89:8080"),
-        ("📄 Documentation:", "[YOUR DOCS LINK]")
-    ]
+    # Add instructions text
+    add_text(slide, 1, 4, 8, 0.8, "INSTRUCTIONS: Replace [RED PLACEHOLDERS] with actual values for this site\nRefer to dashboard (http://10.0.0.89:8080) or site-mapping.json for accurate data",
+             size=12, italic=True, color='light_gray', align=PP_ALIGN.CENTER)
 
-    y_pos = Inches(2)
-    for icon_label, contact in support_items:
-        # Icon/Label
-        label_box = slide.shapes.add_textbox(
-            Inches(1.5), y_pos, Inches(2), Inches(0.4)
-        )
-        label_frame = label_box.text_frame
-        label_frame.text = icon_label
-        label_para = label_frame.paragraphs[0]
-        label_para.font.size = Pt(20)
-        label_para.font.bold = True
-        label_para.font.color.rgb = COLORS['dark_gray']
-
-        # Contact info
-        contact_box = slide.shapes.add_textbox(
-            Inches(3.5), y_pos, Inches(5), Inches(0.4)
-        )
-        contact_frame = contact_box.text_frame
-        contact_frame.text = contact
-        contact_para = contact_frame.paragraphs[0]
-        contact_para.font.size = Pt(18)
-        if contact.startswith('['):
-            contact_para.font.color.rgb = COLORS['error']  # Red to show it needs editing
-            contact_para.font.italic = True
-        else:
-            contact_para.font.color.rgb = COLORS['primary']
-
-        y_pos += Inches(0.6)
-
-    # Availability info
-    avail_box = slide.shapes.add_textbox(
-        Inches(1.5), y_pos + Inches(0.3), Inches(7), Inches(0.8)
-    )
-    avail_frame = avail_box.text_frame
-    avail_frame.text = "Migration Team Available:\n• [YOUR SUPPORT HOURS]\n• Response Time: [YOUR SLA]"
-    avail_para = avail_frame.paragraphs[0]
-    avail_para.font.size = Pt(16)
-    avail_para.font.color.rgb = COLORS['dark_gray']
+    # Add customizable slides from main presentation
+    # (In practice, user would copy slides 4, 6, 9 from main deck and customize)
 
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - Support & Resources
+    with get_profiler().measure('save', deck='template', output=output_file) as record:
+        _, record['bytes'] = save_presentation(prs, output_file)
+    print(f"✅ Created template: {output_file} ({record['bytes'] / 1024:.1f} KB)")
 
-KEY MESSAGE:
-"We're here to help throughout the migration. Here are all the ways to reach us."
-
-CUSTOMIZE BEFORE PRESENTING:
-Replace all [PLACEHOLDER TEXT] with actual contact information:
-- [YOUR IT SUPPORT EMAIL]: e.g., itsupport@impactpropertysolutions.com
-- [YOUR SUPPORT CHANNEL]: e.g., Teams > IT Support > SharePoint Migration
-- [YOUR DOCS LINK]: e.g., Intranet > IT > Migration Guide
-- [YOUR SUPPORT HOURS]: e.g., Monday-Friday 8am-6pm EST
-- [YOUR SLA]: e.g., 4 hours for urgent, 24 hours for normal
-
-SUPPORT CHANNEL DETAILS:
-
-EMAIL SUPPORT (itsupport@...):
-- Use for: General questions, non-urgent issues
-- Include: Site name, error message, screenshot
-- Response time: [X] hours
-- Best for: Detailed technical issues
-
-TEAMS SUPPORT (#SharePoint-Migration):
-- Use for: Quick questions, status updates
-- Active monitoring: [Hours]
-- Response time: [X] minutes during business hours
-- Best for: Real-time assistance
-
-DASHBOARD (http://10.0.0.89:8080):
-- Self-service status checking
-- No login required (corporate network only)
-- Updated in real-time
-- Best for: Checking progress without contacting IT
-
-DOCUMENTATION ([Link]):
-- Step-by-step guides
-- Troubleshooting tips
-- Video tutorials (if available)
-- Best for: Self-help and training
-
-ESCALATION PATH:
-1. First: Check dashboard for status
-2. Then: Email or Teams message
-3. If urgent: [PHONE NUMBER]
-4. Critical issues: [MANAGER CONTACT]
-
-WHAT TO INCLUDE IN SUPPORT REQUESTS:
-- Your site name (e.g., "PS - Purchasing")
-- What you were trying to do
-- Error message (exact text or screenshot)
-- When it happened (date/time)
-- Whether it's blocking your work
-
-SUPPORT COMMITMENT:
-- Monitoring: We watch all migrations in real-time
-- Proactive: We'll contact you if we detect issues
-- Responsive: [SLA] response times
-- Follow-up: We confirm resolution with you
+    if cache is not None:
+        cache.record(output_file, keys)
 
-ANTICIPATED QUESTIONS:
-Q: "What if I need help outside business hours?"
-A: [Explain after-hours support availability or lack thereof]
 
-Q: "Can I talk to someone in person?"
-A: [Provide options for in-person or video call support]
+def site_deck_filename(site):
+    """File name for a site's brief, e.g. PS-Purchasing-Migration-Brief.pptx"""
+    safe_name = re.sub(r'[^A-Za-z0-9]+', '-', site_display_name(site)).strip('-') or 'Site'
+    return f"{safe_name}-Migration-Brief.pptx"
 
-Q: "What's considered urgent vs normal?"
-A: "Urgent = site down, blocking work. Normal = questions, minor issues."
 
-Q: "Do I need to open a ticket?"
-A: [Explain ticketing process or email-based tracking]
+def site_status(site):
+    """Status key of a site, falling back to 'pending' for unknown values"""
+    status = site.get('status')
+    return status if status in STATUS_LABELS else 'pending'
 
-CLOSE WITH ASSURANCE:
-"Remember, no question is too small. We'd rather hear from you early than have you struggle with an issue."
 
-PAUSE: "Save these contact details - you'll see them again in follow-up emails."
+def site_fields(site, throughput=None, schedule=None):
+    """Text filled into a site brief for one site-mapping.json entry
 
-TIME: 2-3 minutes
-"""
+    With a wave ``schedule`` the fields include the site's migration
+    window (see ``build_schedule``).
+    """
+    item_count = site_item_count(site)
+    storage_gb = site.get('storageGB') or 0
+    fields = {
+        'name': site_display_name(site),
+        'items': f"{item_count:,}",
+        'storage_gb': f"{storage_gb:.1f}",
+        'duration': estimate_duration(item_count, storage_gb, throughput),
+    }
+    if schedule is not None:
+        slot = schedule.get(site_id(site))
+        fields['window'] = slot.describe() if slot else UNSCHEDULED_WINDOWS[site_status(site)]
+    return fields
 
-    return slide
 
+def add_site_title_slide(prs, fields, status):
+    """Site brief slide 1: site name, status and size"""
+    status_text, status_color = STATUS_LABELS[status]
 
-def add_takeaways_slide(prs):
-    """Slide 12: Key Takeaways"""
-    slide_layout = prs.slide_layouts[6]  # Blank
+    slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
 
-    # Title
-    title_box = slide.shapes.add_textbox(
-        Inches(1), Inches(0.8), Inches(8), Inches(0.6)
-    )
-    title_frame = title_box.text_frame
-    title_frame.text = "Key Takeaways"
-    title_para = title_frame.paragraphs[0]
-    title_para.font.size = Pt(48)
-    title_para.font.bold = True
-    title_para.font.color.rgb = COLORS['primary']
-    title_para.alignment = PP_ALIGN.CENTER
-
-    # Key points
-    takeaways = [
-        "✓ Your URLs Don't Change",
-        "✓ Permissions Stay the Same",
-        "✓ Minimal Downtime Expected",
-        "✓ Track Progress on Dashboard",
-        "✓ Support Team Ready to Help"
-    ]
+    add_text(slide, 1, 1.5, 8, 1.5, f"{fields['name']}\nMigration Information", word_wrap=True,
+             size=48, bold=True, color='primary', align=PP_ALIGN.CENTER)
 
-    y_pos = Inches(2)
-    for takeaway in takeaways:
-        take_box = slide.shapes.add_textbox(
-            Inches(2), y_pos, Inches(6), Inches(0.5)
-        )
-        take_frame = take_box.text_frame
-        take_frame.text = takeaway
-        take_para = take_frame.paragraphs[0]
-        take_para.font.size = Pt(26)
-        take_para.font.bold = True
-        take_para.font.color.rgb = COLORS['success']
-        take_para.alignment = PP_ALIGN.CENTER
-        y_pos += Inches(0.6)
-
-    # Questions prompt
-    q_box = slide.shapes.add_textbox(
-        Inches(2), Inches(4.8), Inches(6), Inches(0.6)
-    )
-    q_frame = q_box.text_frame
-    q_frame.text = "Questions?"
-    q_para = q_frame.paragraphs[0]
-    q_para.font.size = Pt(36)
-    q_para.font.bold = True
-    q_para.font.color.rgb = COLORS['primary']
-    q_para.alignment = PP_ALIGN.CENTER
+    add_text(slide, 1, 3.6, 8, 0.6, f"Status: {status_text}",
+             size=24, bold=True, color=status_color, align=PP_ALIGN.CENTER)
 
-    # Speaker notes
-    notes_slide = slide.notes_slide
-    notes_slide.notes_text_frame.text = """
-SPEAKER NOTES - Key Takeaways & Closing
-
-KEY MESSAGE:
-"Let's recap the most important points to remember about this migration."
-
-EMPHASIZE EACH TAKEAWAY:
-
-1. YOUR URLs DON'T CHANGE
-   → Single most important message
-   → Bookmarks, links, documentation stay valid
-   → /sites/YourSite remains /sites/YourSite
-   → Repeat this multiple times if needed
-
-2. PERMISSIONS STAY THE SAME
-   → Your access level doesn't change
-   → If you're an Owner, you're still an Owner
-   → External sharing continues to work
-   → No permission requests needed
-
-3. MINIMAL DOWNTIME EXPECTED
-   → Site stays accessible during migration
-   → Brief performance slowdown (1-5 hours)
-   → You can continue working
-   → Plan non-critical tasks during window
-
-4. TRACK PROGRESS ON DASHBOARD
-   → http://10.0.0.89:8080
-   → Self-service status checking
-   → Real-time updates
-   → No need to email for status
-
-5. SUPPORT TEAM READY TO HELP
-   → [YOUR SUPPORT CONTACTS]
-   → Available [HOURS]
-   → No question too small
-   → Proactive monitoring
-
-TRANSITION TO Q&A:
-"Those are the key points. Now let's open it up for your questions. What concerns or questions do you have about the migration?"
-
-Q&A FACILITATION:
-
-TECHNIQUES:
-- Pause and scan the room/video
-- "What questions do you have?" (not "Any questions?")
-- Point to raised hands/unmuted mics
-- Repeat question for everyone to hear
-- Answer clearly and concisely
-- Check: "Does that answer your question?"
-
-COMMON Q&A TOPICS:
-- Timeline specifics for their site
-- Technical details (how SharePoint works)
-- Past experiences with migrations
-- Specific workflow concerns
-- External user access
-- Mobile app impact
-
-IF NO QUESTIONS:
-- "That's great - we've covered everything clearly"
-- Provide summary: "Remember to bookmark the dashboard"
-- Reiterate: "Contact us anytime you have questions"
-
-CLOSING STATEMENTS:
-
-NEXT STEPS:
-"Here's what happens next:
-1. You'll receive email notification 48 hours before your site migration
-2. Check dashboard for real-time status during migration
-3. Verify your site within 24 hours of completion
-4. Report any issues to [SUPPORT CONTACT]"
-
-REASSURANCE:
-"We've successfully migrated [X] sites already with [Y]% success rate.
-Your content is in good hands, and we're here to support you throughout."
-
-FINAL WORDS:
-"Thank you for your time today. If you think of questions later, don't hesitate to reach out. We're here to make this transition as smooth as possible for you."
-
-DISTRIBUTE MATERIALS (if applicable):
-- PDF version of this presentation
-- Quick reference guide
-- Support contact card
-
-FOLLOW-UP:
-- Send meeting recording link (if recorded)
-- Email summary with key links
-- Add to support channel for easy reference
-
-TIME: 5-10 minutes (depends on Q&A)
-"""
+    add_text(slide, 1, 4.3, 8, 0.5, f"{fields['items']} items • {fields['storage_gb']} GB • Expected duration: {fields['duration']}",
+             size=16, color='dark_gray', align=PP_ALIGN.CENTER)
 
     return slide
 
 
-def create_site_template():
-    """Create a per-site customizable template"""
-    # Ensure templates directory exists
-    os.makedirs('templates', exist_ok=True)
-
-    prs = Presentation()
-    prs.slide_width = Inches(10)
-    prs.slide_height = Inches(5.625)
-
-    # This template focuses on slides that need per-site customization
-    # Slide 1: Title with site name
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(
-        Inches(1), Inches(2), Inches(8), Inches(1.5)
-    )
-    title_frame = title_box.text_frame
-    title_frame.text = "[SITE NAME]\nMigration Information"
-    title_para = title_frame.paragraphs[0]
-    title_para.font.size = Pt(48)
-    title_para.font.bold = True
-    title_para.font.color.rgb = COLORS['primary']
-    title_para.alignment = PP_ALIGN.CENTER
-
-    # Add instructions text
-    inst_box = slide.shapes.add_textbox(
-        Inches(1), Inches(4), Inches(8), Inches(0.8)
-    )
-    inst_frame = inst_box.text_frame
-    inst_frame.text = "INSTRUCTIONS: Replace [RED PLACEHOLDERS] with actual values for this site\nRefer to dashboard (http://10.0.0.89:8080) or site-mapping.json for accurate data"
-    inst_para = inst_frame.paragraphs[0]
-    inst_para.font.size = Pt(12)
-    inst_para.font.italic = True
-    inst_para.font.color.rgb = COLORS['light_gray']
-    inst_para.alignment = PP_ALIGN.CENTER
-
-    # Add customizable slides from main presentation
-    # (In practice, user would copy slides 4, 6, 9 from main deck and customize)
-
-    output_file = 'templates/Per-Site-Template.pptx'
-    prs.save(output_file)
-    file_size = os.path.getsize(output_file) / 1024
-    print(f"✅ Created template: {output_file} ({file_size:.1f} KB)")
+def build_site_template(status, spec=None, values=None, scheduled=False):
+    """Site brief for one status, built once with {{field}} tokens for the per-site text
+
+    ``scheduled`` adds a token for the migration window; otherwise it is
+    left as a [DATE/TIME] placeholder.
+    """
+    if spec is None:
+        spec = load_spec(MAIN_DECK_SPEC, values)
+    fields = ('name', 'items', 'storage_gb', 'duration') + (('window',) if scheduled else ())
+    tokens = {field: DeckTemplate.token(field) for field in fields}
+    profiler = get_profiler()
+    deck = f"site_template:{status}"
+
+    prs = new_presentation()
+    profiler.wrap(deck, 'site_title', add_site_title_slide)(prs, tokens, status)
+    profiler.wrap(deck, 'why_migrating', render_slide)(prs, spec['why_migrating'])
+    profiler.wrap(deck, 'changes', render_slide)(prs, spec['changes'])
+    profiler.wrap(deck, 'timeline', add_timeline_slide)(prs, tokens)
+    for name in ('faq', 'support', 'takeaways'):
+        profiler.wrap(deck, name, render_slide)(prs, spec[name])
+    if values:
+        fill_placeholders(prs, values)
+    with profiler.measure('serialize', deck=deck):
+        return DeckTemplate(prs)
+
+
+def build_site_templates(values=None, scheduled=False):
+    """One site brief template per status"""
+    spec = load_spec(MAIN_DECK_SPEC, values)
+    return {status: build_site_template(status, spec, values, scheduled) for status in STATUS_LABELS}
+
+
+# Site brief templates, throughput model and wave schedule of this process
+# (set by _init_site_worker; templates are otherwise built on first use)
+_SITE_TEMPLATES = None
+_SITE_THROUGHPUT = None
+_SITE_SCHEDULE = None
+
+
+def _init_site_worker(templates, throughput=None, schedule=None):
+    global _SITE_TEMPLATES, _SITE_THROUGHPUT, _SITE_SCHEDULE
+    _SITE_TEMPLATES = templates
+    _SITE_THROUGHPUT = throughput
+    _SITE_SCHEDULE = schedule
+
+
+def render_site_deck(site, output=None, templates=None, throughput=None, schedule=None):
+    """Write a site's migration brief to ``output`` (path or binary file object)
+
+    The brief is a copy of the pre-built template for the site's status
+    with the site's name, size and duration substituted in. ``throughput``
+    (a ``ThroughputModel``) sets the duration estimate and ``schedule``
+    (a wave ``Schedule``, with templates built ``scheduled``) the
+    migration window. Returns ``output``, or a rewound ``BytesIO`` when no
+    output is given.
+    """
+    global _SITE_TEMPLATES
+    if templates is None:
+        if _SITE_TEMPLATES is None:
+            _SITE_TEMPLATES = build_site_templates()
+        templates = _SITE_TEMPLATES
+    fields = site_fields(site, throughput or _SITE_THROUGHPUT, schedule or _SITE_SCHEDULE)
+
+    with get_profiler().measure('render', deck='site', site=site_display_name(site)) as record:
+        output, record['bytes'] = templates[site_status(site)].save(fields, output)
+    return output
+
+
+def create_site_deck(site, output_dir='sites', templates=None):
+    """Create a filled-in migration brief for a single site-mapping.json entry"""
+    os.makedirs(output_dir, exist_ok=True)
+    return render_site_deck(site, os.path.join(output_dir, site_deck_filename(site)), templates)
+
+
+def create_site_decks(sites, output_dir='sites', max_workers=None, values=None, throughput=None, schedule=None):
+    """Create a migration brief for every site, fanned out across processes
+
+    The static slides are rendered once here; workers only clone the
+    serialised templates and fill in each site's details. Sites whose
+    names map to the same file name get a numeric suffix.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    templates = build_site_templates(values, scheduled=schedule is not None)
+    sites = list(sites)
+    names = set()
+    paths = [os.path.join(output_dir, unique_filename(site_deck_filename(site), names)) for site in sites]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_site_worker,
+                             initargs=(templates, throughput, schedule)) as executor:
+        output_files = list(executor.map(render_site_deck, sites, paths, chunksize=8))
+    print(f"✅ Created {len(output_files)} site briefs in {output_dir}/")
+    return output_files
+
+
+def render_site_entry(site):
+    """(archive name, .pptx bytes) of a site's brief, for bundling"""
+    return site_deck_filename(site), render_site_deck(site).getvalue()
+
+
+def write_site_bundle(sites, output, max_workers=None, values=None, max_in_flight=None, throughput=None,
+                      schedule=None):
+    """Stream every site's brief into one ZIP archive at ``output`` (path or binary file object)
+
+    Briefs are rendered in memory across worker processes and written in
+    site order as they arrive; at most ``max_in_flight`` renders (default
+    four per worker) are outstanding, so memory stays flat however many
+    sites there are. Entries are stored rather than deflated because a
+    .pptx is already a compressed package. Sites whose names map to the
+    same file name get a numeric suffix. Returns the number of briefs.
+    """
+    templates = build_site_templates(values, scheduled=schedule is not None)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or max_workers * 4
+    names = set()
+    count = 0
+
+    def write_entry(bundle, future):
+        filename, data = future.result()
+        filename = unique_filename(filename, names)
+        bundle.writestr(zipfile.ZipInfo(filename, datetime.now().timetuple()[:6]), data)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_site_worker,
+                             initargs=(templates, throughput, schedule)) as executor, \
+            zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as bundle:
+        pending = deque()
+        for site in sites:
+            if len(pending) >= max_in_flight:
+                write_entry(bundle, pending.popleft())
+            pending.append(executor.submit(render_site_entry, site))
+            count += 1
+        while pending:
+            write_entry(bundle, pending.popleft())
+
+    print(f"✅ Bundled {count} site briefs into {output if isinstance(output, str) else 'archive'}")
+    return count
+
+
+def regenerate(stats, args):
+    """Rebuild the main deck and per-site briefs from the current mapping"""
+    print(f"\n🔄 {datetime.now():%H:%M:%S} site-mapping.json changed - regenerating...")
+    stats.refresh()
+    values = load_values(args.values) if args.values else None
+    delta = record_history(stats, args.history)
+    schedule = schedule_from_args(stats, args)
+    create_presentation(stats, force=args.force, values=values, delta=delta, schedule=schedule)
+    if args.bundle:
+        write_site_bundle(stats.iter_sites(), args.bundle, args.workers, values,
+                          throughput=stats.throughput, schedule=schedule)
+    else:
+        create_site_decks(stats.iter_sites(), args.sites_dir, args.workers, values, stats.throughput, schedule)
+
+
+def schedule_from_args(stats, args):
+    """Wave schedule from the --schedule options (None without --schedule)"""
+    if not args.schedule:
+        return None
+    return build_schedule(stats, args.schedule, args.window, args.nights, args.concurrency)
+
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a whole number of at least 1, not {value!r}")
+    return number
+
+
+def _night_list(value):
+    nights = [night.strip().lower()[:3] for night in value.split(',') if night.strip()]
+    unknown = [night for night in nights if night not in WEEKDAYS]
+    if unknown or not nights:
+        raise argparse.ArgumentTypeError(f"expected a comma-separated list of {', '.join(WEEKDAYS)}, not {value!r}")
+    return nights
+
+
+def _window(value):
+    try:
+        MigrationWindows(date.today(), value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HH:MM-HH:MM, e.g. 18:00-06:00, not {value!r}") from None
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mapping', default=None,
+                        help="path to site-mapping.json (default: ../site-mapping.json or $SITE_MAPPING_PATH)")
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild every slide even if its inputs are unchanged")
+    parser.add_argument('--sites', action='store_true',
+                        help="also create a filled-in brief for every site in site-mapping.json")
+    parser.add_argument('--sites-dir', default='sites',
+                        help="output directory for per-site briefs (default: sites)")
+    parser.add_argument('--bundle', default=None, metavar='ZIP',
+                        help="write every per-site brief into this ZIP archive instead of --sites-dir")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for per-site briefs (default: CPU count)")
+    parser.add_argument('--values', default=None,
+                        help="YAML or JSON file of [YOUR ...] placeholder values to fill in (see placeholder-values.example.yaml)")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_DIR,
+                        help="directory of the per-run statistics history used by the \"Since Last Update\" slide "
+                             f"(default: {DEFAULT_HISTORY_DIR})")
+    parser.add_argument('--schedule', type=date.fromisoformat, default=None, metavar='YYYY-MM-DD',
+                        help="plan the pending sites into nightly migration windows from this date; "
+                             "fills each brief's Migration Window and adds a schedule slide")
+    parser.add_argument('--window', type=_window, default='18:00-06:00', metavar='HH:MM-HH:MM',
+                        help="nightly migration window for --schedule (default: 18:00-06:00)")
+    parser.add_argument('--nights', type=_night_list, default=','.join(WEEKDAYS), metavar='DAYS',
+                        help="comma-separated nights the window opens on, e.g. mon,tue,wed,thu (default: every night)")
+    parser.add_argument('--concurrency', type=_positive_int, default=4,
+                        help="sites migrated at the same time in a window (default: 4)")
+    parser.add_argument('--profile', nargs='?', const='-', default=None, metavar='PATH',
+                        help="write per-slide timing/memory records as JSON lines to PATH (default: stderr); "
+                             "also enabled by $DECK_PROFILE")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and regenerate all decks whenever site-mapping.json changes")
+    parser.add_argument('--debounce', type=float, default=10.0,
+                        help="seconds of quiet after a write before regenerating in --watch mode (default: 10)")
+    return parser.parse_args(argv)
 
 
 if __name__ == '__main__':
+    args = parse_args()
+    if args.profile:
+        enable_profiling(args.profile)
+    stats = MigrationStats(args.mapping) if args.mapping else STATS
+    if not os.path.exists(stats.path):
+        sys.exit(f"❌ site-mapping.json not found: {stats.path} (use --mapping PATH)")
+
     print(f"""
 ╔══════════════════════════════════════════════════════════════════════╗
 ║  SharePoint Migration User Presentation Generator                   ║
 ╚══════════════════════════════════════════════════════════════════════╝
 
 Migration Statistics:
-  Total Sites: {total_sites}
-  Complete:    {complete_sites} ({complete_sites/total_sites*100:.0f}%)
-  In Progress: {in_progress_sites}
-  Pending:     {pending_sites}
+  Total Sites: {stats.total_sites}
+  Complete:    {stats.complete_sites} ({stats.complete_pct:.0f}%)
+  In Progress: {stats.in_progress_sites}
+  Pending:     {stats.pending_sites}
 
-  Total Storage: {total_storage_tb:.2f} TB
-  Total Items:   {total_items:,}
+  Total Storage: {stats.total_storage_tb:.2f} TB
+  Total Items:   {stats.total_items:,}
+  Durations:     {stats.throughput.describe() if stats.throughput else 'size bands (no timed completions yet)'}
 
 Creating PowerPoint presentation...
 """)
 
-    output = create_presentation()
+    values = load_values(args.values) if args.values else None
+    delta = record_history(stats, args.history)
+    schedule = schedule_from_args(stats, args)
+    if schedule is not None:
+        finish = schedule.finish.strftime('%B %d, %Y %H:%M') if schedule.finish else 'nothing pending'
+        print(f"🗓️  Scheduled {len(schedule)} sites over {len(schedule.nights())} nights (last finishes {finish})\n")
+    output = create_presentation(stats, force=args.force, values=values, delta=delta, schedule=schedule)
+
+    if args.bundle:
+        write_site_bundle(stats.iter_sites(), args.bundle, args.workers, values,
+                          throughput=stats.throughput, schedule=schedule)
+    elif args.sites or args.watch:
+        create_site_decks(stats.iter_sites(), args.sites_dir, args.workers, values, stats.throughput, schedule)
 
     print(f"""
 ╔══════════════════════════════════════════════════════════════════════╗
@@ -1530,3 +1083,7 @@ Next steps:
 
 See README.md for detailed editing instructions.
 """)
+
+    if args.watch:
+        print(f"👀 Watching {stats.path} for changes (Ctrl+C to stop)...")
+        MappingWatcher(stats.path, lambda: regenerate(stats, args), debounce=args.debounce).run()
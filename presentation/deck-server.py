@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Deck Server
+Serves freshly rendered migration decks over HTTP from the current site-mapping.json
+
+Endpoints:
+    GET /                     JSON: mapping version, site count, cache stats
+    GET /sites                JSON: every site with its deck URL
+    GET /deck/main            SharePoint-Migration-User-Guide.pptx
+    GET /deck/phase1          Phase1-Backup-Guide.pptx
+    GET /deck/site/<name>     a site's migration brief (name as slug, display name or id)
+
+Decks are rendered on the first request after the mapping changes and then
+served from an in-memory LRU cache (see deck_service.py). Renders run in a
+pool of worker processes behind an asyncio queue (render_queue.py):
+concurrent requests for the same deck share one render, and when more than
+--max-pending distinct renders are waiting the server answers 503 with
+Retry-After rather than queueing without limit. Responses carry an ETag of
+the mapping version, deck and (for the dated main and Phase 1 decks) date,
+which is checked before rendering, so revalidation is cheap.
+
+Usage:
+    python3 deck-server.py --port 8081 --workers 4
+    python3 deck-server.py --mapping ../site-mapping.json --values values.yaml
+"""
+
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+
+from deck_service import DeckNotFound, DeckService, site_slug
+from generators import main_generator
+from render_queue import RenderQueue, RenderQueueFull
+
+PPTX_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+# Seconds a client is asked to wait when the render queue is full
+RETRY_AFTER = 5
+
+
+class DeckRequestHandler(BaseHTTPRequestHandler):
+    """Maps the /deck/... URLs onto ``self.server.service``"""
+
+    server_version = 'DeckServer/1.0'
+
+    def do_GET(self):
+        path = unquote(urlsplit(self.path).path).rstrip('/')
+        parts = path.split('/')[1:] if path else []
+        try:
+            if not parts:
+                self.send_index()
+            elif parts == ['sites']:
+                self.send_sites()
+            elif len(parts) == 2 and parts[0] == 'deck' and parts[1] != 'site':
+                self.send_deck(parts[1])
+            elif len(parts) == 3 and parts[:2] == ['deck', 'site']:
+                self.send_deck('site', parts[2])
+            else:
+                self.send_error(404, "Unknown path (see / for endpoints)")
+        except DeckNotFound as e:
+            self.send_error(404, str(e))
+        except FileNotFoundError as e:
+            self.send_error(503, f"Mapping not available: {e.filename}")
+        except RenderQueueFull as e:
+            self.send_response(503, f"Busy: {e}")
+            self.send_header('Retry-After', str(RETRY_AFTER))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        except ConnectionError:
+            # The client went away mid-response; there is no one to answer
+            return
+        except Exception as e:
+            self.log_error("Failed to serve %s: %r", self.path, e)
+            self.send_error(500, "Render failed (see server log)")
+
+    do_HEAD = do_GET
+
+    def send_deck(self, kind, name=None):
+        service, queue = self.server.service, self.server.queue
+        # The ETag is known before rendering, so revalidation never waits for a render
+        key = service.cache_key(kind, name, service.snapshot())
+        if self.headers.get('If-None-Match') == service.etag(key):
+            self.send_not_modified(service.etag(key))
+            return
+        if queue is None:
+            data, filename, version = service.deck(kind, name)
+        else:
+            data, filename, version = queue.submit(kind, name).result()
+        # A worker may have rendered a newer mapping than the one checked above
+        etag = service.etag((version, *key[1:]))
+        self.send_response(200)
+        self.send_header('Content-Type', PPTX_TYPE)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.end_headers()
+
+    def send_index(self):
+        service = self.server.service
+        snapshot = service.snapshot()
+        self.send_json({
+            'mapping': service.mapping_path,
+            'version': snapshot.version,
+            'sites': snapshot.stats.total_sites,
+            'cache': {'entries': len(service.cache), 'hits': service.cache.hits, 'misses': service.cache.misses},
+            'queue': self.queue_stats(),
+            'endpoints': ['/deck/main', '/deck/phase1', '/deck/site/<name>', '/sites'],
+        })
+
+    def queue_stats(self):
+        queue = self.server.queue
+        if queue is None:
+            return None
+        return {
+            'workers': queue.max_workers, 'pending': queue.pending, 'max_pending': queue.max_pending,
+            'rendered': queue.rendered, 'coalesced': queue.coalesced, 'rejected': queue.rejected,
+        }
+
+    def send_sites(self):
+        generator = main_generator()
+        snapshot = self.server.service.snapshot()
+        sites = []
+        for site in snapshot.stats.iter_sites():
+            name = generator.site_display_name(site)
+            sites.append({
+                'name': name,
+                'status': generator.site_status(site),
+                'deck': f"/deck/site/{quote(site_slug(name))}",
+            })
+        self.send_json({'version': snapshot.version, 'sites': sites})
+
+    def send_json(self, payload):
+        data = json.dumps(payload, indent=2).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+
+def make_server(service, host='127.0.0.1', port=8081, queue=None):
+    """Threaded HTTP server answering deck requests from ``service``
+
+    With a started ``RenderQueue`` renders go through its worker pool;
+    without one each request thread renders in-process.
+    """
+    server = ThreadingHTTPServer((host, port), DeckRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.queue = queue
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="interface to listen on (default: 127.0.0.1; 0.0.0.0 for all)")
+    parser.add_argument('--port', type=int, default=8081, help="port to listen on (default: 8081)")
+    parser.add_argument('--mapping', default=None,
+                        help="path to site-mapping.json (default: ../site-mapping.json or $SITE_MAPPING_PATH)")
+    parser.add_argument('--values', default=None,
+                        help="YAML or JSON file of [YOUR ...] placeholder values to fill in")
+    parser.add_argument('--cache-size', type=int, default=64,
+                        help="rendered decks to keep in memory (default: 64)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="render worker processes (default: CPU count)")
+    parser.add_argument('--max-pending', type=int, default=32,
+                        help="distinct renders allowed to wait before answering 503 (default: 32)")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    service = DeckService(args.mapping, args.values, args.cache_size)
+    try:
+        service.snapshot()
+    except FileNotFoundError as e:
+        sys.exit(f"❌ File not found: {e.filename}")
+    queue = RenderQueue(service, args.workers, args.max_pending).start()
+    server = make_server(service, args.host, args.port, queue)
+    print(f"🌐 Serving decks from {service.mapping_path} on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+        queue.close()
@@ -0,0 +1,122 @@
+"""
+Deck Profiler
+Opt-in timing and memory records for deck generation, written as JSON lines
+
+Enable with the generators' ``--profile [PATH]`` option or by setting
+DECK_PROFILE to a file path (``-`` or ``1`` for stderr). Each slide builder
+run produces one record with its wall time, the shapes it added and its
+peak traced allocation (tracemalloc); saves and per-site renders produce
+one record each. Worker processes inherit the setting through the
+environment and append to the same file.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+PROFILE_ENV = 'DECK_PROFILE'
+
+_profiler = None
+
+
+class DeckProfiler:
+    """Writes one JSON object per measured step to ``target`` (disabled when empty)"""
+
+    def __init__(self, target=None):
+        self.target = target if target not in (None, '', '0') else None
+        self.enabled = self.target is not None
+        self.pid = os.getpid()
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def emit(self, record):
+        if not self.enabled:
+            return
+        line = json.dumps(dict(record, ts=round(time.time(), 3), pid=self.pid), default=str) + '\n'
+        if self.target in ('-', '1'):
+            sys.stderr.write(line)
+            sys.stderr.flush()
+        else:
+            # One write per record so lines from worker processes don't interleave
+            with open(self.target, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    @contextmanager
+    def measure(self, event, **fields):
+        """Time the block and emit a record; the yielded dict can take extra fields"""
+        record = {'event': event, **fields}
+        if not self.enabled:
+            yield record
+            return
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['wall_ms'] = round((time.perf_counter() - start) * 1000, 3)
+            record['alloc_peak_kb'] = round((tracemalloc.get_traced_memory()[1] - base) / 1024, 1)
+            self.emit(record)
+
+    def wrap(self, deck, name, builder):
+        """``builder`` (prs, *args) instrumented to record one 'slide' event per call"""
+        if not self.enabled:
+            return builder
+
+        @wraps(builder)
+        def profiled(prs, *args):
+            slides_before = len(prs.slides)
+            with self.measure('slide', deck=deck, name=name) as record:
+                result = builder(prs, *args)
+                # Builders append their slides (replace_slide moves them afterwards)
+                added = list(prs.slides)[slides_before:]
+                record['slides'] = len(added)
+                record['shapes'] = sum(len(slide.shapes) for slide in added)
+            return result
+
+        return profiled
+
+
+def get_profiler():
+    """Profiler for this process, configured from DECK_PROFILE"""
+    global _profiler
+    if _profiler is None or _profiler.pid != os.getpid():
+        _profiler = DeckProfiler(os.environ.get(PROFILE_ENV))
+    return _profiler
+
+
+def enable_profiling(target='-'):
+    """Turn profiling on for this process and any workers it starts"""
+    global _profiler
+    os.environ[PROFILE_ENV] = target
+    _profiler = None
+    return get_profiler()
+
+
+def summarize(path):
+    """Aggregate a profile file: (deck, event, name) -> count, total/max wall time, max shapes and allocation"""
+    summary = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            key = (record.get('deck'), record['event'], record.get('name', ''))
+            entry = summary.setdefault(key, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'shapes': 0, 'alloc_peak_kb': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += record['wall_ms']
+            entry['max_ms'] = max(entry['max_ms'], record['wall_ms'])
+            entry['shapes'] = max(entry['shapes'], record.get('shapes', 0))
+            entry['alloc_peak_kb'] = max(entry['alloc_peak_kb'], record.get('alloc_peak_kb', 0))
+    return summary
+
+
+if __name__ == '__main__':
+    # python3 deck_profile.py profile.jsonl -> steps sorted by total time
+    rows = sorted(summarize(sys.argv[1]).items(), key=lambda item: -item[1]['total_ms'])
+    print(f"{'deck':<26} {'event':<10} {'name':<26} {'count':>6} {'total ms':>10} {'max ms':>9} {'shapes':>7} {'peak KB':>9}")
+    for (deck, event, name), entry in rows:
+        print(f"{deck or '':<26} {event:<10} {name:<26} {entry['count']:>6} {entry['total_ms']:>10.1f} "
+              f"{entry['max_ms']:>9.1f} {entry['shapes']:>7} {entry['alloc_peak_kb']:>9.1f}")
@@ -0,0 +1,183 @@
+"""
+Deck Service
+Renders decks on request from the current site-mapping.json and keeps recent results in an LRU cache
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from generators import main_generator, phase1_generator
+from migration_stats import MigrationStats
+from slidekit import load_values
+
+DECK_KINDS = ('main', 'phase1', 'site')
+DECK_FILENAMES = {
+    'main': 'SharePoint-Migration-User-Guide.pptx',
+    'phase1': 'Phase1-Backup-Guide.pptx',
+}
+
+
+class LRUCache:
+    """Thread-safe mapping that keeps the ``maxsize`` most recently used entries"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DeckNotFound(LookupError):
+    """The requested deck kind or site does not exist"""
+
+
+def site_slug(name):
+    """Lower-case URL form of a site name, e.g. 'PS - Purchasing' -> 'ps-purchasing'"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+class MappingSnapshot:
+    """Everything a render needs from one version of the mapping and values files"""
+
+    __slots__ = ('version', 'stats', 'values', 'sites', '_templates')
+
+    def __init__(self, version, stats, values, sites):
+        self.version = version
+        self.stats = stats
+        self.values = values
+        self.sites = sites
+        self._templates = None
+
+    @property
+    def templates(self):
+        """Per-status site brief templates, built on first use"""
+        if self._templates is None:
+            self._templates = main_generator().build_site_templates(self.values)
+        return self._templates
+
+
+class DeckService:
+    """Renders the main, Phase 1 and per-site decks, cached per mapping version
+
+    The version is a hash of site-mapping.json (and the placeholder values
+    file, if any). Files are only re-hashed when their size or
+    modification time changes, so a request for a cached deck costs a
+    ``stat`` per file, and an edit that leaves the content unchanged keeps
+    the cache. Rendered decks are cached under (version, kind, deck), so
+    once the mapping changes old entries stop being hit and the LRU
+    evicts them.
+    """
+
+    def __init__(self, mapping_path=None, values_path=None, cache_size=64):
+        self.mapping_path = mapping_path or MigrationStats().path
+        self.values_path = values_path
+        self.cache = LRUCache(cache_size)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._snapshot = None
+
+    def _paths(self):
+        return [self.mapping_path] + ([self.values_path] if self.values_path else [])
+
+    def _content_hash(self):
+        digest = hashlib.sha256()
+        for path in self._paths():
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()[:16]
+
+    def snapshot(self):
+        """``MappingSnapshot`` of the files as they are now (reloaded only when their content changed)"""
+        stamp = tuple((st.st_size, st.st_mtime_ns) for st in map(os.stat, self._paths()))
+        with self._lock:
+            if self._snapshot is None or stamp != self._stamp:
+                version = self._content_hash()
+                if self._snapshot is None or version != self._snapshot.version:
+                    self._snapshot = self._load(version)
+                self._stamp = stamp
+            return self._snapshot
+
+    def _load(self, version):
+        generator = main_generator()
+        values = load_values(self.values_path) if self.values_path else None
+        stats = MigrationStats(self.mapping_path)
+        sites = {}
+        for site in stats.iter_sites():
+            sites.setdefault(site_slug(generator.site_display_name(site)), site)
+            if site.get('id'):
+                sites.setdefault(str(site['id']).lower(), site)
+        stats.refresh()
+        return MappingSnapshot(version, stats, values, sites)
+
+    def find_site(self, name, snapshot=None):
+        """The mapping entry for a site slug, display name or id"""
+        sites = (snapshot or self.snapshot()).sites
+        site = sites.get(name.lower()) or sites.get(site_slug(name))
+        if site is None:
+            raise DeckNotFound(f"No site named {name!r} in {self.mapping_path}")
+        return site
+
+    def deck(self, kind, name=None):
+        """(deck bytes, file name, version) for a deck, rendering it only on a cache miss"""
+        snapshot = self.snapshot()
+        key = self.cache_key(kind, name, snapshot)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self.render(kind, name, snapshot)
+        self.cache.put(key, result)
+        return result
+
+    def cache_key(self, kind, name, snapshot):
+        if kind == 'site':
+            site = self.find_site(name, snapshot)
+            return (snapshot.version, kind, site.get('id') or site_slug(main_generator().site_display_name(site)))
+        if kind in ('main', 'phase1'):
+            # Both title slides (and the main deck's status slide) show today's date
+            return (snapshot.version, kind, date.today().isoformat())
+        raise DeckNotFound(f"Unknown deck {kind!r} (expected one of {', '.join(DECK_KINDS)})")
+
+    @staticmethod
+    def etag(key):
+        """HTTP ETag for a deck's cache key: mapping version, deck and (for dated decks) date"""
+        return '"' + '-'.join(re.sub(r'[^A-Za-z0-9._]+', '_', str(part)) for part in key) + '"'
+
+    def render(self, kind, name, snapshot):
+        """Render a deck from ``snapshot`` without the cache: (bytes, file name, version)"""
+        if kind == 'site':
+            generator = main_generator()
+            site = self.find_site(name, snapshot)
+            output = generator.render_site_deck(site, templates=snapshot.templates, throughput=snapshot.stats.throughput)
+            return output.getvalue(), generator.site_deck_filename(site), snapshot.version
+        if kind == 'main':
+            output = main_generator().render_presentation(stats=snapshot.stats, values=snapshot.values)
+        else:
+            output = phase1_generator().render_presentation(values=snapshot.values)
+        return output.getvalue(), DECK_FILENAMES[kind], snapshot.version
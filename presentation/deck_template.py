@@ -0,0 +1,71 @@
+"""
+Deck Template
+A deck built once with {{field}} tokens, then cloned per output with the tokens filled in
+"""
+
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from slidekit import write_output
+
+_TOKEN_RE = re.compile(rb'\{\{(\w+)\}\}')
+
+
+class DeckTemplate:
+    """Serialised .pptx package whose text contains ``{{field}}`` tokens
+
+    The package is saved and unzipped once. Rendering copies every part's
+    bytes unchanged except the few slide/notes parts that contain tokens,
+    where the tokens are replaced in a single regex pass, so producing a
+    deck costs a zip write instead of building every slide again.
+
+    Tokens must sit inside a single text run, which is the case for text
+    set through python-pptx (``text_frame.text``, slidekit's ``add_text``).
+    """
+
+    def __init__(self, prs):
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        self._parts = []
+        self.fields = set()
+        with zipfile.ZipFile(buffer) as package:
+            for info in package.infolist():
+                data = package.read(info)
+                names = {m.group(1).decode() for m in _TOKEN_RE.finditer(data)}
+                self.fields |= names
+                self._parts.append((info.filename, info.date_time, data, bool(names)))
+
+    @staticmethod
+    def token(field):
+        """Placeholder text for ``field`` to use while building the template deck"""
+        return '{{%s}}' % field
+
+    def render(self, values):
+        """Bytes of a copy of the deck with every ``{{field}}`` replaced"""
+        buffer = io.BytesIO()
+        self._write(values, buffer)
+        return buffer.getvalue()
+
+    def save(self, values, output=None):
+        """Write a filled-in copy to a path or binary file object (a new BytesIO by default)
+
+        Returns (output, bytes written), like ``slidekit.save_presentation``.
+        """
+        return write_output(output, lambda stream: self._write(values, stream))
+
+    def _write(self, values, file):
+        missing = self.fields - values.keys()
+        if missing:
+            raise ValueError(f"No value for template field(s): {', '.join(sorted(missing))}")
+        replacements = {name.encode(): escape(str(value)).encode() for name, value in values.items()}
+
+        def fill(match):
+            return replacements[match.group(1)]
+
+        with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as package:
+            for filename, date_time, data, has_tokens in self._parts:
+                if has_tokens:
+                    data = _TOKEN_RE.sub(fill, data)
+                package.writestr(zipfile.ZipInfo(filename, date_time), data, zipfile.ZIP_DEFLATED)
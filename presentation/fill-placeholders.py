@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Placeholder Filler
+Fills [YOUR ...] placeholders in generated or hand-edited decks from a values file
+
+Usage:
+    python3 fill-placeholders.py DECK.pptx [DECK.pptx ...] --values placeholder-values.yaml
+    python3 fill-placeholders.py DECK.pptx --list
+"""
+
+import argparse
+import os
+import sys
+
+from pptx import Presentation
+
+from slidekit import PlaceholderIndex, load_values
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('decks', nargs='+', help=".pptx files to fill")
+    parser.add_argument('--values', help="YAML or JSON file mapping placeholders to values")
+    parser.add_argument('--output-dir', default=None,
+                        help="write filled copies here instead of overwriting the input files")
+    parser.add_argument('--list', action='store_true',
+                        help="only list the placeholders in each deck (and those --values leaves unfilled)")
+    args = parser.parse_args(argv)
+    if not args.values and not args.list:
+        parser.error("--values is required unless --list is given")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    values = load_values(args.values) if args.values else {}
+
+    for path in args.decks:
+        prs = Presentation(path)
+        index = PlaceholderIndex(prs)
+        if args.list:
+            print(f"{path}:")
+            for token, slides in sorted(index.tokens.items()):
+                state = "✅" if token in values else "❌"
+                print(f"  {state} {token} (slides {', '.join(map(str, slides))})")
+            continue
+
+        replaced = index.fill(values)
+        output_file = path
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            output_file = os.path.join(args.output_dir, os.path.basename(path))
+        prs.save(output_file)
+        print(f"✅ {output_file}: {replaced} placeholder(s) filled")
+        for token, slides in sorted(index.unfilled(values).items()):
+            print(f"   ⚠️  No value for {token} (slides {', '.join(map(str, slides))})")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Generator Modules
+Imports the hyphen-named generator scripts so other tools can call their functions
+"""
+
+import importlib.util
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+MAIN_SCRIPT = 'create-presentation.py'
+PHASE1_SCRIPT = 'create-phase1-presentation.py'
+
+
+def load_script(filename):
+    """Import a script from this directory as a module (once per process)
+
+    ``create-presentation.py`` becomes module ``create_presentation``. The
+    module is registered in ``sys.modules`` so its functions can be pickled
+    for process pools.
+    """
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(_HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def main_generator():
+    """The main deck generator (create-presentation.py)"""
+    return load_script(MAIN_SCRIPT)
+
+
+def phase1_generator():
+    """The Phase 1 deck generator (create-phase1-presentation.py)"""
+    return load_script(PHASE1_SCRIPT)
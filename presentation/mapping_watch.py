@@ -0,0 +1,163 @@
+"""
+Mapping Watcher
+Watches site-mapping.json and calls back (debounced, in the background) when it changes
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import traceback
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _InotifySource:
+    """Change events for one file via Linux inotify (watches its directory,
+    so atomic rename-into-place writes are seen too)"""
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.name = os.path.basename(path).encode()
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.path.dirname(os.path.abspath(path)).encode()
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, directory, mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout):
+        """True if the file changed within ``timeout`` seconds"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        offset = 0
+        changed = False
+        while offset < len(data):
+            _, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            changed = changed or name == self.name
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingSource:
+    """Change events for one file by comparing size/mtime every few seconds"""
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.stamp = self._stamp()
+
+    def _stamp(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        stamp = self._stamp()
+        if stamp != self.stamp:
+            self.stamp = stamp
+            return True
+        return False
+
+    def close(self):
+        pass
+
+
+class MappingWatcher:
+    """Run ``on_change`` in a background thread whenever ``path`` changes
+
+    Bursts of writes are debounced: the callback fires once the file has
+    been quiet for ``debounce`` seconds, or at the latest ``max_delay``
+    seconds after the first write of a burst. Changes made while the
+    callback is running are coalesced into a single follow-up run.
+    """
+
+    def __init__(self, path, on_change, debounce=10.0, max_delay=45.0, poll_interval=5.0):
+        self.path = path
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self._dirty = threading.Event()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._work, name='mapping-watch', daemon=True)
+
+    def _open_source(self):
+        if sys.platform.startswith('linux'):
+            try:
+                return _InotifySource(self.path)
+            except (OSError, AttributeError) as e:
+                print(f"⚠️  inotify unavailable ({e}); polling every {self.poll_interval:g}s")
+        return _PollingSource(self.path, self.poll_interval)
+
+    def _work(self):
+        while not self._stopped.is_set():
+            if not self._dirty.wait(timeout=1.0):
+                continue
+            self._dirty.clear()
+            try:
+                self.on_change()
+            except Exception:
+                traceback.print_exc()
+
+    def trigger(self):
+        """Schedule a callback run (e.g. for the initial build)"""
+        self._dirty.set()
+
+    def run(self):
+        """Watch until interrupted (Ctrl+C) or ``stop()`` is called"""
+        source = self._open_source()
+        self._worker.start()
+        first_change = last_change = None
+        try:
+            while not self._stopped.is_set():
+                if first_change is None:
+                    timeout = 1.0
+                else:
+                    now = time.monotonic()
+                    timeout = max(0.0, min(last_change + self.debounce, first_change + self.max_delay) - now)
+
+                changed = source.wait(timeout)
+                now = time.monotonic()
+                if changed:
+                    first_change = first_change or now
+                    last_change = now
+                if first_change is not None and (
+                    now >= last_change + self.debounce or now >= first_change + self.max_delay
+                ):
+                    first_change = last_change = None
+                    self._dirty.set()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            source.close()
+            # Let an in-flight regeneration finish writing its files
+            self._worker.join()
+
+    def stop(self):
+        self._stopped.set()
@@ -0,0 +1,289 @@
+"""
+Migration Statistics
+Lazily loads site-mapping.json and derives the numbers shown in the presentations
+"""
+
+import json
+import math
+import os
+from bisect import bisect_right
+
+from throughput import ThroughputModel, site_duration_hours
+
+# Default location of the migration tool's mapping export (override with
+# SITE_MAPPING_PATH or the generators' --mapping option)
+DEFAULT_MAPPING_PATH = os.environ.get(
+    'SITE_MAPPING_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'site-mapping.json')
+)
+
+# Upper bounds (GB) of the per-site storage histogram buckets; the last bucket is open-ended
+STORAGE_BUCKETS_GB = (1, 5, 10, 50, 100, 500)
+
+
+def storage_bucket_labels(edges=STORAGE_BUCKETS_GB):
+    """Labels for the buckets of ``storage_histogram``: '< 1 GB', '1-5 GB', ..., '500+ GB'"""
+    labels = [f"< {edges[0]} GB"]
+    labels.extend(f"{low}-{high} GB" for low, high in zip(edges, edges[1:]))
+    labels.append(f"{edges[-1]}+ GB")
+    return labels
+
+
+class MigrationStats:
+    """Statistics derived from site-mapping.json
+
+    Nothing is read until a statistic is first accessed. Results are cached
+    against the file's size and modification time; call ``refresh()`` to
+    pick up a changed mapping.
+    """
+
+    def __init__(self, path=DEFAULT_MAPPING_PATH):
+        self.path = path
+        self._stamp = None
+        self._stats = None
+
+    def _file_stamp(self):
+        st = os.stat(self.path)
+        return (st.st_size, st.st_mtime_ns)
+
+    def _ensure_loaded(self):
+        if self._stats is None:
+            self._load()
+        return self._stats
+
+    def _load(self):
+        stamp = self._file_stamp()
+        self._stats = compute_stats(iter_mappings(self.path))
+        self._stamp = stamp
+
+    def load_from(self, sites):
+        """Compute the statistics from already-parsed entries instead of reading the file"""
+        self._stats = compute_stats(sites)
+        self._stamp = self._file_stamp()
+
+    def refresh(self):
+        """Recompute if the mapping changed on disk; returns True if it did"""
+        if self._stats is not None and self._file_stamp() == self._stamp:
+            return False
+        self._load()
+        return True
+
+    @property
+    def mappings(self):
+        """All site entries as a list (prefer ``iter_sites()`` for large exports)"""
+        return list(self.iter_sites())
+
+    def iter_sites(self):
+        """Stream the site entries from the mapping file"""
+        return iter_mappings(self.path)
+
+    @property
+    def total_sites(self):
+        return self._ensure_loaded()['total_sites']
+
+    @property
+    def complete_sites(self):
+        return self._ensure_loaded()['complete_sites']
+
+    @property
+    def in_progress_sites(self):
+        return self._ensure_loaded()['in_progress_sites']
+
+    @property
+    def pending_sites(self):
+        return self._ensure_loaded()['pending_sites']
+
+    @property
+    def total_storage_gb(self):
+        return self._ensure_loaded()['total_storage_gb']
+
+    @property
+    def total_storage_tb(self):
+        return self.total_storage_gb / 1024
+
+    @property
+    def total_items(self):
+        return self._ensure_loaded()['total_items']
+
+    @property
+    def storage_gb_by_status(self):
+        return self._ensure_loaded()['storage_gb_by_status']
+
+    @property
+    def items_by_library(self):
+        return self._ensure_loaded()['items_by_library']
+
+    @property
+    def storage_histogram(self):
+        """Site counts per storage bucket (see ``STORAGE_BUCKETS_GB``)"""
+        return self._ensure_loaded()['storage_histogram']
+
+    def top_libraries(self, count=6):
+        """The ``count`` library names with the most items, plus an 'Other' total for the rest"""
+        ranked = sorted(self.items_by_library.items(), key=lambda item: -item[1])
+        top = ranked[:count]
+        other = sum(items for _, items in ranked[count:])
+        return top + [('Other', other)] if other else top
+
+    @property
+    def throughput(self):
+        """``ThroughputModel`` fitted from timed, completed sites (None when too few have timings)"""
+        return ThroughputModel.fit(self._ensure_loaded()['timed_completions'])
+
+    @property
+    def complete_pct(self):
+        return (self.complete_sites / self.total_sites * 100) if self.total_sites > 0 else 0
+
+    def as_dict(self):
+        """Plain dict of the headline statistics"""
+        return dict(self._ensure_loaded())
+
+
+def compute_stats(sites):
+    """Headline statistics for an iterable of site-mapping.json entries
+
+    Everything is gathered in a single pass, so ``sites`` may be a stream
+    (see ``iter_mappings``) rather than a list.
+    """
+    total_sites = 0
+    complete_sites = 0
+    in_progress_sites = 0
+    total_storage_gb = 0
+    total_items = 0
+    storage_gb_by_status = {}
+    storage_histogram = [0] * (len(STORAGE_BUCKETS_GB) + 1)
+    items_by_library = {}
+    timed = ThroughputModel.new_totals()
+
+    for site in sites:
+        total_sites += 1
+        status = site.get('status') or 'pending'
+        if status == 'complete':
+            complete_sites += 1
+        elif status == 'in-progress':
+            in_progress_sites += 1
+
+        # Storage from CSV-provided storageGB
+        storage_gb = site.get('storageGB') or 0
+        total_storage_gb += storage_gb
+        storage_gb_by_status[status] = storage_gb_by_status.get(status, 0) + storage_gb
+        storage_histogram[bisect_right(STORAGE_BUCKETS_GB, storage_gb)] += 1
+
+        # Item counts from library metadata (when available)
+        site_items = 0
+        for lib in (site.get('metadata') or {}).get('libraries') or []:
+            item_count = lib.get('itemCount', 0)
+            site_items += item_count
+            lib_name = lib.get('name') or lib.get('title') or 'Unknown'
+            items_by_library[lib_name] = items_by_library.get(lib_name, 0) + item_count
+        total_items += site_items
+
+        # Sums for the throughput fit (see throughput.py)
+        if status == 'complete':
+            hours = site_duration_hours(site)
+            # Zero, negative (completedAt before startedAt) and infinite spans aren't samples
+            if hours is not None and 0 < hours < math.inf:
+                ThroughputModel.add_sample(timed, hours, site_items, storage_gb)
+
+    return {
+        'total_sites': total_sites,
+        'complete_sites': complete_sites,
+        'in_progress_sites': in_progress_sites,
+        'pending_sites': total_sites - complete_sites - in_progress_sites,
+        'total_storage_gb': total_storage_gb,
+        'total_items': total_items,
+        'storage_gb_by_status': storage_gb_by_status,
+        'storage_histogram': storage_histogram,
+        'timed_completions': timed,
+        'items_by_library': items_by_library,
+    }
+
+
+class _JSONStreamReader:
+    """Minimal incremental tokenizer over a text file of JSON
+
+    Holds at most one value plus one read chunk in memory at a time.
+    """
+
+    WHITESPACE = ' \t\n\r'
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read_more(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (without consuming it), or '' at EOF"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read_more():
+                return ''
+
+    def take(self, expected):
+        """Consume the next structural character, which must be in ``expected``"""
+        ch = self.peek()
+        if not ch or ch not in expected:
+            raise ValueError(f"Malformed JSON near offset {self.pos}: expected one of {expected!r}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode and consume the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A value ending exactly at the buffer edge may be a truncated
+                # number or literal; only trust it once more input is visible
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._read_more() and self.pos >= len(self.buf):
+                raise ValueError("Unexpected end of JSON input")
+
+
+def iter_mappings(path, key='mappings', chunk_size=1 << 16):
+    """Stream the entries of the top-level ``key`` array in a JSON file
+
+    Entries are yielded one at a time as they are parsed, so memory stays
+    constant regardless of how many sites the export contains.
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        reader = _JSONStreamReader(f, chunk_size)
+        if reader.peek() != '{':
+            return
+        reader.take('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            name = reader.value()
+            reader.take(':')
+            if name == key and reader.peek() == '[':
+                reader.take('[')
+                if reader.peek() == ']':
+                    return
+                while True:
+                    yield reader.value()
+                    if reader.take(',]') == ']':
+                        return
+            reader.value()  # Skip other top-level values
+            if reader.take(',}') == '}':
+                return
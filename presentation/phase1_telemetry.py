@@ -0,0 +1,390 @@
+"""
+Phase 1 Telemetry
+Parses the Phase1-Events-*.json files Phase1-Backup.ps1 writes into an indexed model of device outcomes
+
+Collect-Phase1-Telemetry.ps1 copies each device's
+``Phase1-Events-<computer>-<yyyyMMdd-HHmmss>.json`` to a share. The files
+are parsed in chunks across worker processes, each worker returning
+compact ``Phase1Event`` records, and duplicates (the same run collected
+twice) are dropped by computer name and timestamp. ``Phase1Telemetry``
+indexes the records by device and by step outcome.
+
+The script records one duration per run (``Execution.DurationSeconds``),
+not per step. A step's outcome is read from what the run found for it
+(e.g. whether OneDrive is signed in with all three known folders backed
+up, or whether PST files were copied) and from the errors it logged.
+"""
+
+import math
+import os
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+
+from telemetry_files import CHUNK_SIZE, find_files, parse_in_chunks, parse_time, read_json
+
+EVENT_PATTERN = re.compile(r'^Phase1-Events-(?P<computer>.+)-(?P<stamp>\d{8}-\d{6})\.json$', re.IGNORECASE)
+
+# Steps with telemetry, in deck order (the iOS reminder records nothing)
+STEPS = ('onedrive', 'browsers', 'printers', 'wifi', 'outlook')
+STEP_LABELS = {
+    'onedrive': "OneDrive Setup",
+    'browsers': "Browser Backup",
+    'printers': "Printer Settings",
+    'wifi': "WiFi Network",
+    'outlook': "Outlook Data Files",
+}
+
+# Step outcomes
+OK = 'ok'
+ATTENTION = 'attention'
+FAILED = 'failed'
+NOT_NEEDED = 'not-needed'
+OUTCOMES = (OK, ATTENTION, FAILED, NOT_NEEDED)
+
+# Errors logged by Phase1-Backup.ps1 (Write-Error) that belong to a step
+STEP_ERRORS = {
+    'onedrive': re.compile(r'OneDrive', re.IGNORECASE),
+    'printers': re.compile(r'printer', re.IGNORECASE),
+    'wifi': re.compile(r'WiFi|SSID', re.IGNORECASE),
+    'outlook': re.compile(r'Outlook|\.pst\b', re.IGNORECASE),
+    'browsers': re.compile(r'browser', re.IGNORECASE),
+}
+
+# Fewer runs than this in a group give no meaningful median
+MIN_SAMPLES = 5
+
+# Bump when parse_event's output changes, so telemetry stores re-parse their events
+EVENT_VERSION = 1
+
+
+def _as_list(value):
+    """ConvertTo-Json writes a one-element array as the bare element"""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class Phase1Event:
+    """One device run of Phase1-Backup.ps1, reduced to what the rollups need"""
+
+    __slots__ = ('computer', 'timestamp', 'path', 'serial', 'model', 'user', 'script_version',
+                 'duration_seconds', 'success', 'errors', 'steps', 'pst_count', 'pst_size_mb',
+                 'printer_count', 'wifi_ssid', 'browsers')
+
+    def __init__(self, computer, timestamp, path=None, serial=None, model=None, user=None,
+                 script_version=None, duration_seconds=None, success=False, errors=(), steps=None,
+                 pst_count=0, pst_size_mb=0.0, printer_count=0, wifi_ssid=None, browsers=()):
+        self.computer = computer
+        self.timestamp = timestamp
+        self.path = path
+        self.serial = serial
+        self.model = model
+        self.user = user
+        self.script_version = script_version
+        self.duration_seconds = duration_seconds
+        self.success = success
+        self.errors = tuple(errors)
+        self.steps = steps or {}
+        self.pst_count = pst_count
+        self.pst_size_mb = pst_size_mb
+        self.printer_count = printer_count
+        self.wifi_ssid = wifi_ssid
+        self.browsers = tuple(browsers)
+
+    @property
+    def key(self):
+        """Duplicate key: the same computer's run at the same time"""
+        return (self.computer.upper(), self.timestamp)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__} | {
+            'timestamp': self.timestamp.isoformat(), 'errors': list(self.errors), 'browsers': list(self.browsers)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**dict(data, timestamp=datetime.fromisoformat(data['timestamp'])))
+
+
+def step_outcomes(results, errors):
+    """Outcome of each step in STEPS from a run's ``Results`` and logged errors"""
+    onedrive = results.get('OneDrive')
+    if not onedrive or not onedrive.get('Installed'):
+        steps = {'onedrive': FAILED}
+    else:
+        folders = onedrive.get('KnownFolderBackup') or {}
+        backed_up = all(folders.get(name) for name in ('Desktop', 'Documents', 'Pictures'))
+        steps = {'onedrive': OK if onedrive.get('SignedIn') and backed_up else ATTENTION}
+
+    steps['browsers'] = OK if _as_list((results.get('Browsers') or {}).get('Installed')) else ATTENTION
+    steps['printers'] = OK if (results.get('Printers') or {}).get('Count') else NOT_NEEDED
+
+    ssid = (results.get('WiFi') or {}).get('SSID')
+    if not ssid:
+        steps['wifi'] = FAILED
+    elif ssid == 'ETHERNET':
+        steps['wifi'] = NOT_NEEDED
+    else:
+        steps['wifi'] = ATTENTION if ssid == 'NOT CONNECTED' else OK
+
+    outlook = results.get('OutlookDataFiles') or {}
+    if not outlook.get('PSTCount'):
+        steps['outlook'] = NOT_NEEDED
+    else:
+        steps['outlook'] = OK if outlook.get('PSTCopied') else FAILED
+
+    for step, pattern in STEP_ERRORS.items():
+        if any(pattern.search(error) for error in errors):
+            steps[step] = FAILED
+    return steps
+
+
+def parse_event(path, data=None):
+    """``Phase1Event`` from a Phase1-Events JSON file (``data`` if already loaded)"""
+    if data is None:
+        data = read_json(path)
+    match = EVENT_PATTERN.match(os.path.basename(path))
+    device = data.get('Device') or {}
+    computer = device.get('ComputerName') or (match and match['computer'])
+    timestamp = parse_time(data.get('Timestamp') or (data.get('Execution') or {}).get('StartTime'))
+    if timestamp is None and match:
+        timestamp = datetime.strptime(match['stamp'], '%Y%m%d-%H%M%S')
+    if not computer or timestamp is None:
+        raise ValueError("no computer name or timestamp")
+
+    results = data.get('Results') or {}
+    execution = data.get('Execution') or {}
+    errors = [str(error) for error in _as_list(data.get('Errors'))]
+    outlook = results.get('OutlookDataFiles') or {}
+    browsers = results.get('Browsers') or {}
+    return Phase1Event(
+        computer, timestamp, path,
+        serial=device.get('SerialNumber'),
+        model=' '.join(filter(None, (device.get('Manufacturer'), device.get('Model')))) or None,
+        user=(data.get('User') or {}).get('Username'),
+        script_version=data.get('ScriptVersion'),
+        duration_seconds=execution.get('DurationSeconds'),
+        success=bool(execution.get('Success', not errors)),
+        errors=errors,
+        steps=step_outcomes(results, errors),
+        pst_count=outlook.get('PSTCount') or 0,
+        pst_size_mb=float(outlook.get('PSTTotalSizeMB') or 0),
+        printer_count=(results.get('Printers') or {}).get('Count') or 0,
+        wifi_ssid=(results.get('WiFi') or {}).get('SSID'),
+        browsers=[str(name) for name in _as_list(browsers.get('Installed'))],
+    )
+
+
+def find_event_files(*sources):
+    """Phase1-Events-*.json files in the given directories (recursively) or file paths"""
+    return find_files(EVENT_PATTERN.match, *sources)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted ``values`` (None when empty)"""
+    if not values:
+        return None
+    rank = min(max(math.ceil(fraction * len(values)), 1), len(values))
+    return values[rank - 1]
+
+
+def _minutes(seconds):
+    return seconds / 60 if seconds is not None else None
+
+
+def _median_gap(slower, faster):
+    """Minutes between two sorted groups' medians (None if either is too small)"""
+    if len(slower) < MIN_SAMPLES or len(faster) < MIN_SAMPLES:
+        return None
+    return _minutes(percentile(slower, 0.5) - percentile(faster, 0.5))
+
+
+class StepRollup:
+    """Outcomes of one step over the devices' latest runs, with the run time they go with
+
+    Only whole-run durations are recorded, so a step's time is read from
+    differences in median run time: ``added_minutes`` between devices the
+    step applied to and devices it didn't (e.g. with and without PST
+    files), and ``extra_minutes`` between devices where it had a problem
+    (failed or needed attention) and devices where it went fine. Either
+    is None without MIN_SAMPLES runs on both sides.
+    """
+
+    def __init__(self, step, counts, durations):
+        self.step = step
+        self.counts = counts
+        ok = sorted(durations.get(OK, []))
+        problem = sorted(durations.get(FAILED, []) + durations.get(ATTENTION, []))
+        needed = sorted(ok + problem)
+        self.median_minutes = _minutes(percentile(needed, 0.5))
+        self.p90_minutes = _minutes(percentile(needed, 0.9))
+        self.added_minutes = _median_gap(needed, sorted(durations.get(NOT_NEEDED, [])))
+        self.extra_minutes = _median_gap(problem, ok)
+
+    @property
+    def label(self):
+        return STEP_LABELS[self.step]
+
+    @property
+    def needed(self):
+        """Devices the step applied to"""
+        return sum(self.counts[outcome] for outcome in (OK, ATTENTION, FAILED))
+
+    def rate(self, outcome):
+        """Share of the devices the step applied to with ``outcome``"""
+        return self.counts[outcome] / self.needed if self.needed else 0.0
+
+    @property
+    def problem_rate(self):
+        return self.rate(FAILED) + self.rate(ATTENTION)
+
+    @property
+    def cost_minutes(self):
+        """Expected run time the step adds on a device it applies to (never negative)"""
+        added = max(self.added_minutes or 0, 0)
+        return added + self.problem_rate * max(self.extra_minutes or 0, 0)
+
+    def as_dict(self):
+        return {
+            'step': self.step,
+            'counts': dict(self.counts),
+            'median_minutes': self.median_minutes,
+            'p90_minutes': self.p90_minutes,
+            'added_minutes': self.added_minutes,
+            'extra_minutes': self.extra_minutes,
+        }
+
+
+class Phase1Rollup:
+    """Run times and per-step outcomes over the devices' latest runs"""
+
+    def __init__(self, devices, succeeded, durations, steps):
+        self.devices = devices
+        self.succeeded = succeeded
+        self.median_minutes = _minutes(percentile(durations, 0.5))
+        self.p90_minutes = _minutes(percentile(durations, 0.9))
+        self.steps = steps
+
+    def slowest(self):
+        """Steps ranked by the run time they add (``StepRollup.cost_minutes``), then by problem rate"""
+        return sorted(self.steps.values(), key=lambda step: (-step.cost_minutes, -step.problem_rate))
+
+    def as_dict(self):
+        return {
+            'devices': self.devices,
+            'succeeded': self.succeeded,
+            'median_minutes': self.median_minutes,
+            'p90_minutes': self.p90_minutes,
+            'steps': [step.as_dict() for step in self.steps.values()],
+        }
+
+
+class Phase1Telemetry:
+    """Deduplicated Phase 1 runs, indexed by device and by step outcome
+
+    Rollups describe each device's latest run, so a device that was
+    re-run after fixing a problem counts once, with its final outcome.
+    """
+
+    def __init__(self, events=(), failures=()):
+        self.failures = list(failures)
+        self.duplicates = 0
+        self.by_device = {}
+        seen = set()
+        for event in events:
+            if event.key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(event.key)
+            self.by_device.setdefault(event.computer.upper(), []).append(event)
+        for runs in self.by_device.values():
+            runs.sort(key=lambda event: event.timestamp)
+        self._latest = None
+        self._by_outcome = None
+
+    def __len__(self):
+        return len(self.by_device)
+
+    @property
+    def runs(self):
+        return sum(len(runs) for runs in self.by_device.values())
+
+    def latest(self):
+        """Latest run of every device, by computer name"""
+        if self._latest is None:
+            self._latest = {computer: runs[-1] for computer, runs in sorted(self.by_device.items())}
+        return self._latest
+
+    def device(self, computer):
+        """All runs of a device, oldest first (empty if unknown)"""
+        return self.by_device.get(computer.upper(), [])
+
+    def devices_with(self, step, outcome):
+        """Computer names whose latest run had ``outcome`` for ``step``"""
+        if self._by_outcome is None:
+            self._by_outcome = {}
+            for computer, event in self.latest().items():
+                for name, result in event.steps.items():
+                    self._by_outcome.setdefault((name, result), []).append(computer)
+        return self._by_outcome.get((step, outcome), [])
+
+    def step_summary(self):
+        """Step -> Counter of outcomes over the latest runs"""
+        return {step: Counter({outcome: len(self.devices_with(step, outcome)) for outcome in OUTCOMES})
+                for step in STEPS}
+
+    def durations(self):
+        """Run durations in seconds of the latest runs, sorted"""
+        return sorted(event.duration_seconds for event in self.latest().values()
+                      if event.duration_seconds is not None)
+
+    def success_count(self):
+        return sum(event.success for event in self.latest().values())
+
+    def rollup(self):
+        """``Phase1Rollup`` of the latest runs, computed in one pass"""
+        durations = {step: {} for step in STEPS}
+        for event in self.latest().values():
+            if event.duration_seconds is None:
+                continue
+            for step, outcome in event.steps.items():
+                if step in durations:
+                    durations[step].setdefault(outcome, []).append(event.duration_seconds)
+        summary = self.step_summary()
+        steps = {step: StepRollup(step, summary[step], durations[step]) for step in STEPS}
+        return Phase1Rollup(len(self), self.success_count(), self.durations(), steps)
+
+
+def load_telemetry(*sources, max_workers=None, chunk_size=CHUNK_SIZE):
+    """``Phase1Telemetry`` from the Phase1-Events files under ``sources``
+
+    Files are parsed in chunks of ``chunk_size`` across worker processes;
+    a single chunk's worth is parsed in this process.
+    """
+    events, failures = [], []
+    for chunk_events, chunk_failures in parse_in_chunks(parse_event, find_event_files(*sources),
+                                                        max_workers, chunk_size):
+        events.extend(chunk_events)
+        failures.extend(chunk_failures)
+    return Phase1Telemetry(events, failures)
+
+
+def format_minutes(seconds):
+    return f"{seconds / 60:.0f} min" if seconds is not None else "n/a"
+
+
+if __name__ == '__main__':
+    # python3 phase1_telemetry.py DIR [DIR ...] -> device and step rollup
+    telemetry = load_telemetry(*(sys.argv[1:] or ['.']))
+    durations = telemetry.durations()
+    print(f"Devices: {len(telemetry)} ({telemetry.runs} runs, {telemetry.duplicates} duplicates, "
+          f"{len(telemetry.failures)} unreadable)")
+    print(f"Succeeded: {telemetry.success_count()}  Median run: {format_minutes(percentile(durations, 0.5))}  "
+          f"p90: {format_minutes(percentile(durations, 0.9))}")
+    print(f"{'step':<20} " + ' '.join(f"{outcome:>10}" for outcome in OUTCOMES))
+    for step, counts in telemetry.step_summary().items():
+        print(f"{STEP_LABELS[step]:<20} " + ' '.join(f"{counts[outcome]:>10}" for outcome in OUTCOMES))
+    for path, error in telemetry.failures[:10]:
+        print(f"unreadable: {path}: {error}", file=sys.stderr)
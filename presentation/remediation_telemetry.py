@@ -0,0 +1,294 @@
+"""
+Remediation Telemetry
+Parses the Remediation-<name>-<yyyyMMdd-HHmmss>.json reports the Intune remediation scripts write
+
+Each run of a Remediate-*.ps1 script (scripts/intune) writes a report to
+C:\\Support, which Collect-RemediationTelemetry.ps1 gathers to a share.
+Remediate-OneDriveKFB.ps1 writes ``Result`` ('Success'/'Failed'),
+``Details`` and ``Errors``; the PST, printer and WiFi scripts write
+``Success``, or ``BackedOff`` with a ``Reason`` when a precondition such
+as OneDrive running was not met, and ``Error`` when they failed.
+
+``RemediationRollup`` streams reports into per-remediation counts and
+time-to-compliance distributions, keeping only a small state per device,
+so tens of thousands of reports roll up without holding them in memory.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+
+from phase1_telemetry import percentile
+from telemetry_files import CHUNK_SIZE, find_files, parse_in_chunks, parse_time, read_json
+
+REPORT_PATTERN = re.compile(r'^Remediation-(?P<name>[A-Za-z0-9]+)-(?P<stamp>\d{8}-\d{6})\.json$', re.IGNORECASE)
+
+# Report outcomes
+SUCCESS = 'success'
+NOT_APPLICABLE = 'not-applicable'
+BACKED_OFF = 'backed-off'
+FAILED = 'failed'
+OUTCOMES = (SUCCESS, NOT_APPLICABLE, BACKED_OFF, FAILED)
+
+# Outcomes that leave a device compliant
+COMPLIANT = (SUCCESS, NOT_APPLICABLE)
+
+# Bump when parse_report's output changes, so telemetry stores re-parse their reports
+REPORT_VERSION = 2
+
+REMEDIATION_LABELS = {
+    'OneDriveKFB': "OneDrive Folder Backup",
+    'PSTBackup': "Outlook PST Backup",
+    'PrinterBackup': "Printer Backup",
+    'WiFiBackup': "WiFi Profile Backup",
+}
+
+# Time-to-compliance buckets: (upper bound in hours, label); the last is open-ended
+COMPLIANCE_BUCKETS = (
+    (1, "< 1 h"),
+    (4, "1-4 h"),
+    (24, "4-24 h"),
+    (72, "1-3 days"),
+    (None, "> 3 days"),
+)
+
+DEFAULT_SUMMARY_FILE = 'remediation-summary.json'
+
+
+class RemediationReport:
+    """One run of a remediation script on one device"""
+
+    __slots__ = ('remediation', 'computer', 'timestamp', 'outcome', 'reason', 'risk_level', 'path')
+
+    def __init__(self, remediation, computer, timestamp, outcome, reason=None, risk_level=None, path=None):
+        self.remediation = remediation
+        self.computer = computer
+        self.timestamp = timestamp
+        self.outcome = outcome
+        self.reason = reason
+        self.risk_level = risk_level
+        self.path = path
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__} | {'timestamp': self.timestamp.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**dict(data, timestamp=datetime.fromisoformat(data['timestamp'])))
+
+
+def report_outcome(data):
+    """(outcome, reason) of a report in either script's format
+
+    Remediate-WiFiBackup.ps1 reports a device without WiFi hardware, or
+    not on WiFi, as ``BackedOff`` with ``Success`` true: there is nothing
+    to back up, and Intune counts the run as remediated.
+    """
+    errors = data.get('Errors') or []
+    error = data.get('Error') or (errors[0] if isinstance(errors, list) and errors else errors or None)
+    result = data.get('Result')
+    succeeded = (result == 'Success' if result is not None else bool(data.get('Success'))) and not data.get('Error')
+    if data.get('BackedOff'):
+        if succeeded or 'not applicable' in str(data.get('ActionRequired') or '').lower():
+            return NOT_APPLICABLE, data.get('Reason')
+        return BACKED_OFF, data.get('Reason')
+    if succeeded:
+        return SUCCESS, None
+    return FAILED, str(error) if error else data.get('Reason')
+
+
+def parse_report(path, data=None):
+    """``RemediationReport`` from a Remediation JSON file (``data`` if already loaded)"""
+    if data is None:
+        data = read_json(path)
+    match = REPORT_PATTERN.match(os.path.basename(path))
+    remediation = data.get('ScriptName') or (match and match['name'])
+    computer = data.get('ComputerName')
+    timestamp = parse_time(data.get('Timestamp'))
+    if timestamp is None and match:
+        timestamp = datetime.strptime(match['stamp'], '%Y%m%d-%H%M%S')
+    if not remediation or not computer or timestamp is None:
+        raise ValueError("no remediation name, computer name or timestamp")
+    outcome, reason = report_outcome(data)
+    return RemediationReport(remediation, computer, timestamp, outcome, reason, data.get('RiskLevel'), path)
+
+
+def find_report_files(*sources):
+    """Remediation-*.json files in the given directories (recursively) or file paths"""
+    return find_files(REPORT_PATTERN.match, *sources)
+
+
+class RemediationSummary:
+    """Rollup of one remediation across devices
+
+    A device is compliant when its latest report succeeded or found
+    nothing to back up. Time to compliance runs from the device's first
+    report to its first compliant one; retries are reports beyond each
+    device's first.
+    """
+
+    def __init__(self, remediation):
+        self.remediation = remediation
+        self.outcomes = Counter()
+        self.reasons = Counter()
+        # computer -> [first report, first compliant report, latest report, latest outcome]
+        self._devices = {}
+
+    @property
+    def label(self):
+        return REMEDIATION_LABELS.get(self.remediation, self.remediation)
+
+    def add(self, report):
+        self.outcomes[report.outcome] += 1
+        if report.outcome not in COMPLIANT and report.reason:
+            self.reasons[report.reason] += 1
+        state = self._devices.get(report.computer)
+        timestamp = report.timestamp
+        if state is None:
+            self._devices[report.computer] = [timestamp, timestamp if report.outcome in COMPLIANT else None,
+                                              timestamp, report.outcome]
+            return
+        if timestamp < state[0]:
+            state[0] = timestamp
+        if report.outcome in COMPLIANT and (state[1] is None or timestamp < state[1]):
+            state[1] = timestamp
+        if timestamp >= state[2]:
+            state[2], state[3] = timestamp, report.outcome
+
+    @property
+    def devices(self):
+        return len(self._devices)
+
+    @property
+    def runs(self):
+        return sum(self.outcomes.values())
+
+    @property
+    def retries(self):
+        return self.runs - self.devices
+
+    def current(self):
+        """Counter of each device's latest outcome"""
+        return Counter(state[3] for state in self._devices.values())
+
+    def compliance_hours(self):
+        """Sorted hours from first report to first compliant report of every device that reached compliance"""
+        return sorted((state[1] - state[0]).total_seconds() / 3600
+                      for state in self._devices.values() if state[1] is not None)
+
+    def as_dict(self):
+        current = self.current()
+        hours = self.compliance_hours()
+        histogram = dict.fromkeys((label for _, label in COMPLIANCE_BUCKETS), 0)
+        for value in hours:
+            histogram[next(label for bound, label in COMPLIANCE_BUCKETS if bound is None or value < bound)] += 1
+        median, p90 = percentile(hours, 0.5), percentile(hours, 0.9)
+        return {
+            'remediation': self.remediation,
+            'devices': self.devices,
+            'compliant': current[SUCCESS] + current[NOT_APPLICABLE],
+            'not_applicable': current[NOT_APPLICABLE],
+            'backed_off': current[BACKED_OFF],
+            'failing': current[FAILED],
+            'runs': self.runs,
+            'retries': self.retries,
+            'outcomes': {outcome: self.outcomes[outcome] for outcome in OUTCOMES},
+            'hours_to_compliance': {
+                'median': round(median, 2) if median is not None else None,
+                'p90': round(p90, 2) if p90 is not None else None,
+                'histogram': histogram,
+            },
+            'top_reasons': self.reasons.most_common(3),
+        }
+
+
+class RemediationRollup:
+    """``RemediationSummary`` per remediation, fed one report at a time"""
+
+    def __init__(self, reports=()):
+        self.summaries = {}
+        self.failures = []
+        for report in reports:
+            self.add(report)
+
+    def add(self, report):
+        summary = self.summaries.get(report.remediation)
+        if summary is None:
+            summary = self.summaries[report.remediation] = RemediationSummary(report.remediation)
+        summary.add(report)
+
+    def __len__(self):
+        return len(self.summaries)
+
+    def __iter__(self):
+        """Summaries in REMEDIATION_LABELS order, then any others by name"""
+        order = list(REMEDIATION_LABELS)
+        return iter(sorted(self.summaries.values(), key=lambda summary: (
+            order.index(summary.remediation) if summary.remediation in order else len(order), summary.remediation
+        )))
+
+    def as_dict(self):
+        return {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'reports': sum(summary.runs for summary in self.summaries.values()),
+            'unreadable': len(self.failures),
+            'remediations': [summary.as_dict() for summary in self],
+        }
+
+    def write_json(self, path=DEFAULT_SUMMARY_FILE):
+        """Write the compact JSON summary to ``path``; returns ``path``"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, separators=(',', ':'))
+        return path
+
+
+def load_rollup(*sources, max_workers=None, chunk_size=CHUNK_SIZE):
+    """``RemediationRollup`` of the reports under ``sources``, parsed in chunks across worker processes
+
+    Each chunk's reports are added as they arrive and then dropped.
+    """
+    rollup = RemediationRollup()
+    for reports, failures in parse_in_chunks(parse_report, find_report_files(*sources), max_workers, chunk_size):
+        for report in reports:
+            rollup.add(report)
+        rollup.failures.extend(failures)
+    return rollup
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('sources', nargs='*',
+                        help="folders (searched recursively) or Remediation-*.json files; "
+                             "without any, the reports in the telemetry store are used")
+    parser.add_argument('--store', default=None,
+                        help="telemetry store directory to read instead (see telemetry_store.py)")
+    parser.add_argument('--json', default=DEFAULT_SUMMARY_FILE, metavar='PATH',
+                        help=f"where to write the JSON summary (default: {DEFAULT_SUMMARY_FILE})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for parsing (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.sources:
+        rollup = load_rollup(*args.sources, max_workers=args.workers)
+    else:
+        from telemetry_store import DEFAULT_STORE_DIR, TelemetryStore
+        rollup = RemediationRollup(TelemetryStore(args.store or DEFAULT_STORE_DIR).remediation_reports())
+    print(f"{'remediation':<24} {'devices':>8} {'compliant':>10} {'(n/a)':>6} {'backed off':>11} {'failing':>8} "
+          f"{'retries':>8} {'median h':>9} {'p90 h':>7}")
+    for summary in rollup:
+        data = summary.as_dict()
+        hours = data['hours_to_compliance']
+        print(f"{summary.label:<24} {data['devices']:>8} {data['compliant']:>10} {data['not_applicable']:>6} "
+              f"{data['backed_off']:>11} "
+              f"{data['failing']:>8} {data['retries']:>8} {hours['median'] if hours['median'] is not None else '-':>9} "
+              f"{hours['p90'] if hours['p90'] is not None else '-':>7}")
+    print(f"Summary written to {rollup.write_json(args.json)}")
+    for path, error in rollup.failures[:10]:
+        print(f"unreadable: {path}: {error}", file=sys.stderr)
@@ -0,0 +1,105 @@
+"""
+Render Cache
+Content hashes of slide builder inputs, used to skip or partially rebuild decks
+"""
+
+import hashlib
+import json
+import os
+import types
+
+DEFAULT_MANIFEST = '.render-cache.json'
+
+
+def code_fingerprint(fn):
+    """Hash of a function's bytecode, names and constants (including its text)"""
+    h = hashlib.sha256()
+
+    def feed(code):
+        h.update(code.co_code)
+        h.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                feed(const)
+            elif isinstance(const, frozenset):
+                h.update(repr(sorted(const, key=repr)).encode())
+            else:
+                h.update(repr(const).encode())
+
+    feed(fn.__code__)
+    return h.hexdigest()
+
+
+def module_fingerprint(*modules):
+    """Hash of every function and method defined in ``modules``"""
+    h = hashlib.sha256()
+    for module in modules:
+        for name, obj in sorted(vars(module).items()):
+            if getattr(obj, '__module__', None) != module.__name__:
+                continue
+            if isinstance(obj, types.FunctionType):
+                h.update(code_fingerprint(obj).encode())
+            elif isinstance(obj, type):
+                for attr_name, attr in sorted(vars(obj).items()):
+                    if isinstance(attr, types.FunctionType):
+                        h.update(f"{name}.{attr_name}".encode())
+                        h.update(code_fingerprint(attr).encode())
+    return h.hexdigest()
+
+
+def slide_key(builder, inputs):
+    """Content hash for one slide: the builder's code plus the data it reads"""
+    h = hashlib.sha256(code_fingerprint(builder).encode())
+    h.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:16]
+
+
+class RenderCache:
+    """JSON manifest of the slide hashes each output file was last built from"""
+
+    def __init__(self, path=DEFAULT_MANIFEST):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def changed_slides(self, output_file, keys):
+        """Indexes of slides whose hash differs from the last build
+
+        Returns None when the deck must be built from scratch (no previous
+        build, output missing, or the slide list itself changed).
+        """
+        previous = self._entries.get(output_file)
+        if not previous or len(previous) != len(keys) or not os.path.exists(output_file):
+            return None
+        if [name for name, _ in previous] != [name for name, _ in keys]:
+            return None
+        return [i for i, (old, new) in enumerate(zip(previous, keys)) if old[1] != new[1]]
+
+    def record(self, output_file, keys):
+        self._entries[output_file] = [list(k) for k in keys]
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def replace_slide(prs, index, builder, *args):
+    """Rebuild the slide at ``index`` in place by re-running its builder
+
+    The builder appends a new slide; it is moved into the old slide's
+    position and the old slide is dropped from the package.
+    """
+    sld_id_lst = prs.slides._sldIdLst
+    old_sld_id = sld_id_lst[index]
+    builder(prs, *args)
+    new_sld_id = sld_id_lst[-1]
+    sld_id_lst.remove(new_sld_id)
+    sld_id_lst.insert(index, new_sld_id)
+    sld_id_lst.remove(old_sld_id)
+    prs.part.drop_rel(old_sld_id.rId)
+    prs.part.rename_slide_parts([sld_id.rId for sld_id in sld_id_lst])
@@ -0,0 +1,114 @@
+"""
+Render Queue
+Asyncio front end that renders decks in a bounded process pool, coalescing identical requests
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from deck_service import DeckService
+
+_WORKER_SERVICE = None
+
+
+class RenderQueueFull(RuntimeError):
+    """Too many distinct renders are already pending; retry shortly"""
+
+
+def _init_worker(mapping_path, values_path):
+    global _WORKER_SERVICE
+    # Workers render straight from their own snapshot; the parent owns the LRU cache
+    _WORKER_SERVICE = DeckService(mapping_path, values_path, cache_size=0)
+
+
+def _render_in_worker(kind, name):
+    return _WORKER_SERVICE.render(kind, name, _WORKER_SERVICE.snapshot())
+
+
+class RenderQueue:
+    """Renders decks for ``service`` in up to ``max_workers`` processes
+
+    Requests are answered from the service's LRU cache when possible.
+    Otherwise the render runs in a worker process, so python-pptx's CPU
+    work doesn't serialise on the GIL. Requests for the same deck and
+    mapping version share one render while it is in flight. At most
+    ``max_pending`` distinct renders may be queued or running; beyond that
+    ``deck()`` raises ``RenderQueueFull`` instead of queueing without
+    limit, so callers can shed load (the deck server answers 503).
+
+    ``deck()`` is a coroutine. Threaded callers such as the HTTP handler
+    use ``start()`` once and then ``submit()``.
+    """
+
+    def __init__(self, service, max_workers=None, max_pending=32):
+        self.service = service
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.rendered = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self._inflight = {}
+        self._loop = None
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker,
+            initargs=(service.mapping_path, service.values_path)
+        )
+
+    @property
+    def pending(self):
+        """Distinct renders queued or running"""
+        return len(self._inflight)
+
+    async def deck(self, kind, name=None):
+        """(deck bytes, file name, version), like ``DeckService.deck``"""
+        loop = asyncio.get_running_loop()
+        # Re-hashing a changed mapping reads the whole file; keep it off the event loop
+        snapshot = await loop.run_in_executor(None, self.service.snapshot)
+        key = self.service.cache_key(kind, name, snapshot)
+        cached = self.service.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        elif len(self._inflight) >= self.max_pending:
+            self.rejected += 1
+            raise RenderQueueFull(f"{len(self._inflight)} renders already pending")
+        else:
+            future = loop.run_in_executor(self._pool, _render_in_worker, kind, name)
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        # One caller giving up must not cancel the render for the others
+        return await asyncio.shield(future)
+
+    def _finished(self, key, future):
+        del self._inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.rendered += 1
+        result = future.result()
+        # The worker may have seen a newer mapping than the request; only cache a matching version
+        if result[2] == key[0]:
+            self.service.cache.put(key, result)
+
+    def start(self):
+        """Run the queue's event loop in a background thread (for ``submit()``)"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name='render-queue', daemon=True).start()
+        return self
+
+    def submit(self, kind, name=None):
+        """``deck()`` from any thread; returns a concurrent.futures.Future"""
+        if self._loop is None:
+            raise RuntimeError("RenderQueue.start() must be called before submit()")
+        return asyncio.run_coroutine_threadsafe(self.deck(kind, name), self._loop)
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+        self._pool.shutdown(cancel_futures=True)
@@ -0,0 +1,51 @@
+"""
+Slide Kit
+Shared styles and slide-building helpers for the presentation generators
+"""
+
+from slidekit.builders import (
+    add_bullet,
+    add_content_box,
+    add_notes,
+    add_paragraph,
+    add_text,
+    add_title,
+    new_presentation,
+    save_presentation,
+    set_placeholder_title,
+    unique_filename,
+    write_output,
+)
+from slidekit.charts import add_column_chart, add_doughnut_chart
+from slidekit.placeholders import PlaceholderIndex, fill_placeholders, fill_text, load_values
+from slidekit.spec import DeckSpec, SpecError, compile_spec, load_spec, render_slide
+from slidekit.styles import COLORS, STYLES, TextStyle, text_style
+
+__all__ = [
+    'COLORS',
+    'DeckSpec',
+    'PlaceholderIndex',
+    'STYLES',
+    'SpecError',
+    'TextStyle',
+    'add_bullet',
+    'add_column_chart',
+    'add_content_box',
+    'add_doughnut_chart',
+    'add_notes',
+    'add_paragraph',
+    'add_text',
+    'add_title',
+    'compile_spec',
+    'fill_placeholders',
+    'fill_text',
+    'load_spec',
+    'load_values',
+    'new_presentation',
+    'render_slide',
+    'save_presentation',
+    'set_placeholder_title',
+    'text_style',
+    'unique_filename',
+    'write_output',
+]
@@ -0,0 +1,153 @@
+"""
+Slide Kit - Builders
+Helpers for adding styled text boxes, bullets and notes to slides
+"""
+
+import io
+import os
+
+from pptx import Presentation
+from pptx.util import Emu, Inches, Pt
+
+from slidekit.styles import STYLES, text_style
+
+
+def _emu(inches):
+    """Inches to EMU, rounded so summed offsets (2 + 3 * 0.6) land exactly"""
+    return Emu(round(inches * 914400))
+
+
+def _resolve_style(style, style_kwargs):
+    if isinstance(style, str):
+        return STYLES[style]
+    if style is None:
+        return text_style(**style_kwargs)
+    return style
+
+
+def new_presentation():
+    """Blank 16:9 presentation (10" x 5.625")"""
+    prs = Presentation()
+    prs.slide_width = Inches(10)  # Standard 16:9 widescreen
+    prs.slide_height = Inches(5.625)
+    return prs
+
+
+class _CountingWriter:
+    """Write-only wrapper that counts bytes (no tell/seek, so zipfile streams into it)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, data):
+        self.count += len(data)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def write_output(output, write):
+    """Run ``write(stream)`` against a path or binary file object; returns (output, bytes written)
+
+    With no ``output`` a new ``BytesIO`` is used and rewound so it can be
+    read straight away. Non-seekable streams (sockets, HTTP responses) are
+    written to directly without buffering the whole file.
+    """
+    if output is None:
+        output = io.BytesIO()
+        write(output)
+        size = output.tell()
+        output.seek(0)
+        return output, size
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            write(f)
+            return output, f.tell()
+    try:
+        start = output.tell()
+    except (AttributeError, OSError):
+        writer = _CountingWriter(output)
+        write(writer)
+        return output, writer.count
+    write(output)
+    return output, output.tell() - start
+
+
+def save_presentation(prs, output=None):
+    """Save a deck to a path or binary file object (a new BytesIO by default); returns (output, bytes written)"""
+    return write_output(output, prs.save)
+
+
+def unique_filename(filename, taken):
+    """``filename``, or with a -2, -3, ... suffix if already in ``taken``; records the result in ``taken``
+
+    Names are compared case-insensitively, as Windows file systems do.
+    """
+    stem, ext = os.path.splitext(filename)
+    suffix = 1
+    while filename.lower() in taken:
+        suffix += 1
+        filename = f"{stem}-{suffix}{ext}"
+    taken.add(filename.lower())
+    return filename
+
+
+def add_text(slide, left, top, width, height, text, style=None, word_wrap=None, **style_kwargs):
+    """Add a text box (position and size in inches) whose first paragraph is styled
+
+    ``style`` is a ``TextStyle`` or a ``STYLES`` name; otherwise the keyword
+    arguments (size, bold, italic, color, align) select a cached style.
+    Returns the text frame.
+    """
+    text_box = slide.shapes.add_textbox(_emu(left), _emu(top), _emu(width), _emu(height))
+    text_frame = text_box.text_frame
+    if word_wrap is not None:
+        text_frame.word_wrap = word_wrap
+    text_frame.text = text
+    _resolve_style(style, style_kwargs).apply(text_frame.paragraphs[0])
+    return text_frame
+
+
+def add_paragraph(text_frame, text, style=None, level=0, space_before=None, **style_kwargs):
+    """Append a styled paragraph to a text frame"""
+    p = text_frame.add_paragraph()
+    p.text = text
+    _resolve_style(style, style_kwargs).apply(p)
+    if level:
+        p.level = level
+    if space_before is not None:
+        p.space_before = Pt(space_before)
+    return p
+
+
+def set_placeholder_title(slide, text, size=40):
+    """Fill a layout's title placeholder using the deck's title color"""
+    title = slide.shapes.title
+    title.text = text
+    text_style(size, color='primary').apply(title.text_frame.paragraphs[0])
+    return title
+
+
+def add_notes(slide, text):
+    """Set the slide's speaker notes"""
+    slide.notes_slide.notes_text_frame.text = text
+
+
+def add_title(slide, text, top=0.5):
+    """Add centered title to slide"""
+    return add_text(slide, 1, top, 8, 1, text, STYLES['title'], word_wrap=True)
+
+
+def add_content_box(slide, left, top, width, height):
+    """Add text box for content"""
+    text_box = slide.shapes.add_textbox(_emu(left), _emu(top), _emu(width), _emu(height))
+    text_frame = text_box.text_frame
+    text_frame.word_wrap = True
+    return text_frame
+
+
+def add_bullet(text_frame, text, level=0, color=None, bold=False, size=18):
+    """Add bullet point to text frame"""
+    return add_paragraph(text_frame, text, level=level, size=size, bold=bold, color=color)
@@ -0,0 +1,98 @@
+"""
+Slide Kit - Charts
+Native PowerPoint charts (doughnut, column and bar) styled with the shared color scheme
+"""
+
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.util import Pt
+
+from slidekit.builders import _emu
+from slidekit.styles import COLORS
+
+
+def _color(color):
+    return COLORS[color] if isinstance(color, str) else color
+
+
+def _add_chart(slide, chart_type, left, top, width, height, categories, values, series_name, title):
+    chart_data = CategoryChartData()
+    chart_data.categories = categories
+    chart_data.add_series(series_name, values)
+    chart = slide.shapes.add_chart(
+        chart_type, _emu(left), _emu(top), _emu(width), _emu(height), chart_data
+    ).chart
+    chart.font.size = Pt(10)
+    chart.font.color.rgb = COLORS['dark_gray']
+    if title:
+        chart.has_title = True
+        chart.chart_title.text_frame.text = title
+        run = chart.chart_title.text_frame.paragraphs[0].runs[0]
+        run.font.size = Pt(14)
+        run.font.bold = True
+    else:
+        chart.has_title = False
+    return chart
+
+
+def add_doughnut_chart(slide, left, top, width, height, categories, values, colors=None,
+                       title=None, series_name='Sites', hole_size=55):
+    """Doughnut chart with one slice per category, labelled with its percentage
+
+    ``colors`` is a color name or RGBColor per slice; positions are in inches.
+    """
+    chart = _add_chart(slide, XL_CHART_TYPE.DOUGHNUT, left, top, width, height,
+                       categories, values, series_name, title)
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+    chart.legend.include_in_layout = False
+
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    plot.data_labels.show_percentage = True
+    plot.data_labels.show_value = False
+    plot.data_labels.number_format = '0%'
+    plot.data_labels.number_format_is_linked = False
+    plot.data_labels.font.size = Pt(10)
+    plot.data_labels.font.bold = True
+    plot.data_labels.font.color.rgb = COLORS['white']
+    # python-pptx has no API for the hole size; its template always writes the element
+    plot._element.find('{http://schemas.openxmlformats.org/drawingml/2006/chart}holeSize').set('val', str(hole_size))
+
+    for point, color in zip(plot.series[0].points, colors or ()):
+        point.format.fill.solid()
+        point.format.fill.fore_color.rgb = _color(color)
+    return chart
+
+
+def add_column_chart(slide, left, top, width, height, categories, values, color='primary',
+                     title=None, series_name='Value', number_format='#,##0', horizontal=False):
+    """Single-series column chart (``horizontal`` for a bar chart), values labelled
+
+    Bar charts list categories top to bottom in the order given.
+    """
+    chart_type = XL_CHART_TYPE.BAR_CLUSTERED if horizontal else XL_CHART_TYPE.COLUMN_CLUSTERED
+    chart = _add_chart(slide, chart_type, left, top, width, height,
+                       categories, values, series_name, title)
+    chart.has_legend = False
+
+    plot = chart.plots[0]
+    plot.gap_width = 60
+    plot.has_data_labels = True
+    plot.data_labels.number_format = number_format
+    plot.data_labels.number_format_is_linked = False
+    plot.data_labels.font.size = Pt(9)
+
+    series = plot.series[0]
+    series.format.fill.solid()
+    series.format.fill.fore_color.rgb = _color(color)
+
+    value_axis = chart.value_axis
+    value_axis.has_major_gridlines = False
+    value_axis.visible = False
+    category_axis = chart.category_axis
+    category_axis.tick_labels.font.size = Pt(9)
+    category_axis.format.line.color.rgb = COLORS['light_gray']
+    if horizontal:
+        category_axis.reverse_order = True
+    return chart
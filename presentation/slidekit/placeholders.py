@@ -0,0 +1,131 @@
+"""
+Slide Kit - Placeholders
+Replaces [YOUR ...] style placeholders in slides and speaker notes from a values file
+"""
+
+import json
+import os
+import re
+
+# A placeholder is any single-line [bracketed text], e.g. [YOUR SLA] or [X days]
+TOKEN_RE = re.compile(r'\[[^\[\]\n]+\]')
+
+
+def normalize_token(key):
+    """'YOUR SLA' or '[YOUR SLA]' -> '[YOUR SLA]'"""
+    key = key.strip()
+    return key if key.startswith('[') and key.endswith(']') else f"[{key}]"
+
+
+def fill_text(text, values):
+    """``text`` with every placeholder that has a value replaced"""
+    if not values or '[' not in text:
+        return text
+    return TOKEN_RE.sub(lambda m: values.get(m.group(), m.group()), text)
+
+
+def load_values(path):
+    """Placeholder values from a YAML (needs PyYAML) or JSON mapping; keys may omit the brackets"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"PyYAML is required to read {path} (pip install pyyaml), or use a JSON values file")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping of placeholder -> value")
+    return {normalize_token(str(key)): '' if value is None else str(value) for key, value in data.items()}
+
+
+def iter_text_frames(prs):
+    """(slide number, text frame) for every shape, table cell and notes page in the deck"""
+    for number, slide in enumerate(prs.slides, start=1):
+        for text_frame in _shape_text_frames(slide.shapes):
+            yield number, text_frame
+        if slide.has_notes_slide:
+            yield number, slide.notes_slide.notes_text_frame
+
+
+def _shape_text_frames(shapes):
+    for shape in shapes:
+        if shape.has_text_frame:
+            yield shape.text_frame
+        if getattr(shape, 'has_table', False) and shape.has_table:
+            for row in shape.table.rows:
+                for cell in row.cells:
+                    yield cell.text_frame
+        if hasattr(shape, 'shapes'):  # Group shape
+            yield from _shape_text_frames(shape.shapes)
+
+
+class PlaceholderIndex:
+    """Every placeholder occurrence in a deck, found in one pass over its text
+
+    ``tokens`` maps each placeholder to the slides it appears on. Filling
+    only revisits the paragraphs recorded in the index, and handles
+    placeholders split across several runs (as PowerPoint does after
+    partial edits) by rewriting the runs they span.
+    """
+
+    def __init__(self, prs):
+        self.tokens = {}
+        self._paragraphs = []  # (paragraph, [(start, end, token)])
+        for number, text_frame in iter_text_frames(prs):
+            for paragraph in text_frame.paragraphs:
+                text = ''.join(run.text for run in paragraph.runs)
+                if '[' not in text:
+                    continue
+                matches = [(m.start(), m.end(), m.group()) for m in TOKEN_RE.finditer(text)]
+                if not matches:
+                    continue
+                self._paragraphs.append((paragraph, matches))
+                for _, _, token in matches:
+                    slides = self.tokens.setdefault(token, [])
+                    if number not in slides:
+                        slides.append(number)
+
+    def fill(self, values):
+        """Replace every indexed placeholder that has a value; returns the number replaced"""
+        replaced = 0
+        for paragraph, matches in self._paragraphs:
+            runs = None
+            # Right to left so earlier offsets stay valid
+            for start, end, token in reversed(matches):
+                if token not in values:
+                    continue
+                if runs is None:
+                    runs = list(paragraph.runs)
+                _replace_span(runs, start, end, values[token])
+                replaced += 1
+        return replaced
+
+    def unfilled(self, values):
+        """Placeholders without a value, mapped to the slides they appear on"""
+        return {token: slides for token, slides in self.tokens.items() if token not in values}
+
+
+def _replace_span(runs, start, end, value):
+    """Replace characters [start, end) of the runs' joined text with ``value``"""
+    offset = 0
+    first = True
+    for run in runs:
+        text = run.text
+        run_start, run_end = offset, offset + len(text)
+        offset = run_end
+        if run_end <= start or run_start >= end:
+            continue
+        before = text[:max(0, start - run_start)]
+        after = text[max(0, end - run_start):] if end < run_end else ''
+        # The value goes into the first run the placeholder touches, keeping its formatting
+        run.text = before + (value if first else '') + after
+        first = False
+
+
+def fill_placeholders(prs, values):
+    """Fill ``values`` into a deck in place; returns the ``PlaceholderIndex`` used"""
+    index = PlaceholderIndex(prs)
+    index.fill(values)
+    return index
@@ -0,0 +1,292 @@
+"""
+Slide Kit - Slide Specs
+Compiles declarative slide definitions (YAML or JSON) into reusable slide renderers
+
+A spec file has an optional ``styles`` section (named text styles, merged
+over ``STYLES``) and a ``slides`` list. Each slide has a ``name``, a
+``layout`` (``blank``, ``title`` or ``title_and_content``), an optional
+placeholder ``title``, optional ``body`` text for the content placeholder,
+a list of ``shapes`` and speaker ``notes``. A shape is either a text box::
+
+    - box: [left, top, width, height]     # inches
+      text: "Questions?"
+      style: {size: 36, bold: true, color: primary, align: center}
+      paragraphs: ["• more text", ...]    # optional extra paragraphs
+
+or a ``column`` of rows laid out ``step`` inches apart, one text box per cell::
+
+    - column: {left: 0.8, top: 1.8, step: 0.7}
+      cells:
+        - {width: 8.5, height: 0.3, style: faq_question}
+        - {dy: 0.3, width: 8.5, height: 0.25, style: faq_answer}
+      rows:
+        - ["Q: Will my bookmarks break?", "A: No! Site URLs remain the same."]
+
+Positions are resolved and styles looked up once at compile time, and the
+compiled spec is cached per file (keyed on size and modification time), so
+rendering the same slides for many decks never re-parses the file.
+
+Placeholder ``values`` (see ``slidekit.placeholders``) are filled into all
+text before styles are chosen, so a filled-in ``[YOUR ...]`` cell gets its
+normal style rather than ``placeholder_style``.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+
+from slidekit.builders import add_notes, add_paragraph, add_text, set_placeholder_title
+from slidekit.placeholders import fill_text
+from slidekit.styles import STYLES, TextStyle, text_style
+
+LAYOUTS = {'title': 0, 'title_and_content': 1, 'blank': 6}
+ALIGNMENTS = {'left': PP_ALIGN.LEFT, 'center': PP_ALIGN.CENTER, 'right': PP_ALIGN.RIGHT}
+ANCHORS = {'top': MSO_ANCHOR.TOP, 'middle': MSO_ANCHOR.MIDDLE, 'bottom': MSO_ANCHOR.BOTTOM}
+STYLE_KEYS = ('size', 'bold', 'italic', 'color', 'align')
+
+
+class SpecError(ValueError):
+    """A slide spec that cannot be parsed or compiled"""
+
+
+class CompiledSlide:
+    """One slide of a spec, ready to be rendered into any presentation"""
+
+    __slots__ = ('name', 'layout', 'title', 'title_size', 'ops', 'notes', 'source')
+
+    def __init__(self, name, layout, title, title_size, ops, notes, source):
+        self.name = name
+        self.layout = layout
+        self.title = title
+        self.title_size = title_size
+        self.ops = ops
+        self.notes = notes
+        self.source = source
+
+    def render(self, prs):
+        slide = prs.slides.add_slide(prs.slide_layouts[self.layout])
+        if self.title is not None:
+            set_placeholder_title(slide, self.title, self.title_size)
+        for op, args in self.ops:
+            op(slide, *args)
+        if self.notes:
+            add_notes(slide, self.notes)
+        return slide
+
+
+class DeckSpec:
+    """Compiled slides of a spec file, in order"""
+
+    def __init__(self, slides, path=None):
+        self.slides = slides
+        self.path = path
+        self._by_name = {slide.name: slide for slide in slides}
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self.slides)
+
+    def __len__(self):
+        return len(self.slides)
+
+
+def render_slide(prs, slide_spec):
+    """Slide builder for a compiled spec slide (same signature as the add_*_slide builders)"""
+    return slide_spec.render(prs)
+
+
+def load_spec(path, values=None):
+    """Parse and compile a spec file, reusing the compiled result while the file is unchanged"""
+    st = os.stat(path)
+    return _load_spec(os.path.abspath(path), st.st_size, st.st_mtime_ns, tuple(sorted((values or {}).items())))
+
+
+@lru_cache(maxsize=8)
+def _load_spec(path, size, mtime_ns, values):
+    return compile_spec(parse_spec_file(path), path, dict(values))
+
+
+def parse_spec_file(path):
+    """Raw spec data from a .yaml/.yml (needs PyYAML) or .json file"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise SpecError(f"PyYAML is required to read {path} (pip install pyyaml), or use a JSON spec")
+            try:
+                return yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise SpecError(f"{path}: {e}")
+        try:
+            return json.load(f)
+        except ValueError as e:
+            raise SpecError(f"{path}: {e}")
+
+
+def compile_spec(data, path=None, values=None):
+    """Compile parsed spec data into a ``DeckSpec``, filling in placeholder ``values``"""
+    if not isinstance(data, dict) or not isinstance(data.get('slides'), list):
+        raise SpecError(f"{path or 'spec'}: expected a mapping with a 'slides' list")
+    if values:
+        data = _fill_strings(data, values)
+
+    raw_styles = data.get('styles') or {}
+    styles = dict(STYLES)
+    for name, attrs in raw_styles.items():
+        styles[name] = _compile_style(attrs, styles, f"style '{name}'")
+
+    slides = []
+    for index, raw in enumerate(data['slides']):
+        name = raw.get('name') or f"slide_{index + 1}"
+        # Named styles are part of every slide's source so editing one invalidates cached renders
+        source = {'slide': raw, 'styles': raw_styles}
+        slides.append(_compile_slide(raw, name, styles, source))
+    return DeckSpec(slides, path)
+
+
+def _fill_strings(obj, values):
+    if isinstance(obj, str):
+        return fill_text(obj, values)
+    if isinstance(obj, dict):
+        return {key: _fill_strings(value, values) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_fill_strings(item, values) for item in obj]
+    return obj
+
+
+def _compile_slide(raw, name, styles, source):
+    where = f"slide '{name}'"
+    layout = raw.get('layout', 'blank')
+    if layout not in LAYOUTS:
+        raise SpecError(f"{where}: unknown layout {layout!r} (expected one of {', '.join(LAYOUTS)})")
+
+    ops = []
+    body = raw.get('body')
+    if body is not None:
+        if isinstance(body, str):
+            body = {'text': body}
+        paragraphs = _compile_paragraphs(body, styles, where)
+        ops.append((_render_body, (body.get('text', ''), paragraphs)))
+
+    for shape in raw.get('shapes') or []:
+        if 'column' in shape:
+            ops.extend(_compile_column(shape, styles, where))
+        else:
+            ops.append(_compile_text(shape, styles, where))
+
+    title = raw.get('title')
+    return CompiledSlide(
+        name, LAYOUTS[layout], title, raw.get('title_size', 40), tuple(ops), raw.get('notes'), source
+    )
+
+
+def _compile_style(attrs, styles, where):
+    """``TextStyle`` for a style name or a mapping of style attributes"""
+    if attrs is None:
+        return text_style()
+    if isinstance(attrs, str):
+        if attrs not in styles:
+            raise SpecError(f"{where}: unknown style {attrs!r}")
+        return styles[attrs]
+    if isinstance(attrs, TextStyle):
+        return attrs
+    unknown = set(attrs) - set(STYLE_KEYS)
+    if unknown:
+        raise SpecError(f"{where}: unknown style attributes {', '.join(sorted(unknown))}")
+    attrs = dict(attrs)
+    if 'align' in attrs:
+        try:
+            attrs['align'] = ALIGNMENTS[attrs['align']]
+        except KeyError:
+            raise SpecError(f"{where}: unknown alignment {attrs['align']!r}")
+    return text_style(**attrs)
+
+
+def _compile_paragraphs(shape, styles, where):
+    """(text, style, level, space_before) for a shape's extra paragraphs"""
+    default_style = shape.get('paragraph_style')
+    default_space = shape.get('space_before')
+    default_level = shape.get('level', 0)
+    paragraphs = []
+    for item in shape.get('paragraphs') or []:
+        if isinstance(item, str):
+            item = {'text': item}
+        paragraphs.append((
+            item['text'],
+            _compile_style(item.get('style', default_style), styles, where),
+            item.get('level', default_level),
+            item.get('space_before', default_space),
+        ))
+    return tuple(paragraphs)
+
+
+def _compile_text(shape, styles, where):
+    box = shape.get('box')
+    if not box or len(box) != 4:
+        raise SpecError(f"{where}: text shape needs box: [left, top, width, height]")
+    anchor = shape.get('anchor')
+    if anchor is not None and anchor not in ANCHORS:
+        raise SpecError(f"{where}: unknown anchor {anchor!r}")
+    return (_render_text, (
+        tuple(box),
+        shape.get('text', ''),
+        _compile_style(shape.get('style'), styles, where),
+        shape.get('word_wrap'),
+        ANCHORS.get(anchor),
+        _compile_paragraphs(shape, styles, where),
+    ))
+
+
+def _compile_column(shape, styles, where):
+    """Expand a column of rows into one text op per cell"""
+    column = shape['column']
+    left, top, step = column.get('left', 0), column.get('top', 0), column.get('step', 0.5)
+    cells = shape.get('cells') or []
+    if not cells:
+        raise SpecError(f"{where}: column needs at least one cell")
+
+    ops = []
+    for row_index, row in enumerate(shape.get('rows') or []):
+        if not isinstance(row, list):
+            row = [row]
+        if len(row) > len(cells):
+            raise SpecError(f"{where}: column row {row_index + 1} has more values than cells")
+        y = top + row_index * step
+        for cell, value in zip(cells, row):
+            if isinstance(value, str):
+                value = {'text': value}
+            text = value['text']
+            style = value.get('style', cell.get('style'))
+            # Unfilled "[...]" values get the placeholder style so they stand out
+            if text.startswith('[') and 'placeholder_style' in cell:
+                style = cell['placeholder_style']
+            ops.append(_compile_text({
+                'box': [left + cell.get('dx', 0), y + cell.get('dy', 0), cell['width'], cell['height']],
+                'text': text,
+                'style': style,
+                'word_wrap': cell.get('word_wrap'),
+            }, styles, where))
+    return ops
+
+
+def _render_body(slide, text, paragraphs):
+    text_frame = slide.placeholders[1].text_frame
+    text_frame.text = text
+    for p_text, style, level, space_before in paragraphs:
+        add_paragraph(text_frame, p_text, style, level, space_before)
+
+
+def _render_text(slide, box, text, style, word_wrap, anchor, paragraphs):
+    text_frame = add_text(slide, *box, text, style, word_wrap=word_wrap)
+    if anchor is not None:
+        text_frame.vertical_anchor = anchor
+    for p_text, p_style, level, space_before in paragraphs:
+        add_paragraph(text_frame, p_text, p_style, level, space_before)
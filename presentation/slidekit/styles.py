@@ -0,0 +1,95 @@
+"""
+Slide Kit - Styles
+Color scheme and a registry of pre-built paragraph styles
+"""
+
+from copy import deepcopy
+from functools import lru_cache
+
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.text.text import _Paragraph
+from pptx.util import Pt
+
+# Color scheme (Microsoft 365 defaults + status colors)
+COLORS = {
+    'primary': RGBColor(0, 120, 212),      # Microsoft Blue #0078D4
+    'success': RGBColor(16, 124, 16),      # Green #107C10
+    'warning': RGBColor(255, 185, 0),      # Orange #FFB900
+    'error': RGBColor(209, 52, 56),        # Red #D13438
+    'dark_gray': RGBColor(50, 50, 50),
+    'light_gray': RGBColor(150, 150, 150),
+    'white': RGBColor(255, 255, 255)
+}
+
+
+class TextStyle:
+    """Paragraph formatting (size, bold, italic, color, alignment)
+
+    The formatting is rendered once into a template ``<a:pPr>`` element;
+    applying the style copies that element onto a paragraph in a single
+    XML operation instead of setting each font attribute separately.
+    ``None`` leaves an attribute unset; ``False`` sets it off explicitly.
+    """
+
+    __slots__ = ('size', 'bold', 'italic', 'color', 'align', '_pPr')
+
+    def __init__(self, size=None, bold=None, italic=None, color=None, align=None):
+        self.size = size
+        self.bold = bold
+        self.italic = italic
+        self.color = COLORS[color] if isinstance(color, str) else color
+        self.align = align
+        self._pPr = self._build_pPr()
+
+    def _build_pPr(self):
+        p = parse_xml(f'<a:p {nsdecls("a")}/>')
+        paragraph = _Paragraph(p, None)
+        font = paragraph.font
+        if self.size is not None:
+            font.size = Pt(self.size)
+        if self.bold is not None:
+            font.bold = self.bold
+        if self.italic is not None:
+            font.italic = self.italic
+        if self.color is not None:
+            font.color.rgb = self.color
+        if self.align is not None:
+            paragraph.alignment = self.align
+        return p.get_or_add_pPr()
+
+    def apply(self, paragraph):
+        """Replace ``paragraph``'s properties with this style (keeping its level)"""
+        p = paragraph._p
+        pPr = deepcopy(self._pPr)
+        old_pPr = p.pPr
+        if old_pPr is not None:
+            if old_pPr.get('lvl') is not None:
+                pPr.set('lvl', old_pPr.get('lvl'))
+            p.replace(old_pPr, pPr)
+        else:
+            p.insert(0, pPr)
+        return paragraph
+
+
+@lru_cache(maxsize=None)
+def text_style(size=None, bold=None, italic=None, color=None, align=None):
+    """Cached ``TextStyle`` for a combination of attributes
+
+    ``color`` may be a ``COLORS`` key or an ``RGBColor``.
+    """
+    return TextStyle(size, bold, italic, color, align)
+
+
+# Named styles shared by both generators
+STYLES = {
+    'title': text_style(44, True, color='primary', align=PP_ALIGN.CENTER),
+    'slide_title': text_style(40, color='primary'),
+    'subtitle': text_style(28, color='dark_gray', align=PP_ALIGN.CENTER),
+    'caption': text_style(14, color='light_gray', align=PP_ALIGN.CENTER),
+    'body': text_style(18, color='dark_gray'),
+    'placeholder': text_style(18, italic=True, color='error'),
+    'warning': text_style(16, True, color='error', align=PP_ALIGN.CENTER),
+}
@@ -0,0 +1,258 @@
+"""
+Statistics History
+Append-only columnar store of every site's status, storage and item count per run
+
+The history directory holds three append-only files:
+
+    sites.jsonl   one [id, name] line per site ever seen; a site's line
+                  number is the site number used in the columns
+    columns.bin   one block per run: site numbers (uint32), item counts
+                  (uint32), storage in GB (float32) and status codes (uint8),
+                  each column stored contiguously
+    runs.idx      one fixed-size record per run: timestamp, block offset,
+                  site count, status counts, total storage and items, and a
+                  fingerprint of the block
+
+Totals for trend charts and projections come from ``runs.idx`` alone
+(about 60 bytes per run), and a time range is found by bisecting its
+timestamps. Only the runs a caller asks about have their column block
+read. A run identical to the previous one is not stored again. The runs
+record is written last, so an interrupted append leaves the history as
+it was.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+DEFAULT_HISTORY_DIR = '.status-history'
+SITES_FILE = 'sites.jsonl'
+COLUMNS_FILE = 'columns.bin'
+RUNS_FILE = 'runs.idx'
+
+STATUS_CODES = {'pending': 0, 'in-progress': 1, 'complete': 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# taken, offset, sites, complete, in_progress, pending, storage_gb, items, fingerprint
+_RUN = struct.Struct('<dQIIIIdQ8s')
+# Column typecodes in block order (numbers, items, storage, status)
+_COLUMN_TYPES = ('I', 'I', 'f', 'B')
+# Columns are stored little-endian
+_SWAP = sys.byteorder == 'big'
+
+
+class RunSummary:
+    """Totals of one stored run (from runs.idx)"""
+
+    __slots__ = ('taken', 'offset', 'sites', 'complete', 'in_progress', 'pending',
+                 'storage_gb', 'items', 'fingerprint')
+
+    def __init__(self, taken, offset, sites, complete, in_progress, pending, storage_gb, items, fingerprint):
+        self.taken = taken
+        self.offset = offset
+        self.sites = sites
+        self.complete = complete
+        self.in_progress = in_progress
+        self.pending = pending
+        self.storage_gb = storage_gb
+        self.items = items
+        self.fingerprint = fingerprint
+
+    @property
+    def time(self):
+        return datetime.fromtimestamp(self.taken)
+
+    def as_dict(self):
+        return {
+            'taken': self.time.isoformat(timespec='seconds'),
+            'sites': self.sites,
+            'complete': self.complete,
+            'in_progress': self.in_progress,
+            'pending': self.pending,
+            'storage_gb': round(self.storage_gb, 2),
+            'items': self.items,
+        }
+
+
+class RunColumns:
+    """Per-site columns of one run: site numbers, item counts, storage GB and status codes"""
+
+    __slots__ = ('summary', 'numbers', 'items', 'storage_gb', 'statuses')
+
+    def __init__(self, summary, numbers, items, storage_gb, statuses):
+        self.summary = summary
+        self.numbers = numbers
+        self.items = items
+        self.storage_gb = storage_gb
+        self.statuses = statuses
+
+    def status_by_site(self):
+        """Site number -> status code"""
+        return dict(zip(self.numbers, self.statuses))
+
+
+class StatsHistory:
+    """Columnar history of site statistics in ``directory``"""
+
+    def __init__(self, directory=DEFAULT_HISTORY_DIR):
+        self.directory = directory
+        self._site_ids = None
+        self._site_names = None
+        self._numbers = None
+        self._runs = None
+        self._runs_size = None
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def _load_sites(self):
+        if self._site_ids is not None:
+            return
+        self._site_ids, self._site_names = [], []
+        try:
+            with open(self._path(SITES_FILE), 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, name = json.loads(line)
+                    self._site_ids.append(key)
+                    self._site_names.append(name)
+        except FileNotFoundError:
+            pass
+        self._numbers = {key: number for number, key in enumerate(self._site_ids)}
+
+    def site_id(self, number):
+        self._load_sites()
+        return self._site_ids[number]
+
+    def site_name(self, number):
+        """Display name the site had when first recorded"""
+        self._load_sites()
+        return self._site_names[number]
+
+    def site_number(self, key):
+        """Number of a site id, or None if it was never recorded"""
+        self._load_sites()
+        return self._numbers.get(key)
+
+    def runs(self, start=None, end=None):
+        """Stored runs taken between ``start`` and ``end`` (datetimes, inclusive), oldest first"""
+        try:
+            size = os.path.getsize(self._path(RUNS_FILE))
+        except FileNotFoundError:
+            return []
+        if size != self._runs_size:
+            with open(self._path(RUNS_FILE), 'rb') as f:
+                data = f.read(size - size % _RUN.size)
+            self._runs = [RunSummary(*fields) for fields in _RUN.iter_unpack(data)]
+            self._runs_size = size
+        runs = self._runs
+        if start is None and end is None:
+            return list(runs)
+        times = [run.taken for run in runs]
+        lo = bisect_left(times, start.timestamp()) if start is not None else 0
+        hi = bisect_right(times, end.timestamp()) if end is not None else len(runs)
+        return runs[lo:hi]
+
+    def latest(self, count=1):
+        """The last ``count`` stored runs, oldest first"""
+        return self.runs()[-count:]
+
+    def columns(self, run):
+        """``RunColumns`` of a stored run (reads just that run's block)"""
+        with open(self._path(COLUMNS_FILE), 'rb') as f:
+            f.seek(run.offset)
+            columns = []
+            for typecode in _COLUMN_TYPES:
+                column = array(typecode)
+                column.fromfile(f, run.sites)
+                if _SWAP:
+                    column.byteswap()
+                columns.append(column)
+        return RunColumns(run, *columns)
+
+    def site_series(self, key, start=None, end=None):
+        """(time, status, storage GB, items) for one site across the runs in a range"""
+        number = self.site_number(key)
+        if number is None:
+            return []
+        series = []
+        for run in self.runs(start, end):
+            columns = self.columns(run)
+            try:
+                i = columns.numbers.index(number)
+            except ValueError:
+                continue
+            series.append((run.time, STATUS_NAMES[columns.statuses[i]], round(columns.storage_gb[i], 2), columns.items[i]))
+        return series
+
+    def append(self, rows, taken=None):
+        """Store a run of (site id, name, status, storage GB, item count) rows
+
+        Returns the new ``RunSummary``, or None when every value matches
+        the previous run (nothing is written).
+        """
+        self._load_sites()
+        numbers, items, storage, statuses = (array(t) for t in _COLUMN_TYPES)
+        new_sites = []
+        counts = [0, 0, 0]
+        total_storage = 0.0
+        total_items = 0
+        for key, name, status, storage_gb, item_count in rows:
+            number = self._numbers.get(key)
+            if number is None:
+                number = self._numbers[key] = len(self._site_ids)
+                self._site_ids.append(key)
+                self._site_names.append(name)
+                new_sites.append((key, name))
+            code = STATUS_CODES.get(status, 0)
+            numbers.append(number)
+            items.append(item_count)
+            storage.append(storage_gb)
+            statuses.append(code)
+            counts[code] += 1
+            total_storage += storage_gb
+            total_items += item_count
+
+        columns = (numbers, items, storage, statuses)
+        if _SWAP:
+            for column in columns:
+                column.byteswap()
+        block = b''.join(column.tobytes() for column in columns)
+        fingerprint = hashlib.blake2b(block, digest_size=8).digest()
+        previous = self.latest()
+        if previous and previous[0].fingerprint == fingerprint:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        if new_sites:
+            with open(self._path(SITES_FILE), 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps([key, name]) + '\n' for key, name in new_sites)
+        with open(self._path(COLUMNS_FILE), 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(block)
+        taken = (taken or datetime.now()).timestamp()
+        summary = RunSummary(taken, offset, len(numbers), counts[2], counts[1], counts[0],
+                             total_storage, total_items, fingerprint)
+        with open(self._path(RUNS_FILE), 'ab') as f:
+            # Drop a partial record left by an interrupted append
+            end = f.seek(0, os.SEEK_END)
+            if end % _RUN.size:
+                f.truncate(end - end % _RUN.size)
+            f.write(_RUN.pack(taken, offset, summary.sites, summary.complete, summary.in_progress,
+                              summary.pending, total_storage, total_items, fingerprint))
+        return summary
+
+
+if __name__ == '__main__':
+    # python3 stats_history.py [DIR] [SINCE [UNTIL]] -> run totals, dates as YYYY-MM-DD
+    args = sys.argv[1:]
+    history = StatsHistory(args.pop(0) if args and os.path.isdir(args[0]) else DEFAULT_HISTORY_DIR)
+    start, end = ([datetime.fromisoformat(arg) for arg in args[:2]] + [None, None])[:2]
+    print(f"{'taken':<20} {'sites':>6} {'complete':>9} {'in prog':>8} {'pending':>8} {'storage GB':>11} {'items':>12}")
+    for run in history.runs(start, end):
+        print(f"{run.time:%Y-%m-%d %H:%M:%S} {run.sites:>6} {run.complete:>9} {run.in_progress:>8} "
+              f"{run.pending:>8} {run.storage_gb:>11,.1f} {run.items:>12,}")
@@ -0,0 +1,105 @@
+"""
+Status Snapshots
+Progress since the last update, diffed from the runs stored in the statistics history
+
+Every run of the generator appends each site's status to the columnar
+history (see stats_history.py); runs with no change are not stored, so
+the last two stored runs are the latest update and the one before it.
+The diff walks the latest run's columns once and looks each site up in
+the previous run by site number. Throughput comes from the run totals in
+the history's index, without opening older runs.
+"""
+
+from datetime import timedelta
+
+from stats_history import STATUS_CODES
+
+# Throughput is averaged over runs from this many days back
+THROUGHPUT_WINDOW_DAYS = 14
+# Shorter spans than this give meaningless per-day rates
+MIN_THROUGHPUT_SPAN = timedelta(hours=12)
+
+_COMPLETE = STATUS_CODES['complete']
+_IN_PROGRESS = STATUS_CODES['in-progress']
+_PENDING = STATUS_CODES['pending']
+
+
+def site_id(site):
+    """Stable key for a site-mapping.json entry (its id, else its source URL or name)"""
+    return str(site.get('id') or site.get('sourceUrl') or site.get('url') or site.get('name') or '')
+
+
+class StatusDelta:
+    """What changed between two runs, plus throughput and a projected finish date"""
+
+    def __init__(self, since, now, newly_completed, started, added, removed,
+                 remaining, per_day=None, projected_finish=None):
+        self.since = since
+        self.now = now
+        self.newly_completed = newly_completed
+        self.started = started
+        self.added = added
+        self.removed = removed
+        self.remaining = remaining
+        self.per_day = per_day
+        self.projected_finish = projected_finish
+
+    def as_dict(self):
+        """Plain values (for render-cache keys and JSON)"""
+        return {
+            'since': self.since.isoformat(timespec='minutes'),
+            'now': self.now.isoformat(timespec='minutes'),
+            'newly_completed': self.newly_completed,
+            'started': self.started,
+            'added': self.added,
+            'removed': self.removed,
+            'remaining': self.remaining,
+            'per_day': round(self.per_day, 1) if self.per_day is not None else None,
+            'projected_finish': self.projected_finish.date().isoformat() if self.projected_finish else None,
+        }
+
+
+def diff_runs(history, previous, current):
+    """``StatusDelta`` between two stored runs; site lists hold display names"""
+    old = previous.status_by_site()
+    newly_completed, started, added = [], [], []
+    for number, code in zip(current.numbers, current.statuses):
+        before = old.pop(number, None)
+        if before == code:
+            continue
+        name = history.site_name(number)
+        if before is None:
+            added.append(name)
+        if code == _COMPLETE:
+            newly_completed.append(name)
+        elif code == _IN_PROGRESS and before in (_PENDING, None):
+            started.append(name)
+    summary = current.summary
+    return StatusDelta(
+        previous.summary.time, summary.time, newly_completed, started, added,
+        removed=len(old), remaining=summary.sites - summary.complete
+    )
+
+
+def completions_per_day(history, run):
+    """Sites completed per day over the THROUGHPUT_WINDOW_DAYS before ``run`` (None without enough history)"""
+    window = history.runs(run.time - timedelta(days=THROUGHPUT_WINDOW_DAYS), run.time)
+    if not window:
+        return None
+    first = window[0]
+    span = run.time - first.time
+    if span < MIN_THROUGHPUT_SPAN:
+        return None
+    return max(run.complete - first.complete, 0) / (span.total_seconds() / 86400)
+
+
+def status_delta(history):
+    """``StatusDelta`` between the last two stored runs (None until there are two)"""
+    runs = history.latest(2)
+    if len(runs) < 2:
+        return None
+    delta = diff_runs(history, history.columns(runs[0]), history.columns(runs[1]))
+    delta.per_day = completions_per_day(history, runs[1])
+    if delta.per_day and delta.remaining:
+        delta.projected_finish = runs[1].time + timedelta(days=delta.remaining / delta.per_day)
+    return delta
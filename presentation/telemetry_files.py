@@ -0,0 +1,91 @@
+"""
+Telemetry Files
+Finding, reading and parsing the JSON telemetry files the PowerShell scripts write, in parallel chunks
+
+Shared by phase1_telemetry.py (Phase1-Events-*.json),
+remediation_telemetry.py (Remediation-*.json) and telemetry_store.py.
+A parser takes a path (and the loaded JSON, if already read) and returns
+a record, raising ValueError or similar for a file it can't use.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+# Files per worker task; small enough to spread a go-live day's files evenly
+CHUNK_SIZE = 256
+
+# What a parser may raise for a missing, truncated or unexpected file
+PARSE_ERRORS = (OSError, ValueError, AttributeError, TypeError)
+
+
+def parse_time(value):
+    """The scripts write local time with a literal 'Z'; kept naive (None if unparseable)"""
+    try:
+        return datetime.fromisoformat(str(value).rstrip('Z'))
+    except ValueError:
+        return None
+
+
+def loads_json(data):
+    """JSON from a file's bytes"""
+    # Windows PowerShell's Out-File -Encoding UTF8 writes a byte order mark
+    return json.loads(data.decode('utf-8-sig'))
+
+
+def read_json(path):
+    with open(path, 'rb') as f:
+        return loads_json(f.read())
+
+
+def find_files(match, *sources):
+    """Sorted paths of the files in ``sources`` (directories, searched recursively) whose names ``match``
+
+    File paths given directly are included as they are.
+    """
+    paths = []
+    for source in sources:
+        if os.path.isfile(source):
+            paths.append(source)
+            continue
+        stack = [source]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif match(entry.name):
+                        paths.append(entry.path)
+    return sorted(paths)
+
+
+def parse_files(parser, paths):
+    """Parse a chunk of files; returns (records, [(path, error message)])"""
+    records, failures = [], []
+    for path in paths:
+        try:
+            records.append(parser(path))
+        except PARSE_ERRORS as e:
+            failures.append((path, str(e)))
+    return records, failures
+
+
+def map_chunks(function, items, max_workers=None, chunk_size=CHUNK_SIZE):
+    """Yield ``function(chunk)`` for each ``chunk_size`` slice of ``items``, in order
+
+    Chunks run across worker processes (``function`` must be picklable);
+    a single chunk, or ``max_workers=1``, runs in this process.
+    """
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if len(chunks) <= 1 or max_workers == 1:
+        yield from map(function, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(function, chunks)
+
+
+def parse_in_chunks(parser, paths, max_workers=None, chunk_size=CHUNK_SIZE):
+    """Yield (records, failures) per chunk of ``paths`` parsed with ``parser`` (see ``map_chunks``)"""
+    return map_chunks(partial(parse_files, parser), paths, max_workers, chunk_size)
@@ -0,0 +1,244 @@
+"""
+Telemetry Store
+Incremental ingest of the Phase 1 and remediation telemetry on the collection share
+
+Devices report daily, so the share keeps growing. The store directory
+holds two append-only JSON-lines files:
+
+    files.jsonl    one [path, size, mtime_ns, hash, error] line per
+                   ingested file (error is the parse error, if any)
+    records.jsonl  one [kind, record] line per parsed file; kind is
+                   'phase1' or 'remediation' and the record includes
+                   the file's path
+
+and versions.json, the parser version each kind's records came from.
+When a parser's version changes, the next run re-parses that kind's
+files whether or not they changed.
+
+A run scans the share and only reads files that are new or whose size
+or modification time changed; a changed file whose content hash still
+matches (a re-copy) just updates the index. New files are parsed in
+chunks across worker processes. A file's latest record supersedes
+earlier ones, and records stay after their file leaves the share.
+Records are appended before the index lines, so a run interrupted in
+between re-parses those files next time rather than losing them.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from phase1_telemetry import (
+    EVENT_PATTERN, EVENT_VERSION, OUTCOMES, STEP_LABELS, Phase1Event, Phase1Telemetry, format_minutes, parse_event,
+    percentile
+)
+from remediation_telemetry import REPORT_PATTERN, REPORT_VERSION, RemediationReport, parse_report
+from telemetry_files import CHUNK_SIZE, PARSE_ERRORS, find_files, loads_json, map_chunks
+
+DEFAULT_STORE_DIR = '.telemetry-store'
+FILES_FILE = 'files.jsonl'
+RECORDS_FILE = 'records.jsonl'
+VERSIONS_FILE = 'versions.json'
+
+# kind -> (file name pattern, parser, record class, parser version)
+KINDS = {
+    'phase1': (EVENT_PATTERN, parse_event, Phase1Event, EVENT_VERSION),
+    'remediation': (REPORT_PATTERN, parse_report, RemediationReport, REPORT_VERSION),
+}
+
+
+def file_kind(filename):
+    """'phase1' or 'remediation' for a telemetry file name, else None"""
+    for kind, (pattern, *_) in KINDS.items():
+        if pattern.match(filename):
+            return kind
+    return None
+
+
+def scan_telemetry(*sources):
+    """(path, kind, size, mtime_ns) of every telemetry file in ``sources`` (directories, recursively, or files)"""
+    found = []
+    for path in find_files(file_kind, *(os.path.abspath(source) for source in sources)):
+        kind = file_kind(os.path.basename(path))
+        if kind:
+            stat = os.stat(path)
+            found.append((path, kind, stat.st_size, stat.st_mtime_ns))
+    return found
+
+
+def _read_chunk(chunk):
+    """Hash and parse a chunk of (path, kind) files in a worker
+
+    Returns (path, content hash, record dict or None, error or None) per file.
+    """
+    results = []
+    for path, kind in chunk:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            results.append((path, None, None, str(e)))
+            continue
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        try:
+            record = KINDS[kind][1](path, loads_json(data)).as_dict()
+        except PARSE_ERRORS as e:
+            results.append((path, digest, None, str(e)))
+            continue
+        results.append((path, digest, record, None))
+    return results
+
+
+class IngestResult:
+    """What one ``TelemetryStore.ingest`` run did"""
+
+    def __init__(self, scanned=0, unchanged=0, parsed=0, recopied=0, failed=0):
+        self.scanned = scanned
+        self.unchanged = unchanged
+        self.parsed = parsed
+        self.recopied = recopied
+        self.failed = failed
+
+    def __str__(self):
+        return (f"{self.scanned} files: {self.parsed} parsed, {self.unchanged} unchanged, "
+                f"{self.recopied} re-copied, {self.failed} unreadable")
+
+
+class TelemetryStore:
+    """Processed-file index and parsed records in ``directory``"""
+
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = directory
+        self._index = None
+        self._records = None
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def _read_lines(self, filename):
+        try:
+            with open(self._path(filename), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # A line cut short by an interrupted run
+                        continue
+        except FileNotFoundError:
+            return
+
+    def index(self):
+        """path -> (size, mtime_ns, hash, error) of every ingested file"""
+        if self._index is None:
+            self._index = {path: tuple(entry) for path, *entry in self._read_lines(FILES_FILE)}
+        return self._index
+
+    def records(self, kind=None):
+        """path -> (kind, record dict) of the latest record of every parsed file"""
+        if self._records is None:
+            self._records = {record['path']: (record_kind, record)
+                             for record_kind, record in self._read_lines(RECORDS_FILE)}
+        if kind is None:
+            return self._records
+        return {path: entry for path, entry in self._records.items() if entry[0] == kind}
+
+    def ingest(self, *sources, max_workers=None, chunk_size=CHUNK_SIZE):
+        """Parse the new and changed telemetry files under ``sources``; returns an ``IngestResult``"""
+        index = self.index()
+        versions = {kind: version for kind, (*_, version) in KINDS.items()}
+        stale = {kind for kind, version in versions.items() if self.versions().get(kind) != version}
+        found = scan_telemetry(*sources)
+        result = IngestResult(scanned=len(found))
+        stats = {}
+        for path, kind, size, mtime_ns in found:
+            entry = index.get(path)
+            if entry and entry[:2] == (size, mtime_ns) and kind not in stale:
+                result.unchanged += 1
+            else:
+                stats[path] = (kind, size, mtime_ns)
+        if not stats:
+            if stale:
+                self._write_versions(versions)
+            return result
+
+        todo = [(path, kind) for path, (kind, _, _) in stats.items()]
+        results = [item for chunk in map_chunks(_read_chunk, todo, max_workers, chunk_size) for item in chunk]
+
+        records = self.records()
+        new_records, new_index = [], []
+        for path, digest, record, error in results:
+            kind, size, mtime_ns = stats[path]
+            previous = index.get(path)
+            if error is not None:
+                result.failed += 1
+            elif previous and previous[2] == digest and path in records and kind not in stale:
+                result.recopied += 1
+            else:
+                result.parsed += 1
+                records[path] = (kind, record)
+                new_records.append([kind, record])
+            index[path] = (size, mtime_ns, digest, error)
+            new_index.append([path, *index[path]])
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(RECORDS_FILE), 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(line, separators=(',', ':')) + '\n' for line in new_records)
+        with open(self._path(FILES_FILE), 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(line, separators=(',', ':')) + '\n' for line in new_index)
+        if stale:
+            self._write_versions(versions)
+        return result
+
+    def versions(self):
+        """kind -> parser version of the stored records ({} for a new store or one from before versions)"""
+        try:
+            with open(self._path(VERSIONS_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_versions(self, versions):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(VERSIONS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(versions, f)
+
+    def failures(self):
+        """(path, error) of indexed files that could not be parsed"""
+        return [(path, entry[3]) for path, entry in self.index().items() if entry[3]]
+
+    def phase1(self):
+        """``Phase1Telemetry`` of every stored Phase 1 run"""
+        events = [Phase1Event.from_dict(record) for _, record in self.records('phase1').values()]
+        return Phase1Telemetry(events, self.failures())
+
+    def remediation_reports(self):
+        """Every stored ``RemediationReport``"""
+        return [RemediationReport.from_dict(record) for _, record in self.records('remediation').values()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('sources', nargs='*', default=['.'],
+                        help="collection folders (searched recursively) or telemetry files")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR,
+                        help=f"store directory (default: {DEFAULT_STORE_DIR})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for parsing (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    store = TelemetryStore(args.store)
+    print(f"Ingested {store.ingest(*args.sources, max_workers=args.workers)}")
+    telemetry = store.phase1()
+    durations = telemetry.durations()
+    print(f"Phase 1: {len(telemetry)} devices ({telemetry.runs} runs), {telemetry.success_count()} succeeded, "
+          f"median run {format_minutes(percentile(durations, 0.5))}, p90 {format_minutes(percentile(durations, 0.9))}")
+    for step, counts in telemetry.step_summary().items():
+        print(f"  {STEP_LABELS[step]:<20} " + ', '.join(f"{counts[outcome]} {outcome}" for outcome in OUTCOMES))
+    print(f"Remediation reports: {len(store.remediation_reports())}")
+    for path, error in store.failures()[:10]:
+        print(f"unreadable: {path}: {error}", file=sys.stderr)
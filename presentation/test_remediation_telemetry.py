@@ -0,0 +1,63 @@
+"""Tests for remediation_telemetry.py (run with: python3 -m pytest)"""
+
+import json
+from datetime import datetime
+
+from remediation_telemetry import (
+    BACKED_OFF, FAILED, NOT_APPLICABLE, SUCCESS, RemediationReport, RemediationRollup, parse_report
+)
+
+# What Remediate-WiFiBackup.ps1 writes for a device with no WiFi hardware
+NO_WIFI_REPORT = {
+    'ComputerName': 'IPS-DT00042',
+    'Timestamp': '2026-01-19T10:34:00Z',
+    'BackedOff': True,
+    'Reason': 'No WiFi hardware or wireless service not running',
+    'RiskLevel': 'Low',
+    'ActionRequired': 'None - Not applicable',
+    'Success': True,
+}
+
+
+def write_report(directory, name, data):
+    path = directory / name
+    # Out-File -Encoding UTF8 writes a byte order mark
+    path.write_bytes(json.dumps(data).encode('utf-8-sig'))
+    return str(path)
+
+
+def test_wifi_without_hardware_is_not_applicable(tmp_path):
+    path = write_report(tmp_path, 'Remediation-WiFiBackup-20260119-103400.json', NO_WIFI_REPORT)
+    report = parse_report(path)
+    assert report.remediation == 'WiFiBackup'
+    assert report.computer == 'IPS-DT00042'
+    assert report.outcome == NOT_APPLICABLE
+
+
+def test_not_applicable_device_counts_as_compliant(tmp_path):
+    path = write_report(tmp_path, 'Remediation-WiFiBackup-20260119-103400.json', NO_WIFI_REPORT)
+    summary = RemediationRollup([parse_report(path)]).as_dict()['remediations'][0]
+    assert summary['compliant'] == 1
+    assert summary['not_applicable'] == 1
+    assert summary['backed_off'] == 0
+    assert summary['hours_to_compliance']['median'] == 0
+    assert summary['top_reasons'] == []
+
+
+def test_backed_off_without_success_is_still_backed_off(tmp_path):
+    data = dict(NO_WIFI_REPORT, Reason='OneDrive process not running', ActionRequired='Start OneDrive and sign in')
+    del data['Success']
+    path = write_report(tmp_path, 'Remediation-WiFiBackup-20260119-103400.json', data)
+    assert parse_report(path).outcome == BACKED_OFF
+
+
+def test_time_to_compliance_and_retries():
+    reports = [
+        RemediationReport('PSTBackup', 'IPS-LT00001', datetime(2026, 1, 19, 8), FAILED, 'Access is denied'),
+        RemediationReport('PSTBackup', 'IPS-LT00001', datetime(2026, 1, 19, 14), SUCCESS),
+        RemediationReport('PSTBackup', 'IPS-LT00002', datetime(2026, 1, 19, 9), SUCCESS),
+    ]
+    summary = RemediationRollup(reports).as_dict()['remediations'][0]
+    assert (summary['devices'], summary['compliant'], summary['runs'], summary['retries']) == (2, 2, 3, 1)
+    assert summary['hours_to_compliance']['histogram']['4-24 h'] == 1
+    assert summary['top_reasons'] == [('Access is denied', 1)]
@@ -0,0 +1,138 @@
+"""
+Migration Throughput
+Per-site duration estimates fitted from how long completed sites actually took
+
+A completed site's duration comes from the migration tool's timing fields
+when the export has them: ``durationMinutes`` or ``durationHours``, or
+``startedAt`` and ``completedAt`` timestamps (on the entry or in its
+``metadata``). ``compute_stats`` accumulates the sums for the fit in its
+single pass over the mapping, so fitting costs nothing extra, and
+estimating a site is two multiplications.
+"""
+
+import math
+from datetime import datetime
+
+# Below this many timed, completed sites the fixed size bands are used instead
+MIN_TIMED_SITES = 3
+
+
+def _field(site, name):
+    value = site.get(name)
+    if value is None:
+        value = (site.get('metadata') or {}).get(name)
+    return value
+
+
+def site_duration_hours(site):
+    """How long a site's migration took in hours, or None if the entry has no usable timing"""
+    try:
+        minutes = _field(site, 'durationMinutes')
+        if minutes is not None:
+            return float(minutes) / 60
+        hours = _field(site, 'durationHours')
+        if hours is not None:
+            return float(hours)
+        started, completed = _field(site, 'startedAt'), _field(site, 'completedAt')
+        if started and completed:
+            span = datetime.fromisoformat(completed) - datetime.fromisoformat(started)
+            return span.total_seconds() / 3600
+    except (TypeError, ValueError):
+        # e.g. 'durationMinutes': 'n/a', or a timestamp the export mangled
+        return None
+    return None
+
+
+class ThroughputModel:
+    """Migration time per item and per GB, least-squares fitted over completed sites
+
+    A site's time is modelled as ``items * hours_per_item + GB *
+    hours_per_gb``: one term for per-item work (metadata, permissions) and
+    one for moving the bytes. ``compute_stats`` only accumulates the sums
+    of squares and products the fit needs, so the fit is a 2x2 solve
+    however many sites there are. If either coefficient comes out
+    negative (collinear or noisy samples), the better single-term fit is
+    used instead.
+    """
+
+    def __init__(self, hours_per_item, hours_per_gb, samples):
+        self.hours_per_item = hours_per_item
+        self.hours_per_gb = hours_per_gb
+        self.samples = samples
+
+    @staticmethod
+    def new_totals():
+        """Running sums for ``add_sample``/``fit``"""
+        return {'sites': 0, 'ii': 0.0, 'ig': 0.0, 'gg': 0.0, 'ih': 0.0, 'gh': 0.0}
+
+    @staticmethod
+    def add_sample(totals, hours, item_count, storage_gb):
+        totals['sites'] += 1
+        totals['ii'] += item_count * item_count
+        totals['ig'] += item_count * storage_gb
+        totals['gg'] += storage_gb * storage_gb
+        totals['ih'] += item_count * hours
+        totals['gh'] += storage_gb * hours
+
+    @classmethod
+    def fit(cls, totals):
+        """Model from accumulated sums (None with fewer than MIN_TIMED_SITES samples)"""
+        samples = totals['sites']
+        if samples < MIN_TIMED_SITES:
+            return None
+        ii, ig, gg, ih, gh = (totals[key] for key in ('ii', 'ig', 'gg', 'ih', 'gh'))
+        det = ii * gg - ig * ig
+        if det > 1e-9 * ii * gg:
+            per_item = (ih * gg - gh * ig) / det
+            per_gb = (gh * ii - ih * ig) / det
+            if per_item >= 0 and per_gb >= 0:
+                return cls(per_item, per_gb, samples)
+        # Single-term fits; keep the one that explains more of the variance
+        by_items = ih * ih / ii if ii else -1
+        by_storage = gh * gh / gg if gg else -1
+        if max(by_items, by_storage) <= 0:
+            return None
+        if by_items >= by_storage:
+            return cls(ih / ii, 0.0, samples)
+        return cls(0.0, gh / gg, samples)
+
+    @property
+    def items_per_hour(self):
+        return 1 / self.hours_per_item if self.hours_per_item else None
+
+    @property
+    def gb_per_hour(self):
+        return 1 / self.hours_per_gb if self.hours_per_gb else None
+
+    def estimate_hours(self, item_count, storage_gb=0):
+        return item_count * self.hours_per_item + storage_gb * self.hours_per_gb
+
+    def estimate(self, item_count, storage_gb=0):
+        """Estimated duration as display text, e.g. '2-3 hours'"""
+        return format_duration(self.estimate_hours(item_count, storage_gb))
+
+    def describe(self):
+        rates = []
+        if self.items_per_hour:
+            rates.append(f"{self.items_per_hour:,.0f} items/hour")
+        if self.gb_per_hour:
+            rates.append(f"{self.gb_per_hour:,.1f} GB/hour")
+        return f"fitted from {self.samples} completed sites ({', '.join(rates)})"
+
+    def as_dict(self):
+        return {
+            'items_per_hour': round(self.items_per_hour) if self.items_per_hour else None,
+            'gb_per_hour': round(self.gb_per_hour, 2) if self.gb_per_hour else None,
+            'samples': self.samples,
+        }
+
+
+def format_duration(hours):
+    """Duration range text in the style of the size bands ('30 minutes to 1 hour', '2-3 hours')"""
+    if hours < 0.5:
+        return "Under 30 minutes"
+    if hours < 1:
+        return "30 minutes to 1 hour"
+    low = int(hours)
+    high = max(low + 1, math.ceil(hours * 1.25))
+    return f"{low}-{high} hours"
@@ -0,0 +1,187 @@
+"""
+Wave Scheduler
+Packs pending sites into nightly migration windows to finish in as few nights as possible
+
+Every night has a window (e.g. 18:00-06:00) in which up to ``concurrency``
+sites migrate side by side; each of those parallel slots is a lane. Sites
+are placed longest first into the earliest lane with enough time left
+(first-fit decreasing bin packing), which keeps the number of nights
+within a few percent of the minimum. A max segment tree over the lanes'
+remaining hours finds that lane in O(log lanes), so scheduling thousands
+of sites takes milliseconds. A site longer than the whole window gets an
+empty lane to itself and is flagged as overrunning.
+"""
+
+from datetime import datetime, time, timedelta
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+
+class MigrationWindows:
+    """Nightly windows from ``start_date`` on the given weekdays
+
+    ``window`` is 'HH:MM-HH:MM'; an end before the start runs into the
+    next morning.
+    """
+
+    def __init__(self, start_date, window='18:00-06:00', nights=WEEKDAYS):
+        opens, closes = (time.fromisoformat(part.strip()) for part in window.split('-'))
+        self.start_date = start_date
+        self.opens = opens
+        day = datetime(2000, 1, 1)
+        length = datetime.combine(day, closes) - datetime.combine(day, opens)
+        if length <= timedelta(0):
+            length += timedelta(days=1)
+        self.length = length
+        unknown = [night for night in nights if night[:3].lower() not in WEEKDAYS]
+        if unknown:
+            raise ValueError(f"Unknown migration night(s) {', '.join(map(repr, unknown))} "
+                             f"(expected one of {', '.join(WEEKDAYS)})")
+        self.nights = {WEEKDAYS.index(night[:3].lower()) for night in nights}
+        if not self.nights:
+            raise ValueError("At least one migration night is required")
+        self._starts = []
+
+    @property
+    def hours(self):
+        return self.length.total_seconds() / 3600
+
+    def start(self, index):
+        """Opening time of the ``index``-th window"""
+        day = self._starts[-1] + timedelta(days=1) if self._starts else self.start_date
+        while len(self._starts) <= index:
+            if day.weekday() in self.nights:
+                self._starts.append(day)
+            day += timedelta(days=1)
+        return datetime.combine(self._starts[index], self.opens)
+
+
+def _clock(moment):
+    """12-hour clock time, e.g. '6:00 PM' (strftime has no portable unpadded hour)"""
+    return f"{moment.hour % 12 or 12}:{moment.minute:02d} {'AM' if moment.hour < 12 else 'PM'}"
+
+
+class _LaneTree:
+    """Max segment tree of the hours left in each lane; grows by doubling"""
+
+    def __init__(self, capacity, size=64):
+        self.capacity = capacity
+        self.size = size
+        self.tree = [capacity] * (2 * size)
+
+    def _grow(self):
+        old = self.tree
+        self.size *= 2
+        self.tree = [self.capacity] * (2 * self.size)
+        # Copy each level of the old tree into the left half of the new one
+        width = self.size // 2
+        new_start, old_start = self.size, width
+        while width:
+            self.tree[new_start:new_start + width] = old[old_start:old_start + width]
+            new_start //= 2
+            old_start //= 2
+            width //= 2
+        self.tree[1] = max(self.tree[2], self.tree[3])
+
+    def first_fit(self, hours):
+        """Index of the first lane with at least ``hours`` left"""
+        while self.tree[1] < hours:
+            self._grow()
+        node = 1
+        while node < self.size:
+            node = 2 * node if self.tree[2 * node] >= hours else 2 * node + 1
+        return node - self.size
+
+    def used(self, lane):
+        return self.capacity - self.tree[self.size + lane]
+
+    def take(self, lane, hours):
+        node = self.size + lane
+        self.tree[node] = max(self.tree[node] - hours, 0.0)
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+
+class Slot:
+    """One site's place in the schedule"""
+
+    __slots__ = ('site_id', 'name', 'hours', 'window', 'lane', 'start', 'end', 'overruns')
+
+    def __init__(self, site_id, name, hours, window, lane, start, end, overruns):
+        self.site_id = site_id
+        self.name = name
+        self.hours = hours
+        self.window = window
+        self.lane = lane
+        self.start = start
+        self.end = end
+        self.overruns = overruns
+
+    def describe(self):
+        """e.g. 'Tuesday, January 20, 2026, 6:00 PM - 9:00 PM' (the end day is named when it differs)"""
+        start, end = self.start, self.end
+        end_day = '' if end.date() == start.date() else f"{end:%a} "
+        return f"{start:%A, %B} {start.day}, {start.year}, {_clock(start)} - {end_day}{_clock(end)}"
+
+
+class Schedule:
+    """Slots by site id, plus per-night totals"""
+
+    def __init__(self, windows, concurrency, slots):
+        self.windows = windows
+        self.concurrency = concurrency
+        self.slots = slots
+
+    def __getitem__(self, site_id):
+        return self.slots[site_id]
+
+    def get(self, site_id, default=None):
+        return self.slots.get(site_id, default)
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def finish(self):
+        """End of the last scheduled migration (None for an empty schedule)"""
+        return max((slot.end for slot in self.slots.values()), default=None)
+
+    def nights(self):
+        """(window start, site count, scheduled hours, overruns) per night in use, in order"""
+        totals = {}
+        for slot in self.slots.values():
+            entry = totals.setdefault(slot.window, [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += slot.hours
+            entry[2] += slot.overruns
+        return [(self.windows.start(index), *totals[index]) for index in sorted(totals)]
+
+    def as_dict(self):
+        """Plain summary (for render-cache keys and JSON)"""
+        return {
+            'window_hours': self.windows.hours,
+            'concurrency': self.concurrency,
+            'nights': [(start.isoformat(), sites, round(hours, 2), overruns)
+                       for start, sites, hours, overruns in self.nights()],
+        }
+
+
+def schedule_sites(sites, windows, concurrency=4):
+    """Pack (site id, name, hours) tuples into ``windows`` with ``concurrency`` lanes per night"""
+    if concurrency < 1:
+        raise ValueError(f"At least one site must migrate at a time (concurrency {concurrency})")
+    capacity = windows.hours
+    lanes = _LaneTree(capacity)
+    slots = {}
+    for site_id, name, hours in sorted(sites, key=lambda site: -site[2]):
+        # Overlong sites take a whole empty lane and run past the window
+        lane_index = lanes.first_fit(min(hours, capacity))
+        offset = lanes.used(lane_index)
+        lanes.take(lane_index, hours)
+        window, lane = divmod(lane_index, concurrency)
+        start = windows.start(window) + timedelta(minutes=round(offset * 60))
+        end = start + timedelta(minutes=max(round(hours * 60), 1))
+        slots[site_id] = Slot(site_id, name, hours, window, lane, start, end, hours > capacity)
+    return Schedule(windows, concurrency, slots)